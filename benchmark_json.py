@@ -0,0 +1,110 @@
+"""
+Microbenchmark del parseo de respuestas de ChatbotClient.
+
+Compara el camino anterior (response.text, copia con strip() y json.loads sobre el
+texto) con el actual (ChatbotClient._response_body + _parse_body: JSON desde los bytes,
+con orjson si está instalado) para respuestas de distintos tamaños y contenidos.
+
+Ejemplos:
+    python benchmark_json.py
+    python benchmark_json.py --sizes 1000,100000,1000000 --repeat 50
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+sys.path.insert(0, ".")
+
+from src.api import json_backend
+from src.api.chatbot_client import ChatbotClient
+from src.api.local_server import FILLER_TEXT
+
+DEFAULT_SIZES = "1000,100000,500000"
+
+ENGLISH_TEXT = (
+    "Automated tests should be independent, repeatable and fast. Use pytest for unit and "
+    "integration tests, run the suite in CI/CD and measure coverage to find untested code. "
+)
+
+# Nombre -> (texto de la respuesta, ensure_ascii de json.dumps, Content-Type)
+PAYLOADS = {
+    "inglés": (ENGLISH_TEXT, False, "application/json"),
+    "español": (FILLER_TEXT, False, "application/json"),
+    "español escapado": (FILLER_TEXT, True, "application/json"),
+    "sin Content-Type": (FILLER_TEXT, False, None),
+}
+
+
+def make_response(size: int, text: str, ensure_ascii: bool, content_type: Optional[str]):
+    """Respuesta ya descargada con un cuerpo JSON de unos `size` bytes, como la de la API."""
+    answer = (text * (size // len(text) + 1))[:size]
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type} if content_type else {})
+    response.encoding = get_encoding_from_headers(response.headers)
+    body = json.dumps({"answer": answer, "sources": []}, ensure_ascii=ensure_ascii)
+    response._content = body.encode()
+    return response
+
+
+def legacy_parse(response: requests.Response) -> Dict:
+    """Camino anterior: response.text, strip() y json.loads sobre el texto."""
+    text = response.text
+    if not text or not text.strip():
+        raise ValueError("Respuesta vacía")
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("Se esperaba un objeto JSON")
+    return data
+
+
+def current_parse(response: requests.Response) -> Dict:
+    """Camino actual de ChatbotClient."""
+    return ChatbotClient._parse_body(ChatbotClient._response_body(response))
+
+
+def best_time(fn: Callable, response: requests.Response, number: int) -> float:
+    """Mejor tiempo por llamada de 7 mediciones, en segundos."""
+    return min(timeit.repeat(lambda: fn(response), number=number, repeat=7)) / number
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del parseo de respuestas JSON")
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES, help="Tamaños en bytes, separados por comas"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Llamadas por medición")
+    args = parser.parse_args()
+
+    print(f"orjson disponible: {'sí' if json_backend.orjson is not None else 'no'}\n")
+    header = f"{'contenido':<18}{'tamaño':>10}{'anterior':>14}{'actual':>14}{'mejora':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for name, (text, ensure_ascii, content_type) in PAYLOADS.items():
+        for size in (int(value) for value in args.sizes.split(",")):
+            response = make_response(size, text, ensure_ascii, content_type)
+            if content_type is not None:
+                # Sin Content-Type, requests adivina la codificación y el texto puede diferir
+                assert legacy_parse(response) == current_parse(response)
+            # La detección de codificación es muy lenta: menos llamadas por medición
+            number = args.repeat if content_type else max(1, args.repeat // 10)
+            before = best_time(legacy_parse, response, number)
+            after = best_time(current_parse, response, number)
+            print(
+                f"{name:<18}{size:>10}{before * 1e6:>11.1f} µs{after * 1e6:>11.1f} µs"
+                f"{before / after:>8.1f}x"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Script de prueba de carga contra la API del chatbot (o el servidor local).
+
+Ejemplos:
+    # Concurrencia fija con rampa 2 -> 4 -> 8 usuarios, 30s cada etapa
+    python load_test.py --mode closed --stage 30:2 --stage 30:4 --stage 30:8
+
+    # Tasa de llegada fija contra el servidor local con latencia lognormal
+    python load_test.py --mode open --stage 60:20 --local --latency lognormal:0.2,0.5
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from src.api.chatbot_client import ChatbotClient
+from src.api.local_server import LocalChatbotServer
+from src.utils.config import Config
+from src.utils.load_test import LoadStage, LoadTester, save_report
+
+DEFAULT_QUESTIONS = [
+    "¿Cómo escribir tests unitarios en Python?",
+    "What are the best practices for QA automation?",
+    "Recommend me QA testing frameworks",
+    "¿Qué es TDD?",
+]
+
+# Presupuesto de latencia de test_question_response_time
+DEFAULT_P99_BUDGET = 20.0
+
+
+def parse_stage(value: str, mode: str) -> LoadStage:
+    """Convierte "DURACIÓN:VALOR" en una etapa (VALOR es tasa o concurrencia según el modo)."""
+    try:
+        duration, amount = value.split(":")
+        if mode == "open":
+            return LoadStage(duration=float(duration), rate=float(amount))
+        return LoadStage(duration=float(duration), concurrency=int(amount))
+    except ValueError:
+        raise SystemExit(f"Etapa inválida '{value}', se esperaba DURACIÓN:VALOR")
+
+
+def load_questions(path: str) -> list:
+    """Lee preguntas de un archivo JSON (lista de textos u objetos con 'question')."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [item["question"] if isinstance(item, dict) else item for item in data]
+
+
+def print_summary(summary: dict):
+    """Imprime las métricas globales y por etapa."""
+    rows = [("TOTAL", summary["overall"])] + [
+        (f"Etapa {i + 1}", stage) for i, stage in enumerate(summary["per_stage"])
+    ]
+    print("\n" + "=" * 90)
+    print(
+        f"{'':10s} {'peticiones':>10s} {'req/s':>8s} {'errores':>8s} "
+        f"{'p50':>8s} {'p90':>8s} {'p99':>8s} {'max':>8s}"
+    )
+    print("-" * 90)
+    for label, metrics in rows:
+        latency = metrics["latency"]
+        cells = [
+            f"{latency[k]:8.3f}" if latency[k] is not None else f"{'-':>8s}"
+            for k in ("p50", "p90", "p99", "max")
+        ]
+        print(
+            f"{label:10s} {metrics['requests']:10d} {metrics['throughput']:8.2f} "
+            f"{metrics['error_rate']:8.1%} " + " ".join(cells)
+        )
+    print("=" * 90)
+    if summary["overall"]["errors_by_type"]:
+        print(f"Errores: {summary['overall']['errors_by_type']}")
+    if "phases_mean" in summary["overall"]:
+        phases = summary["overall"]["phases_mean"]
+        print("Fases (media): " + ", ".join(f"{k}={v:.3f}" for k, v in phases.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API del chatbot")
+    parser.add_argument("--mode", choices=["open", "closed"], default="closed")
+    parser.add_argument(
+        "--stage",
+        action="append",
+        default=[],
+        metavar="DURACIÓN:VALOR",
+        help="Segundos y tasa (open) o concurrencia (closed); repetir para una rampa",
+    )
+    parser.add_argument("--url", default=None, help="Endpoint (por defecto Config.API_URL)")
+    parser.add_argument("--questions", default=None, help="Archivo JSON con preguntas")
+    parser.add_argument("--max-workers", type=int, default=None, help="Hilos en modo open")
+    parser.add_argument("--output", type=Path, default=None, help="Ruta del reporte JSON")
+    parser.add_argument("--p99-budget", type=float, default=DEFAULT_P99_BUDGET)
+    parser.add_argument(
+        "--timings", action="store_true", help="Medir conexión, primer byte, descarga y reintentos"
+    )
+    parser.add_argument(
+        "--rate-limit", type=float, default=None, help="Límite del cliente en peticiones/s"
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true", help="Concurrencia adaptativa (AIMD) en el cliente"
+    )
+    parser.add_argument(
+        "--hedge", action="store_true", help="Peticiones de respaldo para las más lentas"
+    )
+    parser.add_argument("--local", action="store_true", help="Usar el servidor local")
+    parser.add_argument("--latency", default="fixed:0", help="Latencia del servidor local")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="TIPO=TASA")
+    parser.add_argument("--payload-size", type=int, default=None)
+    args = parser.parse_args()
+
+    stages = [parse_stage(value, args.mode) for value in args.stage or ["30:4"]]
+    questions = load_questions(args.questions) if args.questions else DEFAULT_QUESTIONS
+
+    server = None
+    url = args.url
+    if args.local:
+        error_rates = {
+            fault: float(rate) for fault, _, rate in (v.partition("=") for v in args.error_rate)
+        }
+        server = LocalChatbotServer(
+            latency=args.latency, error_rates=error_rates, payload_size=args.payload_size
+        ).start()
+        url = server.url
+
+    # El pool debe cubrir todas las peticiones en vuelo para reutilizar conexiones
+    max_workers = args.max_workers or 4 * Config.MAX_CONCURRENCY
+    if args.mode == "closed":
+        max_workers = max(stage.concurrency for stage in stages)
+    client = ChatbotClient(
+        base_url=url,
+        pool_maxsize=max_workers,
+        collect_timings=args.timings or None,
+        # Cada petición generada debe llegar al servidor
+        coalesce=False,
+        circuit_breaker=False,
+        rate_limit=args.rate_limit,
+        adaptive_concurrency=args.adaptive or None,
+        hedge=args.hedge or None,
+    )
+    print(f"🚀 Prueba de carga ({args.mode}) contra {client.base_url}")
+
+    try:
+        tester = LoadTester(client.ask, questions, max_workers=max_workers)
+        result = tester.run(stages, mode=args.mode)
+    finally:
+        client.close()
+        if server is not None:
+            server.stop()
+
+    summary = result.summary()
+    summary["target"] = client.base_url
+    summary["p99_budget"] = args.p99_budget
+    if client.rate_limiter is not None:
+        summary["rate_limiter"] = client.rate_limiter.stats
+    if client.concurrency_limiter is not None:
+        summary["concurrency_limiter"] = client.concurrency_limiter.stats
+    if client.hedge_policy is not None:
+        summary["hedging"] = client.hedge_policy.stats
+    print_summary(summary)
+    report_path = save_report(summary, args.output)
+    print(f"\n📄 Reporte guardado en: {report_path}")
+
+    p99 = summary["overall"]["latency"]["p99"]
+    if p99 is not None and p99 > args.p99_budget:
+        print(f"❌ p99 {p99:.2f}s excede el presupuesto de {args.p99_budget:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
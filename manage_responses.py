@@ -0,0 +1,258 @@
+"""
+Maintenance commands for the saved responses store.
+
+Examples:
+    python manage_responses.py migrate
+    python manage_responses.py migrate --delete
+    python manage_responses.py reindex
+    python manage_responses.py rebuild-summary
+    python manage_responses.py compact --older-than 7
+    python manage_responses.py compact --all --codec gzip
+"""
+
+import argparse
+import json
+import logging
+import random
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, ".")
+
+from src.utils.response_logger import ResponseLogger
+
+LEGACY_DIR_NAME = "legacy"
+MIGRATION_BATCH_SIZE = 500
+LATENCY_SAMPLES = 200
+
+
+def read_legacy_files(paths: List[Path]) -> Tuple[List[Tuple[Path, Dict]], List[Path]]:
+    """
+    Read one-file-per-response JSON files, oldest first.
+
+    Args:
+        paths: Legacy files to read
+
+    Returns:
+        (path, record) pairs sorted by timestamp, and the files that could not be read
+    """
+    loaded, failed = [], []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {path.name}: {e}")
+            failed.append(path)
+            continue
+        if not isinstance(data, dict) or "question" not in data:
+            print(f"⚠️  Skipping {path.name}: not a saved response")
+            failed.append(path)
+            continue
+        data.setdefault("name", path.stem)
+        loaded.append((path, data))
+
+    loaded.sort(key=lambda item: (item[1].get("timestamp", ""), item[0].name))
+    return loaded, failed
+
+
+def _set_aside(path: Path, legacy_dir: Path, delete: bool) -> bool:
+    """Move a migrated legacy file to `legacy/` (or delete it); False if that failed."""
+    try:
+        if delete:
+            path.unlink()
+        else:
+            legacy_dir.mkdir(exist_ok=True)
+            shutil.move(str(path), str(legacy_dir / path.name))
+    except OSError as e:
+        print(f"⚠️  Could not set aside {path.name}: {e}")
+        return False
+    return True
+
+
+def migrate(log_dir: Optional[Path], delete: bool) -> int:
+    """
+    Move legacy per-file responses into the segmented store.
+
+    Each batch of records is synced to disk before its original files are moved to
+    `legacy/` (or deleted). Files whose record is already in the store, matched by the
+    `name` field, are only set aside, so an interrupted run can be repeated without
+    duplicating records.
+    """
+    response_logger = ResponseLogger(log_dir)
+    paths = response_logger.legacy_files()
+    if not paths:
+        print(f"✅ No legacy responses to migrate in {response_logger.log_dir}")
+        response_logger.close()
+        return 0
+
+    loaded, failed = read_legacy_files(paths)
+    imported = {record.get("name") for _, record in response_logger.store.iter_records()}
+    already = [(path, record) for path, record in loaded if record["name"] in imported]
+    pending = [(path, record) for path, record in loaded if record["name"] not in imported]
+
+    legacy_dir = response_logger.log_dir / LEGACY_DIR_NAME
+    not_moved = [path for path, _ in already if not _set_aside(path, legacy_dir, delete)]
+    try:
+        for start in range(0, len(pending), MIGRATION_BATCH_SIZE):
+            batch = pending[start : start + MIGRATION_BATCH_SIZE]
+            response_logger.save_records([record for _, record in batch])
+            # The records must be on disk before the originals are removed
+            response_logger.flush()
+            not_moved += [path for path, _ in batch if not _set_aside(path, legacy_dir, delete)]
+    finally:
+        response_logger.close()
+
+    print(f"✅ Migrated {len(pending)} response(s) into {response_logger.log_dir}")
+    if already:
+        print(f"ℹ️  {len(already)} file(s) had already been migrated")
+    if not delete and len(loaded) > len(not_moved):
+        print(f"📁 Original files moved to {legacy_dir}")
+    if not_moved:
+        print(f"⚠️  {len(not_moved)} file(s) were migrated but left in place; run migrate again")
+    if failed:
+        print(f"⚠️  {len(failed)} file(s) could not be migrated and were left in place")
+    return 1 if failed or not_moved else 0
+
+
+def reindex(log_dir: Optional[Path]) -> int:
+    """Rebuild the SQLite index from the segment files."""
+    with ResponseLogger(log_dir) as response_logger:
+        count = response_logger.reindex()
+        print(f"✅ Indexed {count} response(s) in {response_logger.index.path}")
+    return 0
+
+
+def rebuild_summary(log_dir: Optional[Path]) -> int:
+    """Recompute the summary manifest from the segment files."""
+    with ResponseLogger(log_dir) as response_logger:
+        count = response_logger.rebuild_summary()
+        print(f"✅ Summarized {count} response(s) in {response_logger.manifest.path}")
+    return 0
+
+
+def _read_latency(response_logger: ResponseLogger, refs: List) -> Dict[str, float]:
+    """Mean, p50 and p99 latency of load_response() over the given refs, in microseconds."""
+    timings = []
+    for ref in refs:
+        start = time.perf_counter()
+        response_logger.load_response(ref)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return {
+        "mean": statistics.mean(timings),
+        "p50": timings[len(timings) // 2],
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def compact(
+    log_dir: Optional[Path],
+    older_than_days: float,
+    include_active: bool,
+    codec: Optional[str],
+    block_bytes: Optional[int],
+) -> int:
+    """
+    Compress old segments into block archives and report the compression ratio and
+    the single-record read latency before and after.
+    """
+    with ResponseLogger(log_dir) as response_logger:
+        response_logger.flush()
+        older_than = datetime.now() - timedelta(days=older_than_days) if older_than_days else None
+        compacted = response_logger.compact(older_than, include_active, codec, block_bytes)
+        if not compacted:
+            print(f"✅ No segments to compact in {response_logger.log_dir}")
+            return 0
+
+        raw = sum(stats["raw_bytes"] for stats in compacted.values())
+        compressed = sum(stats["compressed_bytes"] for stats in compacted.values())
+        records = sum(stats["records"] for stats in compacted.values())
+        blocks = sum(stats["blocks"] for stats in compacted.values())
+        print(
+            f"✅ Compacted {len(compacted)} segment(s), {records} response(s) "
+            f"in {blocks} block(s) of {response_logger.log_dir}"
+        )
+        print(
+            f"📦 {raw:,} -> {compressed:,} bytes "
+            f"(ratio {raw / compressed if compressed else 0:.1f}x)"
+        )
+
+        refs = [ref for ref, _ in response_logger.store.iter_records() if ref.segment in compacted]
+        sample = random.sample(refs, min(LATENCY_SAMPLES, len(refs)))
+        if sample:
+            latency = _read_latency(response_logger, sample)
+            print(
+                f"⏱️  Random read latency over {len(sample)} response(s): "
+                f"mean {latency['mean']:.0f} µs, p50 {latency['p50']:.0f} µs, "
+                f"p99 {latency['p99']:.0f} µs"
+            )
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Manage saved chatbot responses")
+    parser.add_argument(
+        "--log-dir", type=Path, default=None, help="Responses directory (default: responses/)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Import legacy one-file-per-response JSON files into the store"
+    )
+    migrate_parser.add_argument(
+        "--delete", action="store_true", help="Delete the originals instead of moving them"
+    )
+
+    subparsers.add_parser("reindex", help="Rebuild the query index from the segment files")
+    subparsers.add_parser(
+        "rebuild-summary", help="Recompute the summary manifest from the segment files"
+    )
+
+    compact_parser = subparsers.add_parser(
+        "compact", help="Compress closed segments into block archives"
+    )
+    compact_parser.add_argument(
+        "--older-than",
+        type=float,
+        default=0,
+        metavar="DAYS",
+        help="Only segments whose newest response is older than this (default: any age)",
+    )
+    compact_parser.add_argument(
+        "--all", action="store_true", help="Also compact the segment being written"
+    )
+    compact_parser.add_argument(
+        "--codec",
+        choices=["zstd", "lzma", "gzip"],
+        default=None,
+        help="Compression codec (default: RESPONSE_ARCHIVE_CODEC)",
+    )
+    compact_parser.add_argument(
+        "--block-bytes",
+        type=int,
+        default=None,
+        help="Uncompressed block size (default: RESPONSE_ARCHIVE_BLOCK_BYTES)",
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+
+    if args.command == "migrate":
+        return migrate(args.log_dir, args.delete)
+    if args.command == "reindex":
+        return reindex(args.log_dir)
+    if args.command == "rebuild-summary":
+        return rebuild_summary(args.log_dir)
+    if args.command == "compact":
+        return compact(args.log_dir, args.older_than, args.all, args.codec, args.block_bytes)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
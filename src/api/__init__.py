@@ -1,5 +1,6 @@
 """API client package."""
 
+from .async_chatbot_client import AsyncChatbotClient
 from .chatbot_client import ChatbotClient
 
-__all__ = ["ChatbotClient"]
+__all__ = ["ChatbotClient", "AsyncChatbotClient"]
@@ -0,0 +1,362 @@
+"""
+Cliente asíncrono para interactuar con la API del chatbot.
+Permite ejecutar lotes de preguntas en paralelo con un límite de peticiones en vuelo.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+from urllib3.util.retry import Retry
+
+from src.api.chatbot_client import (
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUS_CODES,
+    THROTTLE_STATUS_CODES,
+    ChatbotClient,
+)
+from src.api.circuit_breaker import CircuitBreaker
+from src.api.hedging import HedgePolicy, run_hedged_async
+from src.api.rate_limit import create_concurrency_limiter, create_rate_limiter
+from src.api.single_flight import AsyncSingleFlight
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncChatbotClient:
+    """Cliente asíncrono para realizar peticiones concurrentes a la API del chatbot."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        coalesce: Optional[bool] = None,
+        rate_limit: Optional[float] = None,
+        adaptive_concurrency: Optional[bool] = None,
+        circuit_breaker: Optional[bool] = None,
+        hedge: Optional[bool] = None,
+    ):
+        """
+        Inicializa el cliente asíncrono del chatbot.
+
+        Args:
+            base_url: URL base para la API (por defecto usa Config.API_URL)
+            timeout: Tiempo de espera de la petición en segundos
+                (por defecto usa Config.API_TIMEOUT)
+            max_concurrency: Máximo de peticiones en vuelo (por defecto usa Config.MAX_CONCURRENCY)
+            coalesce: Si True, las preguntas idénticas en vuelo comparten una petición
+                (por defecto usa Config.COALESCE_REQUESTS)
+            rate_limit: Peticiones por segundo como máximo; 0 sin límite
+                (por defecto usa Config.RATE_LIMIT_RPS)
+            adaptive_concurrency: Si True, ajusta las peticiones en vuelo (hasta
+                max_concurrency) según los 429 y la latencia (por defecto usa
+                Config.ADAPTIVE_CONCURRENCY)
+            circuit_breaker: Si True, tras varios fallos seguidos falla al instante sin
+                llamar a la API (por defecto usa Config.CIRCUIT_BREAKER_ENABLED)
+            hedge: Si True, envía un duplicado de las peticiones más lentas que el
+                percentil configurado, usa la primera respuesta y cancela la otra
+                (por defecto usa Config.HEDGE_REQUESTS)
+        """
+        self.base_url = base_url or Config.API_URL
+        self.timeout = timeout or Config.API_TIMEOUT
+        self.max_concurrency = max_concurrency or Config.MAX_CONCURRENCY
+        self.retry_count = Config.REQUEST_RETRY_COUNT
+        if coalesce is None:
+            coalesce = Config.COALESCE_REQUESTS
+        # Se puede reemplazar por una instancia compartida entre varios clientes
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        if adaptive_concurrency is None:
+            adaptive_concurrency = Config.ADAPTIVE_CONCURRENCY
+        # Compartibles con otros clientes (también síncronos) contra la misma API
+        self.rate_limiter = create_rate_limiter(rate_limit)
+        self.concurrency_limiter = (
+            create_concurrency_limiter(self.max_concurrency) if adaptive_concurrency else None
+        )
+        if circuit_breaker is None:
+            circuit_breaker = Config.CIRCUIT_BREAKER_ENABLED
+        self.circuit_breaker = (
+            CircuitBreaker(is_failure=self._is_service_failure) if circuit_breaker else None
+        )
+        if hedge is None:
+            hedge = Config.HEDGE_REQUESTS
+        self.hedge_policy = HedgePolicy() if hedge else None
+        # La sesión y el semáforo se crean dentro del event loop que los usa
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Crea la sesión HTTP de forma diferida, con un pool del tamaño del límite."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Crea el semáforo que limita las peticiones en vuelo."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @staticmethod
+    def _backoff_time(retry_number: int) -> float:
+        """
+        Calcula la espera antes de un reintento, igual que urllib3.Retry.
+
+        Args:
+            retry_number: Número de reintento (1 para el primero)
+
+        Returns:
+            Segundos a esperar
+        """
+        if retry_number <= 1:
+            return 0.0
+        backoff = RETRY_BACKOFF_FACTOR * (2 ** (retry_number - 1))
+        return float(min(Retry.DEFAULT_BACKOFF_MAX, backoff))
+
+    @staticmethod
+    def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+        """Obtiene la espera indicada por la cabecera Retry-After, si existe."""
+        if response.status not in Retry.RETRY_AFTER_STATUS_CODES:
+            return None
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+
+    async def _post(self, question: str) -> Tuple[aiohttp.ClientResponse, bool]:
+        """
+        Envía la petición POST aplicando la política de reintentos del cliente síncrono.
+
+        Args:
+            question: La pregunta a realizar
+
+        Returns:
+            Respuesta final (con cuerpo ya leído) y si algún intento recibió un código
+            de sobrecarga (THROTTLE_STATUS_CODES)
+        """
+        session = self._get_session()
+        payload = {"question": question}
+        throttled = False
+
+        for retry_number in range(self.retry_count + 1):
+            is_last_attempt = retry_number == self.retry_count
+            try:
+                response = await session.post(
+                    self.base_url,
+                    json=payload,
+                    headers={"Content-Type": "application/json"},
+                )
+                await response.read()
+                throttled = throttled or response.status in THROTTLE_STATUS_CODES
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if is_last_attempt:
+                    raise
+                delay = self._backoff_time(retry_number + 1)
+                logger.warning(f"Error de conexión ({e!r}), reintentando en {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status in RETRY_STATUS_CODES and not is_last_attempt:
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff_time(retry_number + 1)
+                logger.warning(f"Código {response.status} recibido, reintentando en {delay:.1f}s")
+                response.release()
+                await asyncio.sleep(delay)
+                continue
+
+            return response, throttled
+
+        raise RuntimeError("Bucle de reintentos terminado sin respuesta")  # pragma: no cover
+
+    async def ask(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """
+        Envía una pregunta a la API del chatbot.
+
+        Args:
+            question: La pregunta a realizar
+            debug: Si True, retorna información detallada de la respuesta
+
+        Returns:
+            Dict conteniendo la respuesta de la API con metadatos adicionales
+
+        Raises:
+            CircuitOpenError: Si el circuit breaker está abierto (la petición no se envía)
+            aiohttp.ClientError: Si la petición falla
+            asyncio.TimeoutError: Si la petición expira
+            ValueError: Si la respuesta es inválida o vacía
+        """
+        if not question or not question.strip():
+            raise ValueError("La pregunta no puede estar vacía")
+
+        if self.single_flight is None:
+            return await self._guarded_request(question, debug)
+        # Las preguntas idénticas en vuelo comparten la petición del líder
+        key = (question, self.base_url, self.timeout)
+        return await self.single_flight.do(key, lambda: self._guarded_request(question, debug))
+
+    async def _guarded_request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """Realiza la petición a través del circuit breaker, si está activo."""
+        send = self._hedged_request if self.hedge_policy is not None else self._request
+        if self.circuit_breaker is None:
+            return await send(question, debug)
+        return await self.circuit_breaker.call_async(send, question, debug)
+
+    async def _hedged_request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """Realiza la petición con un posible duplicado de respaldo (ver run_hedged_async)."""
+        return await run_hedged_async(lambda: self._request(question, debug), self.hedge_policy)
+
+    @staticmethod
+    def _is_service_failure(error: BaseException) -> bool:
+        """
+        Indica si un error significa que la API no está disponible.
+
+        Args:
+            error: Excepción de la petición
+
+        Returns:
+            True para timeouts, errores de conexión y respuestas 5xx/429
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500 or error.status in THROTTLE_STATUS_CODES
+        return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
+
+    async def _request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """
+        Realiza la petición HTTP respetando el límite de peticiones en vuelo.
+
+        Args:
+            question: La pregunta a realizar
+            debug: Si True, retorna información detallada de la respuesta
+
+        Returns:
+            Dict conteniendo la respuesta de la API con metadatos adicionales
+        """
+        async with self._get_semaphore():
+            try:
+                # La espera por los limitadores no cuenta como tiempo de respuesta
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async()
+                limiter = self.concurrency_limiter
+                ticket = await limiter.acquire_async() if limiter is not None else None
+
+                logger.info(f"Enviando pregunta a la API: {question[:50]}...")
+                start_time = time.perf_counter()
+                throttled = True
+                try:
+                    response, throttled = await self._post(question)
+                finally:
+                    if ticket is not None:
+                        limiter.release(ticket, overloaded=throttled)
+
+                # Calcular tiempo de respuesta
+                response_time = time.perf_counter() - start_time
+
+                if debug:
+                    logger.info(f"DEBUG - Status Code: {response.status}")
+                    logger.info(f"DEBUG - Headers: {dict(response.headers)}")
+                    logger.info(f"DEBUG - Response Time: {response_time:.2f}s")
+
+                # Lanzar excepción para códigos de estado erróneos
+                response.raise_for_status()
+
+                data = ChatbotClient._parse_body(await self._response_body(response))
+
+                # Añadir metadatos
+                result = {
+                    "data": data,
+                    "response_time": response_time,
+                    "status_code": response.status,
+                    "question": question,
+                }
+
+                logger.info(f"Respuesta recibida en {response_time:.2f}s")
+                if debug:
+                    logger.info(f"DEBUG - Response Data: {data}")
+                return result
+
+            except asyncio.TimeoutError:
+                logger.error(f"La petición expiró después de {self.timeout}s")
+                raise
+            except aiohttp.ClientError as e:
+                logger.error(f"La petición falló: {str(e)}")
+                raise
+            except ValueError as e:
+                logger.error(f"Error validando respuesta: {str(e)}")
+                raise
+
+    @staticmethod
+    async def _response_body(response: aiohttp.ClientResponse) -> Union[bytes, str]:
+        """Cuerpo en bytes si es UTF-8 (o no declara charset); si no, decodificado."""
+        charset = response.charset
+        if charset is None or charset.lower().replace("_", "-") in ("utf-8", "utf8"):
+            return await response.read()
+        return await response.text()
+
+    async def ask_many(
+        self, questions: Iterable[str], return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Envía varias preguntas concurrentemente respetando el límite de peticiones en vuelo.
+
+        Args:
+            questions: Preguntas a realizar
+            return_exceptions: Si True, los errores se devuelven en la posición de su pregunta
+                en lugar de propagarse
+
+        Returns:
+            Lista de resultados en el mismo orden que las preguntas
+        """
+        tasks = [self.ask(question) for question in questions]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def health_check(self) -> bool:
+        """
+        Verifica si la API está disponible.
+
+        Con el circuit breaker activo no envía nada si el circuito está abierto (False)
+        o si una petición tuvo éxito durante el último periodo de enfriamiento (True).
+
+        Returns:
+            True si la API está saludable, False en caso contrario
+        """
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            if breaker.is_open:
+                logger.error(f"Health check falló: circuito abierto ({breaker.stats})")
+                return False
+            if breaker.recently_succeeded():
+                return True
+        try:
+            response = await self.ask("test")
+            return response["status_code"] == 200
+        except Exception as e:
+            logger.error(f"Health check falló: {e}")
+            return False
+
+    async def close(self):
+        """
+        Cierra la sesión HTTP del cliente.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        """Entrada del administrador de contexto asíncrono."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Salida del administrador de contexto asíncrono."""
+        await self.close()
@@ -0,0 +1,257 @@
+"""
+Grabación y reproducción de respuestas reales de la API del chatbot (cassette).
+Permite ejecutar las pruebas sin conexión contra respuestas reales del LLM, en vez de
+la respuesta fija de ChatbotClientWithMock.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from src.api import json_backend
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Modos de uso del cassette
+OFF = "off"
+RECORD = "record"  # Consulta siempre la API y guarda cada respuesta
+REPLAY = "replay"  # Solo sirve respuestas grabadas; una pregunta nueva es un error
+AUTO = "auto"  # Sirve las grabadas y graba las que falten
+MODES = (OFF, RECORD, REPLAY, AUTO)
+
+# Longitud en caracteres hexadecimales de la clave de cada línea
+KEY_LENGTH = 32
+
+
+class CassetteMissError(LookupError):
+    """La pregunta no está grabada y el cassette está en modo replay."""
+
+
+def question_key(question: str) -> bytes:
+    """
+    Clave de una pregunta en el cassette.
+
+    Es un hash de longitud fija, así que el índice se reconstruye leyendo solo el
+    principio de cada línea y la pregunta no necesita escaparse.
+
+    Args:
+        question: La pregunta tal como se envía a la API
+
+    Returns:
+        Hash hexadecimal en ASCII
+    """
+    digest = hashlib.blake2b(question.encode("utf-8"), digest_size=KEY_LENGTH // 2)
+    return digest.hexdigest().encode("ascii")
+
+
+class Cassette:
+    """
+    Archivo de intercambios reales con la API, indexado por pregunta.
+
+    Cada línea es `<clave>\\t<registro JSON>`; si una pregunta se graba varias veces
+    vale la última. Al abrirlo se recorre el archivo una vez para construir el índice
+    clave -> (desplazamiento, longitud); después cada búsqueda es un acceso al
+    diccionario y una lectura. Seguro entre hilos, compartible entre clientes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        mode: Optional[str] = None,
+        simulate_latency: Optional[bool] = None,
+    ):
+        """
+        Abre (o crea al grabar) el cassette.
+
+        Args:
+            path: Archivo del cassette (por defecto usa Config.CASSETTE_PATH)
+            mode: record, replay o auto (por defecto usa Config.CASSETTE_MODE)
+            simulate_latency: Si True, al reproducir espera el response_time grabado
+                (por defecto usa Config.CASSETTE_SIMULATE_LATENCY)
+
+        Raises:
+            ValueError: Si el modo no es válido
+            FileNotFoundError: Si el archivo no existe en modo replay
+        """
+        self.path = Path(path or Config.CASSETTE_PATH)
+        self.mode = (mode or Config.CASSETTE_MODE).lower()
+        if self.mode not in MODES or self.mode == OFF:
+            raise ValueError(f"mode debe ser record, replay o auto, se recibió {self.mode!r}")
+        self.simulate_latency = (
+            Config.CASSETTE_SIMULATE_LATENCY if simulate_latency is None else simulate_latency
+        )
+
+        if self.mode == REPLAY and not self.path.exists():
+            raise FileNotFoundError(f"No existe el cassette {self.path}; grábelo con mode=record")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._size = self._build_index()
+        self._file = open(self.path, "r+b")
+
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        logger.info(f"Cassette {self.path} en modo {self.mode}: {len(self._index)} respuestas")
+
+    def _build_index(self) -> int:
+        """
+        Recorre el archivo y registra dónde empieza la última grabación de cada pregunta.
+
+        Una última línea incompleta (grabación interrumpida) se descarta.
+
+        Returns:
+            Tamaño válido del archivo en bytes
+        """
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Descartando línea incompleta al final de {self.path}")
+                    break
+                if line[KEY_LENGTH : KEY_LENGTH + 1] == b"\t":
+                    self._index[line[:KEY_LENGTH]] = (offset, len(line))
+                else:
+                    logger.warning(f"Línea inválida en {self.path} (byte {offset}), ignorada")
+                offset += len(line)
+
+        if offset != self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        return offset
+
+    def get(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene la respuesta grabada de una pregunta.
+
+        Args:
+            question: La pregunta a buscar
+
+        Returns:
+            Resultado de ChatbotClient.ask() grabado, marcado con is_replay, o None
+        """
+        key = question_key(question)
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            offset, length = location
+            self._file.seek(offset)
+            line = self._file.read(length)
+
+        result = json_backend.loads(line[KEY_LENGTH + 1 :])["result"]
+        result["is_replay"] = True
+        return result
+
+    def put(self, question: str, result: Dict[str, Any]):
+        """
+        Graba una respuesta al final del cassette.
+
+        Args:
+            question: La pregunta enviada
+            result: Resultado de ChatbotClient.ask()
+        """
+        # Los tiempos por fase describen una petición concreta, no la respuesta
+        result = {k: v for k, v in result.items() if k not in ("timings", "is_replay")}
+        record = {
+            "question": question,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "result": result,
+        }
+        key = question_key(question)
+        line = key + b"\t" + json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+        with self._lock:
+            self._file.seek(self._size)
+            self._file.write(line)
+            self._file.flush()
+            self._index[key] = (self._size, len(line))
+            self._size += len(line)
+            self.recorded += 1
+
+    def fetch(self, question: str, send: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Resuelve una pregunta según el modo del cassette.
+
+        Args:
+            question: La pregunta a realizar
+            send: Función que consulta la API real
+
+        Returns:
+            Resultado grabado o el de la API
+
+        Raises:
+            CassetteMissError: Si la pregunta no está grabada en modo replay
+        """
+        if self.mode != RECORD:
+            result = self.get(question)
+            if result is not None:
+                logger.info(f"Respuesta reproducida del cassette: {question[:50]}...")
+                if self.simulate_latency:
+                    time.sleep(result.get("response_time", 0.0))
+                return result
+            if self.mode == REPLAY:
+                raise CassetteMissError(
+                    f"Pregunta no grabada en {self.path}: {question[:80]!r}. "
+                    "Grábela con CASSETTE_MODE=record o auto"
+                )
+
+        result = send()
+        self.put(question, result)
+        return result
+
+    def __len__(self) -> int:
+        """Número de preguntas distintas grabadas."""
+        return len(self._index)
+
+    def __contains__(self, question: str) -> bool:
+        """Indica si la pregunta está grabada."""
+        return question_key(question) in self._index
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Modo, preguntas grabadas, aciertos, fallos y grabaciones de esta sesión."""
+        return {
+            "mode": self.mode,
+            "entries": len(self._index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+        }
+
+    def close(self):
+        """Cierra el archivo del cassette."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        """Entrada del administrador de contexto."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Salida del administrador de contexto."""
+        self.close()
+
+
+def create_cassette(mode: Optional[str] = None) -> Optional[Cassette]:
+    """
+    Crea el cassette configurado.
+
+    Args:
+        mode: Modo de uso (por defecto usa Config.CASSETTE_MODE)
+
+    Returns:
+        Cassette, o None si el modo es off
+    """
+    mode = (mode or Config.CASSETTE_MODE).lower()
+    return None if mode == OFF else Cassette(mode=mode)
@@ -4,85 +4,346 @@ Incluye lógica de reintento, manejo de tiempos de espera y métricas de rendimi
 """
 
 import logging
+import threading
 import time
-from typing import Any, Dict, Optional
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from src.api import json_backend
+from src.api.cassette import Cassette
+from src.api.circuit_breaker import CircuitBreaker
+from src.api.hedging import HedgePolicy, run_hedged
+from src.api.rate_limit import create_concurrency_limiter, create_rate_limiter
+from src.api.request_timing import TimedHTTPAdapter, TimedRetry, collect_timings
+from src.api.response_cache import ResponseCache
+from src.api.single_flight import SingleFlight
+from src.api.streaming import StreamingAnswer, iter_ndjson, iter_sse, iter_text
 from src.utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Prefijos de URL donde se montan los adaptadores del cliente
+PREFIXES = ("http://", "https://")
+
+# Códigos de estado que disparan un reintento automático
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+RETRY_BACKOFF_FACTOR = 1
+
+# Códigos con los que la API indica que se está excediendo su capacidad
+THROTTLE_STATUS_CODES = (429, 503)
+
+EMPTY_RESPONSE_MESSAGE = (
+    "Respuesta vacía recibida de la API. "
+    "Verifique que:\n"
+    "1. El Magic Loop está ejecutándose correctamente\n"
+    "2. El LLM block está configurado para retornar respuesta\n"
+    "3. La API Response block está correctamente mapeada"
+)
+
 
 class ChatbotClient:
     """Cliente para realizar peticiones a la API del chatbot."""
 
-    def __init__(self, base_url: Optional[str] = None, timeout: Optional[int] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        collect_timings: Optional[bool] = None,
+        coalesce: Optional[bool] = None,
+        rate_limit: Optional[float] = None,
+        adaptive_concurrency: Optional[bool] = None,
+        circuit_breaker: Optional[bool] = None,
+        hedge: Optional[bool] = None,
+        cassette: Optional[Cassette] = None,
+    ):
         """
         Inicializa el cliente del chatbot.
 
         Args:
             base_url: URL base para la API (por defecto usa Config.API_URL)
-            timeout: Tiempo de espera de la petición en segundos (por defecto usa Config.API_TIMEOUT)
+            timeout: Tiempo de espera de la petición en segundos
+                (por defecto usa Config.API_TIMEOUT)
+            pool_maxsize: Conexiones reutilizables por host (por defecto usa Config.MAX_CONCURRENCY)
+            cache: Caché de respuestas compartida; si es None no se cachea nada
+            collect_timings: Si True, añade al resultado los tiempos por fase de la petición
+                (por defecto usa Config.COLLECT_TIMINGS)
+            coalesce: Si True, las preguntas idénticas en vuelo comparten una petición
+                (por defecto usa Config.COALESCE_REQUESTS)
+            rate_limit: Peticiones por segundo como máximo; 0 sin límite
+                (por defecto usa Config.RATE_LIMIT_RPS)
+            adaptive_concurrency: Si True, ajusta las peticiones en vuelo (hasta
+                pool_maxsize) según los 429 y la latencia (por defecto usa
+                Config.ADAPTIVE_CONCURRENCY)
+            circuit_breaker: Si True, tras varios fallos seguidos falla al instante sin
+                llamar a la API (por defecto usa Config.CIRCUIT_BREAKER_ENABLED)
+            hedge: Si True, envía un duplicado de las peticiones más lentas que el
+                percentil configurado y usa la primera respuesta
+                (por defecto usa Config.HEDGE_REQUESTS)
+            cassette: Cassette donde grabar o de donde reproducir las respuestas de ask();
+                si es None siempre se consulta la API
         """
         self.base_url = base_url or Config.API_URL
         self.timeout = timeout or Config.API_TIMEOUT
+        self.pool_maxsize = pool_maxsize or Config.MAX_CONCURRENCY
+        self.cache = cache
+        self.cassette = cassette
+        self.collect_timings = (
+            Config.COLLECT_TIMINGS if collect_timings is None else collect_timings
+        )
+        if coalesce is None:
+            coalesce = Config.COALESCE_REQUESTS
+        # Se puede reemplazar por una instancia compartida entre varios clientes
+        self.single_flight = SingleFlight() if coalesce else None
+        if adaptive_concurrency is None:
+            adaptive_concurrency = Config.ADAPTIVE_CONCURRENCY
+        # Igual que single_flight, se pueden compartir entre clientes contra la misma API
+        self.rate_limiter = create_rate_limiter(rate_limit)
+        self.concurrency_limiter = (
+            create_concurrency_limiter(self.pool_maxsize) if adaptive_concurrency else None
+        )
+        if circuit_breaker is None:
+            circuit_breaker = Config.CIRCUIT_BREAKER_ENABLED
+        self.circuit_breaker = (
+            CircuitBreaker(is_failure=self._is_service_failure) if circuit_breaker else None
+        )
+        if hedge is None:
+            hedge = Config.HEDGE_REQUESTS
+        self.hedge_policy = HedgePolicy() if hedge else None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        # Peticiones con respaldo en curso por executor: uno reemplazado al ampliar el
+        # pool se cierra cuando termina la última, que aún puede enviar su respaldo
+        self._hedge_users: Counter = Counter()
+        # Protege la creación y el reemplazo del executor de respaldos y del pool
+        self._pool_lock = threading.Lock()
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
         """Crea una sesión de requests con lógica de reintento."""
         session = requests.Session()
+        self._mount_adapters(session, self.pool_maxsize)
+        return session
+
+    def _mount_adapters(self, session: requests.Session, pool_maxsize: int):
+        """
+        Monta adaptadores HTTP con reintentos y un pool dimensionado para la concurrencia.
+
+        Args:
+            session: Sesión donde montar los adaptadores
+            pool_maxsize: Conexiones que el pool mantiene abiertas por host
+        """
+        # Las clases medidas solo se montan si se piden tiempos, para no añadir coste
+        retry_class = TimedRetry if self.collect_timings else Retry
+        adapter_class = TimedHTTPAdapter if self.collect_timings else HTTPAdapter
 
         # Configurar estrategia de reintento
-        retry_strategy = Retry(
+        retry_strategy = retry_class(
             total=Config.REQUEST_RETRY_COUNT,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
             allowed_methods=["GET", "POST"],
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        return session
+        # Solo se habla con un host, así que basta un pool por esquema; su tamaño debe
+        # cubrir a todos los hilos concurrentes para no descartar conexiones.
+        adapter = adapter_class(
+            max_retries=retry_strategy, pool_connections=1, pool_maxsize=pool_maxsize
+        )
+        for prefix in PREFIXES:
+            session.mount(prefix, adapter)
+        self.pool_maxsize = pool_maxsize
 
-    def ask(self, question: str, debug: bool = False) -> Dict[str, Any]:
+    def ask(self, question: str, debug: bool = False, use_cache: bool = True) -> Dict[str, Any]:
         """
         Envía una pregunta a la API del chatbot.
 
         Args:
             question: La pregunta a realizar
             debug: Si True, retorna información detallada de la respuesta
+            use_cache: Si False, ignora la caché de respuestas y consulta siempre la API
 
         Returns:
             Dict conteniendo la respuesta de la API con metadatos adicionales
 
         Raises:
+            CircuitOpenError: Si el circuit breaker está abierto (la petición no se envía)
+            CassetteMissError: Si la pregunta no está grabada y el cassette está en modo replay
             requests.RequestException: Si la petición falla
-            ValueError: Si la respuesta es inválida o vacía
+            ValueError: Si la pregunta está vacía o la respuesta es inválida
+        """
+        if not question or not question.strip():
+            raise ValueError("La pregunta no puede estar vacía")
+
+        if self.cache is None or not use_cache:
+            return self._coalesced_request(question, debug)
+
+        key = self._request_key(question)
+        result = self.cache.get(key)
+        if result is not None:
+            logger.info(f"Respuesta obtenida de caché: {question[:50]}...")
+            return result
+
+        result = self._coalesced_request(question, debug)
+        self.cache.set(key, result)
+        return result
+
+    def _coalesced_request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """
+        Realiza la petición, compartiéndola con las llamadas concurrentes idénticas.
+
+        Los seguidores reciben una copia del resultado del líder, con su mismo
+        response_time.
+        """
+        if self.single_flight is None:
+            return self._recorded_request(question, debug)
+        return self.single_flight.do(
+            self._request_key(question), lambda: self._recorded_request(question, debug)
+        )
+
+    def _recorded_request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """
+        Resuelve la petición con el cassette, si está activo.
+
+        Una respuesta reproducida no pasa por el circuit breaker ni los limitadores.
+
+        Raises:
+            CassetteMissError: Si la pregunta no está grabada y el cassette está en modo replay
+        """
+        if self.cassette is None:
+            return self._guarded_request(question, debug)
+        return self.cassette.fetch(question, lambda: self._guarded_request(question, debug))
+
+    def _guarded_request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """Realiza la petición a través del circuit breaker, si está activo."""
+        send = self._hedged_request if self.hedge_policy is not None else self._request
+        if self.circuit_breaker is None:
+            return send(question, debug)
+        return self.circuit_breaker.call(send, question, debug)
+
+    def _hedged_request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """
+        Realiza la petición con un posible duplicado de respaldo (ver run_hedged).
+
+        El response_time del resultado es el del intento que respondió primero.
+        """
+        with self._pool_lock:
+            if self._hedge_executor is None:
+                # Cada pregunta puede ocupar dos hilos: la original y su respaldo
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=2 * self.pool_maxsize, thread_name_prefix="hedge"
+                )
+            executor = self._hedge_executor
+            self._hedge_users[executor] += 1
+        try:
+            return run_hedged(executor, lambda: self._request(question, debug), self.hedge_policy)
+        finally:
+            with self._pool_lock:
+                self._hedge_users[executor] -= 1
+                retired = executor is not self._hedge_executor and not self._hedge_users[executor]
+                if not self._hedge_users[executor]:
+                    del self._hedge_users[executor]
+            if retired:
+                executor.shutdown(wait=False)
+
+    def _retire_hedge_executor(self) -> Optional[ThreadPoolExecutor]:
+        """
+        Quita el executor de respaldos actual; debe llamarse con _pool_lock tomado.
+
+        Returns:
+            El executor si nadie lo está usando y se puede cerrar ya; si hay peticiones
+            con respaldo en curso, la última lo cerrará al terminar
+        """
+        executor, self._hedge_executor = self._hedge_executor, None
+        if executor is None or self._hedge_users[executor]:
+            return None
+        return executor
+
+    @staticmethod
+    def _is_service_failure(error: BaseException) -> bool:
+        """
+        Indica si un error significa que la API no está disponible.
+
+        Timeouts, errores de conexión, reintentos agotados y respuestas 5xx/429 abren el
+        circuito; una respuesta inválida o un 4xx prueban que la API responde.
+
+        Args:
+            error: Excepción de la petición
+
+        Returns:
+            True si debe contar como fallo para el circuit breaker
+        """
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            return status >= 500 or status in THROTTLE_STATUS_CODES
+        return isinstance(
+            error,
+            (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.RetryError,
+            ),
+        )
+
+    def _request_key(self, question: str) -> Tuple:
+        """
+        Identifica una petición por la pregunta, el endpoint y las opciones del cliente.
+
+        Args:
+            question: La pregunta a realizar
+
+        Returns:
+            Tupla usable como clave de diccionario
         """
-        start_time = time.time()
+        return (question, self.base_url, self.timeout)
 
+    def _request(self, question: str, debug: bool = False) -> Dict[str, Any]:
+        """
+        Realiza la petición HTTP a la API del chatbot, sin pasar por la caché.
+
+        Args:
+            question: La pregunta a realizar
+            debug: Si True, retorna información detallada de la respuesta
+
+        Returns:
+            Dict conteniendo la respuesta de la API con metadatos adicionales
+        """
         try:
             if not question or not question.strip():
                 raise ValueError("La pregunta no puede estar vacía")
 
+            # La espera por los limitadores no cuenta como tiempo de respuesta
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            ticket = self.concurrency_limiter.acquire() if self.concurrency_limiter else None
+
             logger.info(f"Enviando pregunta a la API: {question[:50]}...")
+            start_time = time.perf_counter()
 
             # Realizar la petición POST enviando JSON
             payload = {"question": question}
-            response = self.session.post(
-                self.base_url,
-                json=payload,
-                timeout=self.timeout,
-                headers={"Content-Type": "application/json"},
-            )
+            overloaded = True
+            try:
+                with collect_timings() if self.collect_timings else nullcontext() as timings:
+                    response = self.session.post(
+                        self.base_url,
+                        json=payload,
+                        timeout=self.timeout,
+                        headers={"Content-Type": "application/json"},
+                    )
+                overloaded = self._is_throttled(response)
+            finally:
+                if ticket is not None:
+                    self.concurrency_limiter.release(ticket, overloaded=overloaded)
 
             # Calcular tiempo de respuesta
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
 
             if debug:
                 logger.info(f"DEBUG - Status Code: {response.status_code}")
@@ -93,28 +354,7 @@ class ChatbotClient:
             # Lanzar excepción para códigos de estado erróneos
             response.raise_for_status()
 
-            # Verificar respuesta vacía
-            if not response.content or not response.text.strip():
-                error_msg = (
-                    "Respuesta vacía recibida de la API. "
-                    "Verifique que:\n"
-                    "1. El Magic Loop está ejecutándose correctamente\n"
-                    "2. El LLM block está configurado para retornar respuesta\n"
-                    "3. La API Response block está correctamente mapeada"
-                )
-                logger.warning(error_msg)
-                raise ValueError(error_msg)
-
-            # Analizar respuesta JSON
-            try:
-                data = response.json()
-            except ValueError as e:
-                logger.error(f"Respuesta no es JSON válido: {response.text[:500]}")
-                raise ValueError(f"Respuesta JSON inválida: {response.text[:200]}") from e
-
-            # Validar estructura
-            if not isinstance(data, dict):
-                raise ValueError(f"Se esperaba un objeto JSON, se recibió: {type(data).__name__}")
+            data = self._parse_body(self._response_body(response))
 
             # Añadir metadatos
             result = {
@@ -123,9 +363,13 @@ class ChatbotClient:
                 "status_code": response.status_code,
                 "question": question,
             }
+            if timings is not None:
+                result["timings"] = timings.as_dict()
 
             logger.info(f"Respuesta recibida en {response_time:.2f}s")
             if debug:
+                if timings is not None:
+                    logger.info(f"DEBUG - Timings: {result['timings']}")
                 logger.info(f"DEBUG - Response Data: {data}")
             return result
 
@@ -139,15 +383,287 @@ class ChatbotClient:
             logger.error(f"Error validando respuesta: {str(e)}")
             raise
 
+    def ask_stream(self, question: str, debug: bool = False) -> StreamingAnswer:
+        """
+        Envía una pregunta y entrega la respuesta según llega.
+
+        Soporta server-sent events (text/event-stream), JSON por líneas
+        (application/x-ndjson) y texto plano por chunks. Si la API responde con un
+        JSON completo, la respuesta llega como un único fragmento. No usa la caché.
+
+        Args:
+            question: La pregunta a realizar
+            debug: Si True, registra información detallada de la respuesta
+
+        Returns:
+            StreamingAnswer iterable; su result() devuelve el mismo dict que ask()
+            más las métricas de streaming (ttft y huecos entre chunks)
+
+        Raises:
+            requests.RequestException: Si la petición falla
+            ValueError: Si la pregunta está vacía o la respuesta no es válida
+        """
+        if not question or not question.strip():
+            raise ValueError("La pregunta no puede estar vacía")
+
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_call()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        logger.info(f"Enviando pregunta a la API (streaming): {question[:50]}...")
+        start_time = time.perf_counter()
+
+        try:
+            response = self.session.post(
+                self.base_url,
+                json={"question": question},
+                timeout=self.timeout,
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": (
+                        "text/event-stream, application/x-ndjson, text/plain;q=0.9, "
+                        "application/json;q=0.8"
+                    ),
+                },
+                stream=True,
+            )
+        except Exception as e:
+            if breaker is not None:
+                breaker.record(e)
+            raise
+
+        try:
+            if debug:
+                logger.info(f"DEBUG - Status Code: {response.status_code}")
+                logger.info(f"DEBUG - Headers: {dict(response.headers)}")
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            fields: Dict[str, Any] = {}
+            if content_type == "text/event-stream":
+                transport, chunks = "sse", iter_sse(response, fields)
+            elif content_type in ("application/x-ndjson", "application/jsonl"):
+                transport, chunks = "ndjson", iter_ndjson(response, fields)
+            elif content_type.startswith("text/"):
+                transport, chunks = "chunked", iter_text(response)
+            else:
+                # Respuesta no incremental: se valida como en ask()
+                fields = self._parse_body(self._response_body(response))
+                answer = fields.pop("answer", "")
+                transport, chunks = "json", [answer if isinstance(answer, str) else str(answer)]
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"La petición falló: {str(e)}")
+            response.close()
+            if breaker is not None:
+                breaker.record(e)
+            raise
+        # Con las cabeceras recibidas la API se considera disponible
+        if breaker is not None:
+            breaker.record()
+
+        return StreamingAnswer(
+            chunks,
+            question,
+            status_code=response.status_code,
+            start_time=start_time,
+            fields=fields,
+            transport=transport,
+            on_close=response.close,
+        )
+
+    def ask_batch(
+        self,
+        questions: Iterable[str],
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Envía varias preguntas en paralelo usando un pool de hilos.
+
+        Args:
+            questions: Preguntas a realizar
+            max_workers: Hilos concurrentes (por defecto usa Config.MAX_CONCURRENCY)
+            ordered: Si True, los resultados siguen el orden de las preguntas;
+                si False, el orden en que terminan
+            return_exceptions: Si True, los errores se devuelven en la lista
+                en lugar de propagarse
+
+        Returns:
+            Lista de resultados de ask() (o excepciones si return_exceptions=True)
+        """
+        if not ordered:
+            return list(self.iter_batch(questions, max_workers, return_exceptions))
+
+        questions = list(questions)
+        max_workers = self._prepare_pool(max_workers)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.ask, question) for question in questions]
+            try:
+                return [self._future_result(f, return_exceptions) for f in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def iter_batch(
+        self,
+        questions: Iterable[str],
+        max_workers: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Envía varias preguntas en paralelo y entrega cada resultado en cuanto termina.
+
+        Permite procesar (p. ej. puntuar) respuestas mientras otras siguen en vuelo.
+
+        Args:
+            questions: Preguntas a realizar
+            max_workers: Hilos concurrentes (por defecto usa Config.MAX_CONCURRENCY)
+            return_exceptions: Si True, los errores se entregan como valores
+                en lugar de propagarse
+
+        Yields:
+            Resultados de ask() en orden de finalización
+        """
+        questions = list(questions)
+        max_workers = self._prepare_pool(max_workers)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.ask, question) for question in questions]
+            try:
+                for future in as_completed(futures):
+                    yield self._future_result(future, return_exceptions)
+            finally:
+                # Si el consumidor abandona el iterador, no lanzar las peticiones pendientes
+                for future in futures:
+                    future.cancel()
+
+    def _prepare_pool(self, max_workers: Optional[int]) -> int:
+        """Ajusta el pool de conexiones para que cubra a todos los hilos del lote."""
+        max_workers = max_workers or Config.MAX_CONCURRENCY
+        with self._pool_lock:
+            if max_workers <= self.pool_maxsize:
+                return max_workers
+            logger.info(f"Ampliando pool de conexiones de {self.pool_maxsize} a {max_workers}")
+            replaced = {id(self.session.adapters[p]): self.session.adapters[p] for p in PREFIXES}
+            self._mount_adapters(self.session, max_workers)
+            if self.concurrency_limiter is not None:
+                # El control AIMD puede subir hasta el nuevo tamaño del pool
+                self.concurrency_limiter.set_max_limit(max_workers)
+            # El executor de respaldos se dimensiona según el pool: se creará otro
+            idle_executor = self._retire_hedge_executor()
+
+        # Las conexiones en uso se cierran al devolverse al pool; el resto ahora
+        for adapter in replaced.values():
+            adapter.close()
+        if idle_executor is not None:
+            idle_executor.shutdown(wait=False)
+        return max_workers
+
+    @staticmethod
+    def _future_result(future: Future, return_exceptions: bool) -> Any:
+        """Obtiene el resultado de un future, devolviendo la excepción si se solicita."""
+        if return_exceptions:
+            exception = future.exception()
+            if exception is not None:
+                return exception
+        return future.result()
+
+    @staticmethod
+    def _is_throttled(response: requests.Response) -> bool:
+        """
+        Indica si la API señaló sobrecarga en la respuesta o en algún intento reintentado.
+
+        Args:
+            response: Respuesta final de la petición
+
+        Returns:
+            True si algún intento recibió un código de THROTTLE_STATUS_CODES
+        """
+        if response.status_code in THROTTLE_STATUS_CODES:
+            return True
+        retries = getattr(response.raw, "retries", None)
+        history = retries.history if retries is not None else ()
+        return any(attempt.status in THROTTLE_STATUS_CODES for attempt in history)
+
+    @staticmethod
+    def _response_body(response: requests.Response) -> Union[bytes, str]:
+        """
+        Obtiene el cuerpo para _parse_body() sin decodificarlo si no hace falta.
+
+        JSON es UTF-8 salvo que se declare otro charset, así que normalmente se devuelven
+        los bytes tal cual y el decodificador JSON los lee una sola vez.
+
+        Args:
+            response: Respuesta con el cuerpo ya descargado
+
+        Returns:
+            Bytes UTF-8, o texto decodificado si la respuesta declara otro charset
+        """
+        # requests ya fija encoding a partir de las cabeceras (None si no hay charset)
+        encoding = response.encoding
+        if encoding is None or encoding.lower().replace("_", "-") in ("utf-8", "utf8"):
+            return response.content
+        return response.text
+
+    @staticmethod
+    def _parse_body(body: Union[bytes, str]) -> Dict[str, Any]:
+        """
+        Valida y decodifica el cuerpo de una respuesta de la API.
+
+        Args:
+            body: Cuerpo de la respuesta, en bytes UTF-8 o ya decodificado
+
+        Returns:
+            Objeto JSON de la respuesta
+
+        Raises:
+            ValueError: Si el cuerpo está vacío, no es JSON o no es un objeto
+        """
+        # Verificar respuesta vacía (isspace no crea una copia del cuerpo, a diferencia de strip)
+        if not body or body.isspace():
+            logger.warning(EMPTY_RESPONSE_MESSAGE)
+            raise ValueError(EMPTY_RESPONSE_MESSAGE)
+
+        # Analizar respuesta JSON
+        try:
+            data = json_backend.loads(body)
+        except ValueError as e:
+            # Solo se decodifica el fragmento que se muestra
+            preview = body[:500]
+            if isinstance(preview, bytes):
+                preview = preview.decode("utf-8", errors="replace")
+            logger.error(f"Respuesta no es JSON válido: {preview}")
+            raise ValueError(f"Respuesta JSON inválida: {preview[:200]}") from e
+
+        # Validar estructura
+        if not isinstance(data, dict):
+            raise ValueError(f"Se esperaba un objeto JSON, se recibió: {type(data).__name__}")
+
+        return data
+
     def health_check(self) -> bool:
         """
         Verifica si la API está disponible.
 
+        Con el circuit breaker activo no envía nada si el circuito está abierto (False)
+        o si una petición tuvo éxito durante el último periodo de enfriamiento (True).
+
         Returns:
             True si la API está saludable, False en caso contrario
         """
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            if breaker.is_open:
+                logger.error(f"Health check falló: circuito abierto ({breaker.stats})")
+                return False
+            if breaker.recently_succeeded():
+                return True
         try:
-            response = self.ask("test")
+            response = self.ask("test", use_cache=False)
             return response["status_code"] == 200
         except Exception as e:
             logger.error(f"Health check falló: {e}")
@@ -157,6 +673,11 @@ class ChatbotClient:
         """
         Cierra la sesión HTTP del cliente.
         """
+        with self._pool_lock:
+            executor = self._retire_hedge_executor()
+        if executor is not None:
+            # Los respaldos perdedores aún en vuelo terminan en segundo plano
+            executor.shutdown(wait=False)
         self.session.close()
 
     def __enter__(self):
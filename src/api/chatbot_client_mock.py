@@ -5,9 +5,12 @@ Cliente de ChatBot con soporte para modo mock/simulación.
 
 import logging
 import os
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from src.api.chatbot_client import ChatbotClient as BaseClient
+from src.api.response_cache import ResponseCache
+from src.api.streaming import StreamingAnswer, split_words
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,7 @@ class ChatbotClientWithMock(BaseClient):
         timeout: Optional[int] = None,
         use_mock: bool = False,
         mock_delay: float = 0.5,
+        cache: Optional[ResponseCache] = None,
     ):
         """
         Inicializa el cliente con opción de mock.
@@ -30,12 +34,17 @@ class ChatbotClientWithMock(BaseClient):
             timeout: Timeout en segundos
             use_mock: Si True, usa respuestas simuladas
             mock_delay: Delay simulado en segundos
+            cache: Caché de respuestas compartida; si es None no se cachea nada
         """
-        super().__init__(base_url, timeout)
+        super().__init__(base_url, timeout, cache=cache)
         self.use_mock = use_mock or os.getenv("USE_MOCK", "false").lower() == "true"
         self.mock_delay = mock_delay
 
-    def ask(self, question: str, debug: bool = False) -> Dict[str, Any]:
+    def _request_key(self, question: str) -> Tuple:
+        """Distingue en la caché las respuestas simuladas de las reales."""
+        return super()._request_key(question) + (self.use_mock,)
+
+    def _request(self, question: str, debug: bool = False) -> Dict[str, Any]:
         """
         Realiza una pregunta. Si use_mock=True, retorna respuesta simulada.
 
@@ -49,12 +58,32 @@ class ChatbotClientWithMock(BaseClient):
         if self.use_mock:
             return self._get_mock_response(question, debug)
 
-        return super().ask(question, debug)
+        return super()._request(question, debug)
+
+    def ask_stream(self, question: str, debug: bool = False) -> StreamingAnswer:
+        """
+        Realiza una pregunta en streaming. Si use_mock=True, la respuesta simulada
+        se entrega palabra por palabra tras el delay simulado.
+
+        Args:
+            question: La pregunta a realizar
+            debug: Mostrar información de debug
+
+        Returns:
+            StreamingAnswer con la respuesta de la API o la simulada
+        """
+        if not self.use_mock:
+            return super().ask_stream(question, debug)
+
+        start_time = time.perf_counter()
+        fields = dict(self._get_mock_response(question, debug)["data"])
+        answer = fields.pop("answer")
+        return StreamingAnswer(
+            split_words(answer), question, start_time=start_time, fields=fields, transport="mock"
+        )
 
     def _get_mock_response(self, question: str, debug: bool = False) -> Dict[str, Any]:
         """Retorna una respuesta simulada para testing"""
-        import time
-
         start_time = time.time()
         if self.mock_delay > 0:
             time.sleep(self.mock_delay)
@@ -0,0 +1,239 @@
+"""
+Circuit breaker para las llamadas a la API del chatbot.
+Tras varios fallos consecutivos deja de llamar a la API durante un tiempo y falla al
+instante; después deja pasar una petición de prueba que decide si se cierra de nuevo.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import requests
+
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """La API se considera caída y la petición no se ha enviado."""
+
+    def __init__(self, retry_in: float):
+        """
+        Args:
+            retry_in: Segundos hasta que se permita una petición de prueba
+        """
+        super().__init__(
+            f"Circuito abierto: la API falló repetidamente, reintento en {retry_in:.1f}s"
+        )
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker seguro entre hilos.
+
+    closed: las llamadas pasan y se cuentan los fallos consecutivos.
+    open: tras `failure_threshold` fallos seguidos, las llamadas fallan con
+        CircuitOpenError durante `recovery_timeout` segundos.
+    half_open: pasado ese tiempo, se permiten hasta `half_open_max_calls` llamadas de
+        prueba; si una tiene éxito se cierra, si falla se vuelve a abrir.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        half_open_max_calls: int = 1,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        """
+        Inicializa el circuito cerrado.
+
+        Args:
+            failure_threshold: Fallos consecutivos que abren el circuito
+                (por defecto usa Config.CIRCUIT_BREAKER_THRESHOLD)
+            recovery_timeout: Segundos que permanece abierto
+                (por defecto usa Config.CIRCUIT_BREAKER_COOLDOWN)
+            half_open_max_calls: Llamadas de prueba simultáneas en estado half_open
+            is_failure: Decide si una excepción indica que la API está caída; las demás
+                (p. ej. una respuesta inválida) cuentan como respuesta recibida.
+                Por defecto cualquier excepción es un fallo.
+        """
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_BREAKER_THRESHOLD
+        self.recovery_timeout = (
+            Config.CIRCUIT_BREAKER_COOLDOWN if recovery_timeout is None else recovery_timeout
+        )
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure or (lambda error: True)
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.last_success: Optional[float] = None  # time.monotonic() del último éxito
+
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Estado actual: "closed", "open" o "half_open"."""
+        with self._lock:
+            if self._state == OPEN and self._retry_in() == 0:
+                return HALF_OPEN
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True si las llamadas se están rechazando sin enviarse."""
+        return self.state == OPEN
+
+    def _retry_in(self) -> float:
+        """Segundos de enfriamiento restantes; debe llamarse con el lock tomado."""
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_call(self):
+        """
+        Reserva el paso de una llamada.
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto o ya hay una prueba en curso
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            if self._state == OPEN:
+                retry_in = self._retry_in()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(retry_in)
+                self._state = HALF_OPEN
+                self._probes = 0
+                logger.info("Circuito semiabierto: enviando petición de prueba")
+            if self._probes >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(0.0)
+            self._probes += 1
+
+    def record_success(self):
+        """Registra una llamada que obtuvo respuesta de la API."""
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.last_success = time.monotonic()
+            if self._state != CLOSED:
+                logger.info("Circuito cerrado: la API responde de nuevo")
+                self._state = CLOSED
+
+    def record_failure(self):
+        """Registra una llamada fallida, abriendo el circuito si se alcanza el umbral."""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+                logger.warning(
+                    f"Circuito abierto tras {self.consecutive_failures} fallos consecutivos; "
+                    f"fallando al instante durante {self.recovery_timeout:.0f}s"
+                )
+
+    def record(self, error: Optional[BaseException] = None):
+        """
+        Registra el resultado de una llamada reservada con before_call().
+
+        Args:
+            error: Excepción de la llamada, o None si terminó bien
+        """
+        if error is not None and self.is_failure(error):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _abandon(self):
+        """Libera la prueba de una llamada interrumpida (cancelación, Ctrl+C) sin resultado."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta fn a través del circuito.
+
+        Returns:
+            Resultado de fn
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto
+        """
+        self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record(e)
+            raise
+        except BaseException:
+            self._abandon()
+            raise
+        self.record(None)
+        return result
+
+    async def call_async(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Versión de call() para corrutinas.
+
+        Returns:
+            Resultado de await fn
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto
+        """
+        self.before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            self.record(e)
+            raise
+        except BaseException:
+            self._abandon()
+            raise
+        self.record(None)
+        return result
+
+    def recently_succeeded(self) -> bool:
+        """True si alguna llamada tuvo éxito dentro del último periodo de enfriamiento."""
+        last_success = self.last_success
+        return last_success is not None and time.monotonic() - last_success < self.recovery_timeout
+
+    def reset(self):
+        """Cierra el circuito y pone a cero los fallos consecutivos."""
+        with self._lock:
+            self._state = CLOSED
+            self.consecutive_failures = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Estado y contadores del circuito."""
+        with self._lock:
+            retry_in = self._retry_in() if self._state == OPEN else 0.0
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failures": self.failures,
+            "successes": self.successes,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "retry_in": retry_in,
+        }
@@ -0,0 +1,229 @@
+"""
+Peticiones de respaldo (hedging) para recortar la latencia de cola.
+Si la primera petición tarda más que un percentil de las latencias recientes, se envía
+un duplicado y se usa la respuesta que llegue antes, con un tope de carga extra.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class HedgePolicy:
+    """
+    Decide cuándo enviar una petición de respaldo y lleva sus estadísticas.
+
+    La espera es el percentil `percentile` de las latencias de los últimos intentos
+    con éxito; hasta reunir `min_samples` no se envían respaldos. Como máximo se
+    envían `budget` respaldos por petición original (0.1 = un 10% de carga extra).
+    Segura entre hilos, compartible entre clientes.
+    """
+
+    def __init__(
+        self,
+        percentile: Optional[float] = None,
+        budget: Optional[float] = None,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        """
+        Inicializa la política.
+
+        Args:
+            percentile: Percentil de latencia a partir del cual se envía el respaldo
+                (por defecto usa Config.HEDGE_PERCENTILE)
+            budget: Respaldos permitidos por petición original
+                (por defecto usa Config.HEDGE_BUDGET)
+            min_samples: Latencias necesarias antes de enviar respaldos
+            window: Latencias recientes consideradas
+
+        Raises:
+            ValueError: Si el percentil o el presupuesto no son válidos
+        """
+        self.percentile = Config.HEDGE_PERCENTILE if percentile is None else percentile
+        self.budget = Config.HEDGE_BUDGET if budget is None else budget
+        if not 0 < self.percentile < 100:
+            raise ValueError(f"percentile debe estar entre 0 y 100, se recibió {self.percentile}")
+        if self.budget < 0:
+            raise ValueError(f"budget no puede ser negativo, se recibió {self.budget}")
+
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def delay(self) -> Optional[float]:
+        """
+        Espera antes de enviar el respaldo.
+
+        Returns:
+            Segundos, o None si aún no hay latencias suficientes
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        rank = math.ceil(self.percentile / 100 * len(ordered))
+        return ordered[max(0, rank - 1)]
+
+    def record_latency(self, latency: float):
+        """Registra la latencia de un intento terminado con éxito."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def start_request(self):
+        """Cuenta una petición original."""
+        with self._lock:
+            self.requests += 1
+
+    def allow_hedge(self) -> bool:
+        """
+        Reserva un respaldo si el presupuesto lo permite.
+
+        Returns:
+            True si se puede enviar el respaldo
+        """
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                self.budget_denied += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def record_hedge_win(self):
+        """Cuenta un respaldo que respondió antes que la petición original."""
+        with self._lock:
+            self.hedge_wins += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Peticiones, respaldos enviados, respaldos ganadores y espera actual."""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+            "budget_denied": self.budget_denied,
+            "delay": self.delay(),
+        }
+
+
+def _attempt_latency(result: Any) -> Optional[float]:
+    """Latencia propia de un intento, tomada del response_time de su resultado."""
+    if isinstance(result, dict):
+        return result.get("response_time")
+    return None
+
+
+def run_hedged(executor: Executor, fn: Callable[[], Any], policy: HedgePolicy) -> Any:
+    """
+    Ejecuta fn en el executor y, si tarda más que la espera de la política, un duplicado.
+
+    Devuelve el primer intento con éxito. El perdedor se cancela si aún no empezó; una
+    petición HTTP síncrona ya enviada no se puede interrumpir, así que termina en
+    segundo plano y su resultado se descarta.
+
+    Args:
+        executor: Pool donde se ejecutan los intentos
+        fn: Función que realiza un intento
+        policy: Política de respaldo
+
+    Returns:
+        Resultado del intento ganador
+
+    Raises:
+        Exception: La excepción de la petición original si todos los intentos fallan
+    """
+
+    def on_done(future: Future):
+        if not future.cancelled() and future.exception() is None:
+            latency = _attempt_latency(future.result())
+            if latency is not None:
+                policy.record_latency(latency)
+
+    policy.start_request()
+    delay = policy.delay()
+    attempts: List[Future] = [executor.submit(fn)]
+    attempts[0].add_done_callback(on_done)
+
+    if delay is not None:
+        done, _ = wait(attempts, timeout=delay)
+        if not done and policy.allow_hedge():
+            logger.info(f"Sin respuesta tras {delay:.2f}s, enviando petición de respaldo")
+            attempts.append(executor.submit(fn))
+            attempts[1].add_done_callback(on_done)
+
+    pending = set(attempts)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = next((f for f in attempts if f in done and f.exception() is None), None)
+        if winner is not None:
+            for future in pending:
+                future.cancel()
+            if winner is not attempts[0]:
+                policy.record_hedge_win()
+            return winner.result()
+
+    return attempts[0].result()  # Todos fallaron: se propaga el error original
+
+
+async def run_hedged_async(fn: Callable[[], Awaitable[Any]], policy: HedgePolicy) -> Any:
+    """
+    Versión asíncrona de run_hedged(); el intento perdedor se cancela de verdad.
+
+    Args:
+        fn: Función que devuelve la corrutina de un intento
+        policy: Política de respaldo
+
+    Returns:
+        Resultado del intento ganador
+
+    Raises:
+        Exception: La excepción de la petición original si todos los intentos fallan
+    """
+
+    def on_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is None:
+            latency = _attempt_latency(task.result())
+            if latency is not None:
+                policy.record_latency(latency)
+
+    policy.start_request()
+    delay = policy.delay()
+    attempts: List[asyncio.Task] = [asyncio.ensure_future(fn())]
+    attempts[0].add_done_callback(on_done)
+
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and policy.allow_hedge():
+                logger.info(f"Sin respuesta tras {delay:.2f}s, enviando petición de respaldo")
+                attempts.append(asyncio.ensure_future(fn()))
+                attempts[1].add_done_callback(on_done)
+
+        pending = set(attempts)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((t for t in attempts if t in done and t.exception() is None), None)
+            if winner is not None:
+                if winner is not attempts[0]:
+                    policy.record_hedge_win()
+                return winner.result()
+        return attempts[0].result()
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
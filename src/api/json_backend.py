@@ -0,0 +1,38 @@
+"""
+Decodificación JSON de las respuestas de la API.
+Usa orjson si está instalado y el documento es ASCII (incluido el texto no ASCII
+escapado, como lo genera json.dumps) y el módulo json estándar en el resto de casos.
+Ambos aceptan los bytes UTF-8 del cuerpo sin convertirlos antes a str.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+# Nombre del backend activo, para informes y benchmarks
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decodifica un documento JSON.
+
+    Args:
+        data: Cuerpo en bytes (UTF-8) o ya decodificado
+
+    Returns:
+        Objeto Python equivalente
+
+    Raises:
+        ValueError: Si no es JSON válido (ambos backends lanzan subclases de ValueError)
+    """
+    # orjson es varias veces más rápido con texto ASCII, pero más lento que json con
+    # cadenas largas de UTF-8 sin escapar (p. ej. respuestas en español); isascii()
+    # recorre el cuerpo a velocidad de memoria, sin copiarlo
+    if orjson is not None and data.isascii():
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,424 @@
+"""
+Servidor HTTP local que imita la API del chatbot.
+Permite medir el cliente (reintentos, timeouts, pool de conexiones y parseo JSON)
+con latencias, errores y tamaños de respuesta configurables, sin red.
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, Optional, Tuple, Union
+
+from src.api.streaming import DONE_EVENT, split_words
+
+logger = logging.getLogger(__name__)
+
+# Resultados que se pueden inyectar y el código de estado con el que se responden
+FAULT_STATUS = {
+    "429": 429,
+    "500": 500,
+    "502": 502,
+    "503": 503,
+    "504": 504,
+    "empty": 200,
+    "invalid_json": 200,
+}
+
+FILLER_TEXT = (
+    "Las pruebas automatizadas deben ser independientes, repetibles y rápidas. "
+    "Usa pytest para pruebas unitarias y de integración, integra la suite en CI/CD "
+    "y mide la cobertura para detectar código sin probar. "
+)
+
+# Content-Type de cada modo de stream
+STREAM_CONTENT_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+    "chunked": "text/plain; charset=utf-8",
+}
+
+LatencySampler = Callable[[random.Random], float]
+
+
+def parse_latency(spec: Union[str, float, LatencySampler]) -> LatencySampler:
+    """
+    Construye un generador de latencias a partir de una especificación.
+
+    Formatos aceptados (valores en segundos):
+        "fixed:0.05", "uniform:0.01,0.2", "normal:0.1,0.02",
+        "lognormal:0.2,0.5" (mediana, sigma), "exponential:0.1" (media)
+
+    Args:
+        spec: Especificación en texto, un número fijo o una función rng -> segundos
+
+    Returns:
+        Función que recibe un random.Random y devuelve la latencia a simular
+
+    Raises:
+        ValueError: Si la especificación no es válida
+    """
+    if callable(spec):
+        return spec
+    if isinstance(spec, (int, float)):
+        spec = f"fixed:{spec}"
+
+    name, _, raw_params = spec.partition(":")
+    try:
+        params = [float(value) for value in raw_params.split(",") if value.strip()]
+    except ValueError as e:
+        raise ValueError(f"Parámetros de latencia inválidos: {spec}") from e
+
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+    if name not in expected:
+        raise ValueError(f"Distribución de latencia desconocida: {name}")
+    if len(params) != expected[name] or any(value < 0 for value in params):
+        raise ValueError(
+            f"La distribución {name} espera {expected[name]} parámetros no negativos: {spec}"
+        )
+
+    if name == "fixed":
+        return lambda rng: params[0]
+    if name == "uniform":
+        return lambda rng: rng.uniform(params[0], params[1])
+    if name == "normal":
+        return lambda rng: max(0.0, rng.gauss(params[0], params[1]))
+    if params[0] == 0:
+        return lambda rng: 0.0
+    if name == "lognormal":
+        mu = math.log(params[0])
+        return lambda rng: rng.lognormvariate(mu, params[1])
+    return lambda rng: rng.expovariate(1.0 / params[0])
+
+
+class _ChatbotHandler(BaseHTTPRequestHandler):
+    """Atiende POST {"question": ...} con el contrato de la API del chatbot."""
+
+    # HTTP/1.1 mantiene la conexión abierta, como la API real, para ejercitar el pool
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo se escriben por separado; sin esto Nagle y el ACK retardado
+    # añaden ~40ms a cada respuesta sobre una conexión reutilizada
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server: "_Server" = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            question = payload["question"]
+        except (ValueError, KeyError, TypeError):
+            server.owner._record("bad_request")
+            self._send(400, json.dumps({"error": 'Se esperaba {"question": ...}'}).encode())
+            return
+
+        status, body, answer = server.owner._next_response(question)
+        time.sleep(server.owner._sample_latency())
+        # Solo se hace streaming si el cliente lo acepta explícitamente, como ask_stream()
+        stream = server.owner.stream
+        accepts_stream = stream is not None and (
+            STREAM_CONTENT_TYPES[stream].split(";")[0] in self.headers.get("Accept", "")
+        )
+        if answer is not None and accepts_stream:
+            self._send_stream(answer)
+        else:
+            self._send(status, body, retry_after=status in (429, 503))
+
+    def _send(self, status: int, body: bytes, retry_after: bool = False):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        retry_after_value = self.server.owner.retry_after
+        if retry_after and retry_after_value is not None:
+            self.send_header("Retry-After", str(retry_after_value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, answer: str):
+        """Envía la respuesta por fragmentos con Transfer-Encoding: chunked."""
+        owner: "LocalChatbotServer" = self.server.owner
+        self.send_response(200)
+        self.send_header("Content-Type", STREAM_CONTENT_TYPES[owner.stream])
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        pieces = split_words(answer, owner.chunk_words)
+        for index, piece in enumerate(pieces):
+            if index and owner.chunk_interval:
+                time.sleep(owner.chunk_interval)
+            self._write_chunk(owner._frame(piece))
+        if owner.stream == "sse":
+            self._write_chunk(f"data: {DONE_EVENT}\n\n".encode())
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    """ThreadingHTTPServer con cola de conexiones amplia para pruebas de carga."""
+
+    daemon_threads = True
+    request_queue_size = 128
+    owner: "LocalChatbotServer"
+
+    def handle_error(self, request, client_address):
+        # Un cliente que abandona la petición (p. ej. un respaldo cancelado) no es un error
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class LocalChatbotServer:
+    """
+    Servidor local con el mismo contrato que la API del chatbot.
+
+    Cada petición se resuelve así: primero se consumen las respuestas de `scripted`
+    (tuplas status, body); si no hay, se sortea un fallo según `error_rates` y, si no
+    toca fallo, se responde {"answer": ...} del tamaño indicado. La latencia se aplica
+    en todos los casos.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Union[str, float, LatencySampler] = 0.0,
+        error_rates: Optional[Dict[str, float]] = None,
+        payload_size: Optional[int] = None,
+        retry_after: Optional[int] = None,
+        seed: Optional[int] = None,
+        stream: Optional[str] = None,
+        chunk_words: int = 1,
+        chunk_interval: float = 0.0,
+    ):
+        """
+        Configura el servidor (no empieza a escuchar hasta start()).
+
+        Args:
+            host: Interfaz donde escuchar
+            port: Puerto (0 elige uno libre)
+            latency: Latencia a simular, ver parse_latency()
+            error_rates: Probabilidad de cada fallo: "429", "500", "502", "503", "504",
+                "empty" (cuerpo vacío) o "invalid_json"
+            payload_size: Longitud en caracteres del campo "answer" (por defecto una
+                respuesta corta que repite la pregunta)
+            retry_after: Segundos enteros de la cabecera Retry-After en respuestas 429/503
+                (también las programadas en `scripted`)
+            seed: Semilla para latencias y errores reproducibles
+            stream: Si se indica, las respuestas correctas se envían por fragmentos:
+                "sse" (text/event-stream), "ndjson" o "chunked" (texto plano), a los
+                clientes que lo acepten en la cabecera Accept. La latencia se aplica
+                antes del primer fragmento
+            chunk_words: Palabras por fragmento en modo stream
+            chunk_interval: Segundos entre fragmentos en modo stream
+
+        Raises:
+            ValueError: Si la configuración de errores o latencia no es válida
+        """
+        self.error_rates = dict(error_rates or {})
+        unknown = set(self.error_rates) - set(FAULT_STATUS)
+        if unknown:
+            raise ValueError(f"Tipos de error desconocidos: {sorted(unknown)}")
+        if any(rate < 0 for rate in self.error_rates.values()):
+            raise ValueError("Las tasas de error no pueden ser negativas")
+        if sum(self.error_rates.values()) > 1.0:
+            raise ValueError("La suma de las tasas de error no puede superar 1.0")
+        if stream is not None and stream not in STREAM_CONTENT_TYPES:
+            raise ValueError(f"Modo de stream desconocido: {stream}")
+        if chunk_words <= 0 or chunk_interval < 0:
+            raise ValueError("chunk_words debe ser positivo y chunk_interval no negativo")
+        if payload_size is not None and payload_size < 0:
+            raise ValueError(f"payload_size debe ser no negativo, se recibió {payload_size}")
+
+        self.host = host
+        self.port = port
+        self.latency = parse_latency(latency)
+        self.payload_size = payload_size
+        self.retry_after = retry_after
+        self.stream = stream
+        self.chunk_words = chunk_words
+        self.chunk_interval = chunk_interval
+        self.scripted: Deque[Tuple[int, bytes]] = deque()
+        self.outcomes: Counter = Counter()
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL del endpoint, para usar como base_url del cliente."""
+        if self._server is None:
+            raise RuntimeError("El servidor no está iniciado")
+        return f"http://{self.host}:{self._server.server_address[1]}/run"
+
+    @property
+    def request_count(self) -> int:
+        """Peticiones recibidas desde que se inició el servidor."""
+        with self._lock:
+            return sum(self.outcomes.values())
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Peticiones recibidas por resultado ("ok", "scripted", "429", "empty", ...)."""
+        with self._lock:
+            return dict(self.outcomes)
+
+    def start(self) -> "LocalChatbotServer":
+        """Empieza a atender peticiones en un hilo en segundo plano."""
+        if self._server is not None:
+            return self
+        self._server = _Server((self.host, self.port), _ChatbotHandler)
+        self._server.owner = self
+        # Sondeo corto para que stop() no espere el intervalo por defecto de 0.5s
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Servidor local del chatbot escuchando en {self.url}")
+        return self
+
+    def stop(self):
+        """Detiene el servidor y libera el puerto."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def serve_forever(self):
+        """Atiende peticiones en el hilo actual hasta Ctrl+C."""
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _record(self, outcome: str):
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    def _sample_latency(self) -> float:
+        with self._lock:
+            return self.latency(self._rng)
+
+    def _next_response(self, question: str) -> Tuple[int, bytes, Optional[str]]:
+        """Decide status, cuerpo y, si la respuesta es correcta, el texto de la respuesta."""
+        with self._lock:
+            if self.scripted:
+                status, body = self.scripted.popleft()
+                self.outcomes["scripted"] += 1
+                return status, body, None
+
+            outcome = "ok"
+            draw = self._rng.random()
+            for fault, rate in self.error_rates.items():
+                if draw < rate:
+                    outcome = fault
+                    break
+                draw -= rate
+            self.outcomes[outcome] += 1
+
+        if outcome == "ok":
+            answer = self._answer(question)
+            body = json.dumps({"answer": answer}, ensure_ascii=False)
+            return 200, body.encode("utf-8"), answer
+        if outcome == "empty":
+            return 200, b"", None
+        if outcome == "invalid_json":
+            return 200, b'{"answer": "respuesta truncada', None
+        body = json.dumps({"error": f"Error simulado {outcome}"}).encode()
+        return FAULT_STATUS[outcome], body, None
+
+    def _frame(self, piece: str) -> bytes:
+        """Codifica un fragmento según el modo de stream."""
+        if self.stream == "sse":
+            return f"data: {json.dumps({'delta': piece}, ensure_ascii=False)}\n\n".encode()
+        if self.stream == "ndjson":
+            return (json.dumps({"delta": piece}, ensure_ascii=False) + "\n").encode()
+        return piece.encode("utf-8")
+
+    def _answer(self, question: str) -> str:
+        """Genera la respuesta, rellenada hasta payload_size caracteres si se indicó."""
+        answer = f"Respuesta a: {question}"
+        if self.payload_size is None:
+            return answer
+        if len(answer) >= self.payload_size:
+            return answer[: self.payload_size]
+        padding = self.payload_size - len(answer) - 1
+        repeats = padding // len(FILLER_TEXT) + 1
+        return answer + " " + (FILLER_TEXT * repeats)[:padding]
+
+    def __enter__(self):
+        """Entrada del administrador de contexto: inicia el servidor."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Salida del administrador de contexto: detiene el servidor."""
+        self.stop()
+
+
+def _parse_error_rate(value: str) -> Tuple[str, float]:
+    """Convierte "429=0.05" en ("429", 0.05) para argparse."""
+    fault, _, rate = value.partition("=")
+    try:
+        return fault, float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Se esperaba TIPO=TASA, se recibió: {value}")
+
+
+def main(argv=None):
+    """Punto de entrada: python -m src.api.local_server --latency lognormal:0.2,0.5"""
+    parser = argparse.ArgumentParser(description="Servidor local que imita la API del chatbot")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", default="fixed:0", help="p. ej. lognormal:0.2,0.5")
+    parser.add_argument(
+        "--error-rate",
+        type=_parse_error_rate,
+        action="append",
+        default=[],
+        metavar="TIPO=TASA",
+        help=f"Tipos: {', '.join(FAULT_STATUS)} (se puede repetir)",
+    )
+    parser.add_argument("--payload-size", type=int, default=None)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stream", choices=sorted(STREAM_CONTENT_TYPES), default=None)
+    parser.add_argument("--chunk-words", type=int, default=1)
+    parser.add_argument("--chunk-interval", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    server = LocalChatbotServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rates=dict(args.error_rate),
+        payload_size=args.payload_size,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        stream=args.stream,
+        chunk_words=args.chunk_words,
+        chunk_interval=args.chunk_interval,
+    )
+    print(f"Usa API_URL={server.start().url} para apuntar los tests a este servidor")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Control de carga del lado del cliente.
+TokenBucket limita las peticiones por segundo; AdaptiveConcurrencyLimiter ajusta las
+peticiones en vuelo (AIMD) según los 429 y el crecimiento de la latencia.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Limitador de peticiones por segundo con ráfaga, seguro entre hilos.
+
+    Funciona por reservas: cada llamada consume un token aunque el cubo esté vacío y
+    recibe el tiempo que debe esperar hasta que ese token exista. Así los hilos en
+    espera salen espaciados a 1/rate en lugar de despertar todos a la vez.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Inicializa el cubo lleno.
+
+        Args:
+            rate: Peticiones por segundo sostenidas
+            burst: Peticiones que pueden salir seguidas (por defecto max(1, rate))
+
+        Raises:
+            ValueError: Si rate o burst no son positivos
+        """
+        if rate <= 0:
+            raise ValueError(f"rate debe ser positivo, se recibió {rate}")
+        burst = burst if burst is not None else max(1, int(rate))
+        if burst <= 0:
+            raise ValueError(f"burst debe ser positivo, se recibió {burst}")
+
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    def reserve(self) -> float:
+        """
+        Reserva un token.
+
+        Returns:
+            Segundos que hay que esperar antes de usar el token (0 si hay disponible)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            self.total_wait += delay
+            return delay
+
+    def acquire(self) -> float:
+        """
+        Espera (bloqueando el hilo) hasta disponer de un token.
+
+        Returns:
+            Segundos esperados
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Espera (sin bloquear el event loop) hasta disponer de un token.
+
+        Returns:
+            Segundos esperados
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Configuración y uso del limitador."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "total_wait": self.total_wait,
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Límite de peticiones en vuelo con control AIMD, compartible entre hilos y event loops.
+
+    Cada respuesta sana suma 1/limit al límite (≈ +1 por cada `limit` respuestas); una
+    señal de sobrecarga (429/503, timeout o latencia mayor que `latency_tolerance`
+    veces la mínima reciente) lo multiplica por `backoff_ratio`. Solo cuentan las
+    sobrecargas de peticiones iniciadas después del último recorte, para que una
+    ráfaga de 429 simultáneos no lo reduzca varias veces.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        latency_window: int = 100,
+    ):
+        """
+        Inicializa el limitador.
+
+        Args:
+            initial_limit: Peticiones en vuelo permitidas al empezar
+            min_limit: Límite mínimo
+            max_limit: Límite máximo
+            backoff_ratio: Factor multiplicativo ante sobrecarga (entre 0 y 1)
+            latency_tolerance: Cuántas veces la latencia mínima reciente se considera
+                congestión (0 desactiva la señal de latencia)
+            latency_window: Respuestas recientes consideradas para la latencia mínima
+
+        Raises:
+            ValueError: Si los límites o factores no son válidos
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Se requiere 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError(f"backoff_ratio debe estar entre 0 y 1, se recibió {backoff_ratio}")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Peticiones en vuelo permitidas ahora."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Peticiones en vuelo ahora."""
+        return self._in_flight
+
+    def set_max_limit(self, max_limit: int):
+        """
+        Cambia el límite máximo, por ejemplo al redimensionar el pool de conexiones.
+
+        Args:
+            max_limit: Nuevo límite máximo (el límite actual se recorta si lo supera)
+
+        Raises:
+            ValueError: Si es menor que min_limit
+        """
+        if max_limit < self.min_limit:
+            raise ValueError(
+                f"max_limit debe ser al menos {self.min_limit}, se recibió {max_limit}"
+            )
+        with self._cond:
+            self.max_limit = max_limit
+            self._limit = min(self._limit, max_limit)
+
+    def _try_acquire(self) -> Optional[float]:
+        """Ocupa un hueco si hay; debe llamarse con el lock tomado."""
+        if self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return time.monotonic()
+        return None
+
+    def acquire(self) -> float:
+        """
+        Espera (bloqueando el hilo) a que haya hueco bajo el límite.
+
+        Returns:
+            Ticket (instante de inicio) que se pasa a release()
+        """
+        with self._cond:
+            ticket = self._try_acquire()
+            while ticket is None:
+                self._cond.wait()
+                ticket = self._try_acquire()
+            return ticket
+
+    async def acquire_async(self) -> float:
+        """
+        Espera (sin bloquear el event loop) a que haya hueco bajo el límite.
+
+        Returns:
+            Ticket (instante de inicio) que se pasa a release()
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                ticket = self._try_acquire()
+                if ticket is not None:
+                    return ticket
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, ticket: float, overloaded: bool = False):
+        """
+        Libera el hueco y ajusta el límite según el resultado de la petición.
+
+        Args:
+            ticket: Valor devuelto por acquire()
+            overloaded: True si la API indicó sobrecarga (429/503) o la petición expiró
+        """
+        now = time.monotonic()
+        latency = now - ticket
+        with self._cond:
+            self._in_flight -= 1
+
+            if not overloaded and self.latency_tolerance and self._latencies:
+                overloaded = latency > min(self._latencies) * self.latency_tolerance
+            if not overloaded:
+                self._latencies.append(latency)
+
+            if overloaded:
+                # Ignorar sobrecargas de peticiones lanzadas con el límite anterior
+                if ticket >= self._last_decrease:
+                    self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                    self._last_decrease = now
+                    self.decreases += 1
+                    logger.info(f"Sobrecarga detectada, límite de concurrencia: {self.limit}")
+            elif self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                self.increases += 1
+
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Estado del controlador."""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "min_latency": min(self._latencies) if self._latencies else None,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+def create_rate_limiter(rate: Optional[float] = None) -> Optional[TokenBucket]:
+    """
+    Crea el limitador de peticiones por segundo configurado.
+
+    Args:
+        rate: Peticiones por segundo (por defecto usa Config.RATE_LIMIT_RPS; 0 lo desactiva)
+
+    Returns:
+        TokenBucket, o None si no hay límite
+    """
+    rate = Config.RATE_LIMIT_RPS if rate is None else rate
+    if not rate:
+        return None
+    return TokenBucket(rate, Config.RATE_LIMIT_BURST or None)
+
+
+def create_concurrency_limiter(max_limit: int) -> AdaptiveConcurrencyLimiter:
+    """
+    Crea un controlador AIMD que empieza en la mitad del máximo.
+
+    Args:
+        max_limit: Peticiones en vuelo como máximo (normalmente el tamaño del pool)
+
+    Returns:
+        AdaptiveConcurrencyLimiter
+    """
+    return AdaptiveConcurrencyLimiter(initial_limit=max(1, max_limit // 2), max_limit=max_limit)
+
+
+def _wake(waiter: asyncio.Future):
+    """Despierta a una corrutina en espera para que vuelva a intentar."""
+    if not waiter.done():
+        waiter.set_result(None)
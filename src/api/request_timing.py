@@ -0,0 +1,155 @@
+"""
+Medición por fases de las peticiones HTTP del cliente síncrono.
+Separa conexión, tiempo hasta el primer byte, descarga y esperas entre reintentos.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Mediciones de la petición en curso de cada hilo (None si no se está midiendo)
+_state = threading.local()
+
+
+@dataclass
+class PhaseTimings:
+    """
+    Tiempos de una llamada a ask(), en segundos (time.perf_counter).
+
+    connect, ttfb y retry_wait se acumulan sobre todos los intentos; ttfb mide desde que
+    se envía la petición hasta recibir las cabeceras, es decir, el tiempo del servidor
+    más la red. download corresponde al intento final.
+    """
+
+    connect: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    retry_wait: float = 0.0
+    attempts: int = 0
+    total: float = 0.0
+    _sent_at: float = 0.0
+    _headers_at: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Tiempos públicos como diccionario, para el resultado de ask()."""
+        return {
+            "connect": self.connect,
+            "ttfb": self.ttfb,
+            "download": self.download,
+            "retry_wait": self.retry_wait,
+            "attempts": self.attempts,
+            "total": self.total,
+        }
+
+
+def current_timings() -> Optional[PhaseTimings]:
+    """Devuelve las mediciones activas en este hilo, o None."""
+    return getattr(_state, "timings", None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[PhaseTimings]:
+    """
+    Activa la medición por fases para las peticiones hechas en este hilo.
+
+    Yields:
+        PhaseTimings que se va completando durante la petición
+    """
+    timings = PhaseTimings()
+    previous = current_timings()
+    _state.timings = timings
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        end = time.perf_counter()
+        timings.total = end - start
+        if timings._headers_at:
+            timings.download = end - timings._headers_at
+        _state.timings = previous
+
+
+class _TimedConnectionMixin:
+    """Registra conexión, envío y llegada de cabeceras en las mediciones del hilo."""
+
+    def connect(self):
+        timings = current_timings()
+        if timings is None:
+            return super().connect()
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            timings.connect += elapsed
+            # Con HTTP la conexión se abre dentro de request(); no cuenta como espera
+            # del primer byte
+            timings._sent_at += elapsed
+
+    def request(self, *args, **kwargs):
+        timings = current_timings()
+        if timings is not None:
+            timings.attempts += 1
+            timings._sent_at = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        timings = current_timings()
+        if timings is not None:
+            now = time.perf_counter()
+            timings.ttfb += now - timings._sent_at
+            timings._headers_at = now
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    """HTTPConnection que reporta sus fases."""
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """HTTPSConnection que reporta sus fases (la conexión incluye el handshake TLS)."""
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    """Pool HTTP que crea conexiones medidas."""
+
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """Pool HTTPS que crea conexiones medidas."""
+
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedRetry(Retry):
+    """Retry que acumula el tiempo dormido entre reintentos."""
+
+    def sleep(self, response=None):
+        timings = current_timings()
+        if timings is None:
+            return super().sleep(response)
+        start = time.perf_counter()
+        try:
+            return super().sleep(response)
+        finally:
+            timings.retry_wait += time.perf_counter() - start
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter cuyos pools usan conexiones medidas."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
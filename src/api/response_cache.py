@@ -0,0 +1,66 @@
+"""
+Caché en memoria de respuestas de la API del chatbot.
+Evita repetir la misma pregunta al LLM durante una sesión de pruebas.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Caché de resultados de ChatbotClient.ask(), segura entre hilos."""
+
+    def __init__(self):
+        """Inicializa una caché vacía."""
+        self._entries: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un resultado guardado.
+
+        Args:
+            key: Clave de la petición (pregunta + endpoint + opciones del cliente)
+
+        Returns:
+            Copia del resultado guardado, o None si no existe
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        # Copia para que un test que modifique la respuesta no afecte a los demás
+        return copy.deepcopy(result)
+
+    def set(self, key: Hashable, result: Dict[str, Any]):
+        """
+        Guarda un resultado.
+
+        Args:
+            key: Clave de la petición
+            result: Resultado de ChatbotClient.ask()
+        """
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+
+    def clear(self):
+        """Elimina todos los resultados guardados."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Estadísticas de uso de la caché."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,146 @@
+"""
+Agrupación de peticiones idénticas en vuelo (single-flight).
+Mientras una pregunta está en curso, las llamadas concurrentes con la misma clave
+esperan su resultado en lugar de enviar otra petición. No guarda nada al terminar.
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """Petición en curso compartida por el líder y sus seguidores."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplica llamadas concurrentes con la misma clave, segura entre hilos."""
+
+    def __init__(self):
+        """Inicializa sin llamadas en curso."""
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta fn() una sola vez por clave entre las llamadas concurrentes.
+
+        Args:
+            key: Clave de la petición (pregunta + endpoint + opciones del cliente)
+            fn: Función que realiza la petición
+
+        Returns:
+            Resultado de fn(); los seguidores reciben una copia del resultado del líder
+
+        Raises:
+            Exception: La misma excepción que lanzó la llamada del líder
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                is_leader = True
+            else:
+                self.followers += 1
+                is_leader = False
+                logger.debug(f"Uniéndose a la petición en curso: {key}")
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Copia para que un seguidor que modifique la respuesta no afecte a los demás
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Claves con una petición en curso."""
+        return len(self._calls)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Llamadas que enviaron la petición (misses) y que se unieron a una en curso (hits)."""
+        return {"in_flight": len(self._calls), "hits": self.followers, "misses": self.leaders}
+
+
+class AsyncSingleFlight:
+    """Versión para asyncio de SingleFlight, para usar dentro de un único event loop."""
+
+    def __init__(self):
+        """Inicializa sin llamadas en curso."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecuta await fn() una sola vez por clave entre las corrutinas concurrentes.
+
+        Si el líder se cancela, sus seguidores reciben CancelledError.
+
+        Args:
+            key: Clave de la petición
+            fn: Función que devuelve la corrutina de la petición
+
+        Returns:
+            Resultado de fn(); los seguidores reciben una copia del resultado del líder
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.followers += 1
+            logger.debug(f"Uniéndose a la petición en curso: {key}")
+            # shield: cancelar a un seguidor no debe cancelar la petición compartida
+            result = await asyncio.shield(future)
+            return copy.deepcopy(result)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marcar la excepción como recuperada aunque no haya seguidores
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        """Claves con una petición en curso."""
+        return len(self._calls)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Llamadas que enviaron la petición (misses) y que se unieron a una en curso (hits)."""
+        return {"in_flight": len(self._calls), "hits": self.followers, "misses": self.leaders}
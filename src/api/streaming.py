@@ -0,0 +1,304 @@
+"""
+Respuestas en streaming de la API del chatbot.
+Decodifica server-sent events, NDJSON o texto por chunks y mide el tiempo hasta
+el primer token y los huecos entre chunks.
+"""
+
+import codecs
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from src.api import json_backend
+
+logger = logging.getLogger(__name__)
+
+# Campos que pueden traer el fragmento de texto en un evento JSON, por orden de prioridad
+TEXT_FIELDS = ("delta", "token", "content", "text", "answer")
+
+# Evento que algunas APIs envían para indicar el fin del stream
+DONE_EVENT = "[DONE]"
+
+EMPTY_STREAM_MESSAGE = "Respuesta vacía recibida de la API en modo streaming"
+
+_PIECE_RE = re.compile(r"\S+\s*|\s+")
+
+
+def split_words(text: str, words_per_chunk: int = 1) -> List[str]:
+    """
+    Divide un texto en fragmentos de N palabras que concatenados reproducen el original.
+
+    Args:
+        text: Texto a dividir
+        words_per_chunk: Palabras por fragmento
+
+    Returns:
+        Lista de fragmentos
+    """
+    pieces = _PIECE_RE.findall(text)
+    return [
+        "".join(pieces[i : i + words_per_chunk]) for i in range(0, len(pieces), words_per_chunk)
+    ]
+
+
+def _decode_payload(payload: str, fields: Dict[str, Any]) -> Optional[str]:
+    """
+    Extrae el texto de un evento, guardando en `fields` el resto de campos JSON.
+
+    Returns:
+        Texto del evento ("" si no trae texto), o None si es el evento de fin
+    """
+    if payload.strip() == DONE_EVENT:
+        return None
+    try:
+        event = json_backend.loads(payload)
+    except ValueError:
+        return payload
+
+    if isinstance(event, str):
+        return event
+    if not isinstance(event, dict):
+        return payload
+
+    for key in TEXT_FIELDS:
+        if isinstance(event.get(key), str):
+            fields.update((k, v) for k, v in event.items() if k != key)
+            return event[key]
+    fields.update(event)
+    return ""
+
+
+def _decoder(response: requests.Response) -> codecs.IncrementalDecoder:
+    """
+    Decodificador incremental del cuerpo.
+
+    Sin charset explícito se asume UTF-8 (obligatorio en SSE), no el ISO-8859-1 que
+    requests supone para cualquier text/*.
+    """
+    has_charset = "charset=" in response.headers.get("Content-Type", "").lower()
+    encoding = response.encoding if has_charset and response.encoding else "utf-8"
+    return codecs.getincrementaldecoder(encoding)(errors="replace")
+
+
+def _iter_lines(response: requests.Response) -> Iterator[str]:
+    """Entrega las líneas del cuerpo según llegan, sin esperar al final."""
+    decoder = _decoder(response)
+    buffer = ""
+    for raw in response.iter_content(chunk_size=None):
+        buffer += decoder.decode(raw)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+def iter_sse(response: requests.Response, fields: Dict[str, Any]) -> Iterator[str]:
+    """
+    Decodifica un stream text/event-stream.
+
+    Cada evento se cierra con una línea vacía; sus líneas "data:" se unen con saltos
+    de línea. Los comentarios y los campos event/id/retry se ignoran.
+
+    Args:
+        response: Respuesta abierta con stream=True
+        fields: Diccionario donde se acumulan los campos no textuales de los eventos
+
+    Yields:
+        Fragmentos de texto de la respuesta
+    """
+    data_lines: List[str] = []
+    for line in _iter_lines(response):
+        if line:
+            if line.startswith("data:"):
+                data_lines.append(line[5:].removeprefix(" "))
+            continue
+        if not data_lines:
+            continue
+        text = _decode_payload("\n".join(data_lines), fields)
+        data_lines = []
+        if text is None:
+            return
+        yield text
+
+    if data_lines:
+        text = _decode_payload("\n".join(data_lines), fields)
+        if text is not None:
+            yield text
+
+
+def iter_ndjson(response: requests.Response, fields: Dict[str, Any]) -> Iterator[str]:
+    """
+    Decodifica un stream de JSON por líneas (application/x-ndjson).
+
+    Args:
+        response: Respuesta abierta con stream=True
+        fields: Diccionario donde se acumulan los campos no textuales de los eventos
+
+    Yields:
+        Fragmentos de texto de la respuesta
+    """
+    for line in _iter_lines(response):
+        if not line.strip():
+            continue
+        text = _decode_payload(line, fields)
+        if text is None:
+            return
+        yield text
+
+
+def iter_text(response: requests.Response) -> Iterator[str]:
+    """
+    Entrega el cuerpo de texto plano tal como llega por chunks.
+
+    Args:
+        response: Respuesta abierta con stream=True
+
+    Yields:
+        Fragmentos de texto decodificados
+    """
+    decoder = _decoder(response)
+    for raw in response.iter_content(chunk_size=None):
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class StreamingAnswer:
+    """
+    Respuesta que se consume según llega.
+
+    Se itera para obtener los fragmentos de texto; result() termina de consumir el
+    stream y devuelve el mismo diccionario que ask(), con las métricas de streaming.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[str],
+        question: str,
+        status_code: int = 200,
+        start_time: Optional[float] = None,
+        fields: Optional[Dict[str, Any]] = None,
+        transport: str = "chunked",
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Inicializa la respuesta en streaming.
+
+        Args:
+            chunks: Iterable de fragmentos de texto
+            question: Pregunta realizada
+            status_code: Código de estado HTTP
+            start_time: Momento (time.perf_counter) en que se envió la pregunta
+            fields: Campos adicionales de la respuesta (se completan durante el stream)
+            transport: Formato del stream ("sse", "ndjson", "chunked", "json"...)
+            on_close: Función que libera la conexión al terminar
+        """
+        self.question = question
+        self.status_code = status_code
+        self.transport = transport
+        self.fields = fields if fields is not None else {}
+        self.ttft: Optional[float] = None
+        self.gaps: List[float] = []
+        self.response_time: Optional[float] = None
+
+        self._start = start_time if start_time is not None else time.perf_counter()
+        self._parts: List[str] = []
+        self._iterator = self._consume(iter(chunks))
+        self._on_close = on_close
+        self._closed = False
+
+    def _consume(self, chunks: Iterator[str]) -> Iterator[str]:
+        last = None
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                now = time.perf_counter()
+                if last is None:
+                    self.ttft = now - self._start
+                else:
+                    self.gaps.append(now - last)
+                last = now
+                self._parts.append(chunk)
+                yield chunk
+            self.response_time = time.perf_counter() - self._start
+            ttft = f"{self.ttft:.2f}s" if self.ttft is not None else "-"
+            logger.info(
+                f"Respuesta recibida en {self.response_time:.2f}s "
+                f"(primer fragmento: {ttft}, {len(self._parts)} fragmentos)"
+            )
+        finally:
+            self.close()
+
+    def __iter__(self) -> Iterator[str]:
+        return self._iterator
+
+    @property
+    def text(self) -> str:
+        """Texto recibido hasta el momento."""
+        return "".join(self._parts)
+
+    @property
+    def done(self) -> bool:
+        """True si el stream terminó completo."""
+        return self.response_time is not None
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Consume lo que quede del stream y devuelve el resultado completo.
+
+        Returns:
+            Dict como el de ask() (data, response_time, status_code, question) más
+            "streaming" con ttft, número de chunks y huecos entre chunks
+
+        Raises:
+            ValueError: Si el stream no trajo texto o se cerró antes de terminar
+        """
+        for _ in self._iterator:
+            pass
+        if not self.done:
+            raise ValueError("El stream se cerró antes de terminar")
+
+        answer = self.text
+        if not answer.strip():
+            logger.warning(EMPTY_STREAM_MESSAGE)
+            raise ValueError(EMPTY_STREAM_MESSAGE)
+
+        return {
+            "data": {**self.fields, "answer": answer},
+            "response_time": self.response_time,
+            "status_code": self.status_code,
+            "question": self.question,
+            "streaming": {
+                "transport": self.transport,
+                "ttft": self.ttft,
+                "chunks": len(self._parts),
+                "gap_mean": sum(self.gaps) / len(self.gaps) if self.gaps else 0.0,
+                "gap_max": max(self.gaps, default=0.0),
+            },
+        }
+
+    def close(self):
+        """Libera la conexión; el stream no puede seguir consumiéndose."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._on_close is not None:
+            self._on_close()
+
+    def __enter__(self):
+        """Entrada del administrador de contexto."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Salida del administrador de contexto."""
+        self._iterator.close()
+        self.close()
@@ -27,6 +27,59 @@ class Config:
     API_TIMEOUT = int(os.getenv("API_TIMEOUT", "30"))
     REQUEST_RETRY_COUNT = int(os.getenv("REQUEST_RETRY_COUNT", "3"))
 
+    # Circuit breaker: after N consecutive failures, fail fast for the cool-down (seconds)
+    CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER", "true").lower() == "true"
+    CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))
+    CIRCUIT_BREAKER_COOLDOWN = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN", "30"))
+
+    # Concurrency settings for batch question runs
+    MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "8"))
+
+    # Client-side request pacing: sustained requests/sec (0 disables) and burst size
+    # (0 uses the rate rounded down, at least 1)
+    RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "0"))
+    RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "0"))
+
+    # Adapt in-flight requests (AIMD, up to MAX_CONCURRENCY) to 429s and latency growth
+    ADAPTIVE_CONCURRENCY = os.getenv("ADAPTIVE_CONCURRENCY", "false").lower() == "true"
+
+    # Hedged requests: send a duplicate when the first one exceeds this latency percentile,
+    # at most HEDGE_BUDGET extra requests per original request
+    HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "false").lower() == "true"
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", "0.1"))
+
+    # Share one in-flight request among concurrent identical questions
+    COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+
+    # Add per-phase timings (connect, TTFB, download, retry wait) to client results
+    COLLECT_TIMINGS = os.getenv("COLLECT_TIMINGS", "false").lower() == "true"
+
+    # Reuse one API response per distinct question during a test session
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "true").lower() == "true"
+
+    # Record/replay real API exchanges: off, record, replay (offline) or auto
+    # (replay what is recorded, record the rest); replay can sleep the recorded latency
+    CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off").lower()
+    CASSETTE_SIMULATE_LATENCY = os.getenv("CASSETTE_SIMULATE_LATENCY", "false").lower() == "true"
+
+    # Saved responses: JSONL segments rotated at this size, fsync after every record
+    # ("always"), when a segment is closed ("segment") or never (left to the OS)
+    RESPONSE_SEGMENT_MAX_BYTES = int(os.getenv("RESPONSE_SEGMENT_MAX_BYTES", str(4 * 1024 * 1024)))
+    RESPONSE_FSYNC = os.getenv("RESPONSE_FSYNC", "segment").lower()
+
+    # Save responses from a background thread through a bounded queue; when the queue
+    # is full, "block" the caller, "drop" the record or "spill" it to a file
+    RESPONSE_BACKGROUND_WRITER = os.getenv("RESPONSE_BACKGROUND_WRITER", "false").lower() == "true"
+    RESPONSE_QUEUE_SIZE = int(os.getenv("RESPONSE_QUEUE_SIZE", "1000"))
+    RESPONSE_QUEUE_POLICY = os.getenv("RESPONSE_QUEUE_POLICY", "block").lower()
+    RESPONSE_WRITER_BATCH = int(os.getenv("RESPONSE_WRITER_BATCH", "100"))
+
+    # Compaction of old segments into compressed block archives: codec ("auto" uses
+    # zstd when the zstandard package is installed, lzma otherwise) and block size
+    RESPONSE_ARCHIVE_CODEC = os.getenv("RESPONSE_ARCHIVE_CODEC", "auto").lower()
+    RESPONSE_ARCHIVE_BLOCK_BYTES = int(os.getenv("RESPONSE_ARCHIVE_BLOCK_BYTES", str(128 * 1024)))
+
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
@@ -34,11 +87,19 @@ class Config:
     PROJECT_ROOT = Path(__file__).parent.parent.parent
     DATA_DIR = PROJECT_ROOT / "data"
     REPORTS_DIR = PROJECT_ROOT / "reports"
+    # Relative paths are resolved from the project root
+    CASSETTE_PATH = PROJECT_ROOT / os.getenv("CASSETTE_PATH", "data/cassettes/chatbot.jsonl")
 
     # Semantic validation settings
     SENTENCE_TRANSFORMER_MODEL = "all-MiniLM-L6-v2"  # Fast and efficient model
     SIMILARITY_THRESHOLD = 0.5  # Minimum semantic similarity score
 
+    # Embedding cache (in-memory LRU + memory-mapped file per model)
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "true").lower() == "true"
+    EMBEDDING_CACHE_DIR = DATA_DIR / "embeddings"
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+    EMBEDDING_CACHE_MEMORY_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "1024"))
+
     @classmethod
     def validate(cls):
         """Validate configuration values."""
@@ -55,6 +116,62 @@ class Config:
                 f"REQUEST_RETRY_COUNT must be non-negative, got {cls.REQUEST_RETRY_COUNT}"
             )
 
+        if cls.EMBEDDING_CACHE_MAX_ENTRIES <= 0 or cls.EMBEDDING_CACHE_MEMORY_ENTRIES <= 0:
+            raise ValueError("Embedding cache sizes must be positive")
+
+        if cls.MAX_CONCURRENCY <= 0:
+            raise ValueError(f"MAX_CONCURRENCY must be positive, got {cls.MAX_CONCURRENCY}")
+
+        if cls.CIRCUIT_BREAKER_THRESHOLD <= 0 or cls.CIRCUIT_BREAKER_COOLDOWN < 0:
+            raise ValueError(
+                "CIRCUIT_BREAKER_THRESHOLD must be positive and "
+                "CIRCUIT_BREAKER_COOLDOWN non-negative"
+            )
+
+        if cls.RATE_LIMIT_RPS < 0 or cls.RATE_LIMIT_BURST < 0:
+            raise ValueError("RATE_LIMIT_RPS and RATE_LIMIT_BURST must be non-negative")
+
+        if not 0.0 < cls.HEDGE_PERCENTILE < 100.0 or cls.HEDGE_BUDGET < 0:
+            raise ValueError(
+                "HEDGE_PERCENTILE must be between 0 and 100 and HEDGE_BUDGET non-negative"
+            )
+
+        if cls.RESPONSE_SEGMENT_MAX_BYTES <= 0:
+            raise ValueError(
+                f"RESPONSE_SEGMENT_MAX_BYTES must be positive, got {cls.RESPONSE_SEGMENT_MAX_BYTES}"
+            )
+
+        if cls.RESPONSE_FSYNC not in ("always", "segment", "never"):
+            raise ValueError(
+                f"RESPONSE_FSYNC must be always, segment or never, got {cls.RESPONSE_FSYNC!r}"
+            )
+
+        if cls.RESPONSE_QUEUE_SIZE <= 0 or cls.RESPONSE_WRITER_BATCH <= 0:
+            raise ValueError("RESPONSE_QUEUE_SIZE and RESPONSE_WRITER_BATCH must be positive")
+
+        if cls.RESPONSE_QUEUE_POLICY not in ("block", "drop", "spill"):
+            raise ValueError(
+                f"RESPONSE_QUEUE_POLICY must be block, drop or spill, "
+                f"got {cls.RESPONSE_QUEUE_POLICY!r}"
+            )
+
+        if cls.RESPONSE_ARCHIVE_CODEC not in ("auto", "zstd", "lzma", "gzip"):
+            raise ValueError(
+                f"RESPONSE_ARCHIVE_CODEC must be auto, zstd, lzma or gzip, "
+                f"got {cls.RESPONSE_ARCHIVE_CODEC!r}"
+            )
+
+        if cls.RESPONSE_ARCHIVE_BLOCK_BYTES <= 0:
+            raise ValueError(
+                f"RESPONSE_ARCHIVE_BLOCK_BYTES must be positive, "
+                f"got {cls.RESPONSE_ARCHIVE_BLOCK_BYTES}"
+            )
+
+        if cls.CASSETTE_MODE not in ("off", "record", "replay", "auto"):
+            raise ValueError(
+                f"CASSETTE_MODE must be off, record, replay or auto, got {cls.CASSETTE_MODE!r}"
+            )
+
         return True
 
 
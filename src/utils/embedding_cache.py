@@ -0,0 +1,292 @@
+"""
+Persistent cache for sentence embeddings.
+Keeps an in-memory LRU tier in front of a memory-mapped on-disk tier.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.utils.config import Config
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of float32 embedding vectors.
+
+    Entries are keyed by a SHA-256 of the model name and the text. The disk tier is a
+    single `.npy` file per model holding a fixed number of slots; when it is full the
+    least recently used slot is overwritten.
+
+    The slot index of the disk tier lives in memory, so a file has a single writer:
+    each instance takes an exclusive lock on it (fcntl, where available), and other
+    instances, in this or another process, only use their in-memory tier.
+    """
+
+    KEY_SIZE = 64  # Length of a hex SHA-256 digest
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[Path] = None,
+        max_entries: Optional[int] = None,
+        memory_entries: Optional[int] = None,
+    ):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            model_name: Name of the model producing the embeddings
+            cache_dir: Directory for the on-disk tier (defaults to Config.EMBEDDING_CACHE_DIR)
+            max_entries: Slots in the on-disk tier (defaults to Config.EMBEDDING_CACHE_MAX_ENTRIES)
+            memory_entries: Size of the in-memory LRU tier
+                (defaults to Config.EMBEDDING_CACHE_MEMORY_ENTRIES)
+        """
+        self.model_name = model_name
+        self.cache_dir = Path(cache_dir or Config.EMBEDDING_CACHE_DIR)
+        self.max_entries = max_entries or Config.EMBEDDING_CACHE_MAX_ENTRIES
+        self.memory_entries = memory_entries or Config.EMBEDDING_CACHE_MEMORY_ENTRIES
+
+        safe_name = re.sub(r"[^\w.-]", "_", model_name)
+        self.path = self.cache_dir / f"{safe_name}.npy"
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._table: Optional[np.memmap] = None
+        self._slots: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._lock_file = None
+
+        self.hits = 0
+        self.misses = 0
+
+        self.disk_enabled = self._lock_disk_tier()
+        if self.disk_enabled and self.path.exists():
+            self._open_table()
+
+    def key(self, text: str) -> str:
+        """
+        Compute the content address of a text for this model.
+
+        Args:
+            text: Text that was embedded
+
+        Returns:
+            Hex digest identifying the (model, text) pair
+        """
+        digest = hashlib.sha256()
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding of a text.
+
+        Args:
+            text: Text that was embedded
+
+        Returns:
+            float32 vector, or None if the text has not been cached
+        """
+        key = self.key(text)
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+
+            slot = self._slots.get(key)
+            if slot is None:
+                self.misses += 1
+                return None
+
+            row = self._table[slot]
+            if row["key"] != key.encode("ascii"):
+                # The slot was reused or its write did not finish
+                del self._slots[key]
+                self.misses += 1
+                return None
+            row["last_used"] = time.time()
+            vector = np.array(row["vector"], dtype=np.float32)
+            self._remember(key, vector)
+            self.hits += 1
+            return vector
+
+    def put(self, text: str, vector: np.ndarray):
+        """
+        Store the embedding of a text in both tiers.
+
+        Args:
+            text: Text that was embedded
+            vector: Embedding vector
+        """
+        key = self.key(text)
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+
+        with self._lock:
+            self._remember(key, vector)
+            if not self.disk_enabled:
+                return
+
+            if self._table is None:
+                self._create_table(vector.shape[0])
+            elif self._table.dtype["vector"].shape[0] != vector.shape[0]:
+                logger.warning(
+                    f"Embedding dimension {vector.shape[0]} does not match cache file "
+                    f"{self.path}; skipping disk tier"
+                )
+                return
+
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._allocate_slot()
+
+            # Clear the key first and write it last, so a slot being rewritten never
+            # pairs a key with another entry's (or a half-written) vector
+            row = self._table[slot]
+            row["key"] = b""
+            row["vector"] = vector
+            row["last_used"] = time.time()
+            row["key"] = key.encode("ascii")
+            self._slots[key] = slot
+
+    def flush(self):
+        """Flush pending writes of the on-disk tier."""
+        with self._lock:
+            if self._table is not None:
+                self._table.flush()
+
+    def close(self):
+        """Flush and release the on-disk tier; later puts only use the memory tier."""
+        self.flush()
+        with self._lock:
+            self._table = None
+            self.disk_enabled = False
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def stats(self) -> Dict:
+        """Cache usage statistics."""
+        return {
+            "entries": len(self._slots),
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "path": str(self.path),
+            "disk_enabled": self.disk_enabled,
+        }
+
+    def _lock_disk_tier(self) -> bool:
+        """
+        Take the exclusive lock on the on-disk tier.
+
+        Returns:
+            False if another instance holds it, in which case the disk tier is not used
+        """
+        if fcntl is None:
+            return True
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path.with_suffix(".lock"), "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            logger.warning(
+                f"Embedding cache {self.path} is in use by another instance; "
+                f"using the in-memory tier only"
+            )
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the in-memory LRU tier, evicting the oldest entry if needed."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _dtype(self, dim: int) -> np.dtype:
+        """Row layout of the on-disk table."""
+        return np.dtype(
+            [("key", f"S{self.KEY_SIZE}"), ("last_used", "<f8"), ("vector", "<f4", (dim,))]
+        )
+
+    def _create_table(self, dim: int):
+        """Create an empty on-disk table for vectors of the given dimension."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._table = np.lib.format.open_memmap(
+            self.path, mode="w+", dtype=self._dtype(dim), shape=(self.max_entries,)
+        )
+        self._slots = {}
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+        logger.info(f"Created embedding cache {self.path} ({self.max_entries} slots, dim {dim})")
+
+    def _open_table(self):
+        """Map an existing on-disk table and rebuild the key index from it."""
+        try:
+            table = np.load(self.path, mmap_mode="r+")
+            table.dtype["vector"]
+        except (ValueError, OSError, KeyError) as e:
+            logger.warning(f"Discarding unreadable embedding cache {self.path}: {e}")
+            self.path.unlink()
+            return
+
+        if table.shape[0] != self.max_entries:
+            table = self._resize_table(table)
+
+        keys = table["key"]
+        used = np.flatnonzero(keys != b"")
+        self._table = table
+        self._slots = {keys[i].decode("ascii"): int(i) for i in used}
+        self._free_slots = sorted(set(range(self.max_entries)) - set(used.tolist()), reverse=True)
+        logger.info(f"Loaded embedding cache {self.path} ({len(self._slots)} entries)")
+
+    def _resize_table(self, table: np.memmap) -> np.memmap:
+        """Rewrite the table with the configured number of slots, keeping the newest rows."""
+        rows = table[table["key"] != b""]
+        rows = np.sort(rows, order="last_used")[::-1][: self.max_entries]
+        dtype = table.dtype
+        del table
+
+        resized = np.lib.format.open_memmap(
+            self.path, mode="w+", dtype=dtype, shape=(self.max_entries,)
+        )
+        resized[: len(rows)] = rows
+        resized.flush()
+        logger.info(f"Resized embedding cache {self.path} to {self.max_entries} slots")
+        return resized
+
+    def _allocate_slot(self) -> int:
+        """Return a free slot, evicting the least recently used entry when full."""
+        if self._free_slots:
+            return self._free_slots.pop()
+
+        slot = int(np.argmin(self._table["last_used"]))
+        evicted = self._table[slot]["key"].decode("ascii")
+        self._slots.pop(evicted, None)
+        return slot
@@ -0,0 +1,313 @@
+"""
+Load generation for the chatbot API.
+Drives a request function in open-loop or closed-loop mode and reports
+throughput, error rate and latency percentiles.
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import cycle
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import requests
+
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class LoadStage:
+    """
+    One step of a load profile.
+
+    Open-loop stages set `rate` (arrivals per second); closed-loop stages set
+    `concurrency` (requests kept in flight). A list of stages with growing values
+    gives a ramp-up.
+    """
+
+    duration: float
+    rate: Optional[float] = None
+    concurrency: Optional[int] = None
+
+
+@dataclass
+class Sample:
+    """Outcome of a single request."""
+
+    stage: int
+    scheduled: float  # Seconds since the start of the run
+    latency: float
+    error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None  # Per-phase timings, if the client collects them
+
+
+@dataclass
+class LoadTestResult:
+    """All samples of a run plus its wall-clock duration."""
+
+    mode: str
+    stages: List[LoadStage]
+    samples: List[Sample] = field(default_factory=list)
+    duration: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the run overall and per stage.
+
+        Returns:
+            Dict with the run configuration, overall metrics and per-stage metrics
+        """
+        stage_durations = [stage.duration for stage in self.stages]
+        return {
+            "mode": self.mode,
+            "stages": [asdict(stage) for stage in self.stages],
+            "overall": summarize(self.samples, self.duration),
+            "per_stage": [
+                summarize([s for s in self.samples if s.stage == i], stage_durations[i])
+                for i in range(len(self.stages))
+            ],
+        }
+
+
+def summarize(samples: Sequence[Sample], duration: float) -> Dict[str, Any]:
+    """
+    Compute throughput, error rate and latency percentiles of a set of samples.
+
+    Latencies include failed requests, since a timeout is part of what a caller waits.
+
+    Args:
+        samples: Request outcomes
+        duration: Wall-clock seconds the samples were collected over
+
+    Returns:
+        Dict of metrics (latencies in seconds)
+    """
+    total = len(samples)
+    errors: Dict[str, int] = {}
+    for sample in samples:
+        if sample.error is not None:
+            errors[sample.error] = errors.get(sample.error, 0) + 1
+    error_count = sum(errors.values())
+
+    metrics: Dict[str, Any] = {
+        "requests": total,
+        "errors": error_count,
+        "error_rate": error_count / total if total else 0.0,
+        "throughput": (total - error_count) / duration if duration > 0 else 0.0,
+        "errors_by_type": errors,
+    }
+
+    latencies = np.array([sample.latency for sample in samples], dtype=float)
+    if total:
+        values = np.percentile(latencies, PERCENTILES)
+        metrics["latency"] = {f"p{p}": float(v) for p, v in zip(PERCENTILES, values)}
+        metrics["latency"]["max"] = float(latencies.max())
+        metrics["latency"]["mean"] = float(latencies.mean())
+    else:
+        metrics["latency"] = {f"p{p}": None for p in PERCENTILES}
+        metrics["latency"].update(max=None, mean=None)
+
+    timed = [sample.timings for sample in samples if sample.timings]
+    if timed:
+        metrics["phases_mean"] = {
+            phase: float(np.mean([timings[phase] for timings in timed])) for phase in timed[0]
+        }
+    return metrics
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Name an exception for error breakdowns.
+
+    Args:
+        error: Exception raised by the request function
+
+    Returns:
+        "http_<status>" for HTTP errors, otherwise the exception class name
+    """
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return f"http_{error.response.status_code}"
+    if isinstance(error, requests.exceptions.RetryError):
+        return "retries_exhausted"
+    return type(error).__name__
+
+
+class LoadTester:
+    """
+    Runs a load profile against a request function such as ChatbotClient.ask.
+
+    Closed loop keeps a fixed number of workers each sending back-to-back requests, so
+    offered load drops when the server slows down. Open loop schedules arrivals at a
+    fixed rate regardless of completions; latency is measured from the scheduled arrival
+    time, so requests queued behind slow ones count the wait (no coordinated omission).
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Any],
+        questions: Sequence[str],
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize the load tester.
+
+        Args:
+            send: Function sending one question; an exception marks the request as failed
+            questions: Questions to send, cycled through in order
+            max_workers: Threads available to open-loop runs
+                (defaults to 4 * Config.MAX_CONCURRENCY)
+
+        Raises:
+            ValueError: If there are no questions
+        """
+        if not questions:
+            raise ValueError("At least one question is required")
+        self.send = send
+        self.questions = list(questions)
+        self.max_workers = max_workers or 4 * Config.MAX_CONCURRENCY
+
+        self._questions = cycle(self.questions)
+        self._lock = threading.Lock()
+
+    def _next_question(self) -> str:
+        with self._lock:
+            return next(self._questions)
+
+    def _execute(self, stage: int, scheduled: float, origin: float) -> Sample:
+        """Send one request and time it from its scheduled start."""
+        error = None
+        timings = None
+        try:
+            result = self.send(self._next_question())
+            if isinstance(result, dict):
+                timings = result.get("timings")
+        except Exception as e:
+            error = classify_error(e)
+        latency = time.perf_counter() - origin - scheduled
+        return Sample(
+            stage=stage, scheduled=scheduled, latency=latency, error=error, timings=timings
+        )
+
+    def run(self, stages: Sequence[LoadStage], mode: str = "closed") -> LoadTestResult:
+        """
+        Run a load profile.
+
+        Args:
+            stages: Stages to run in order
+            mode: "closed" (fixed concurrency) or "open" (fixed arrival rate)
+
+        Returns:
+            LoadTestResult with every sample
+
+        Raises:
+            ValueError: If the mode or a stage is invalid
+        """
+        stages = list(stages)
+        self._validate(stages, mode)
+
+        result = LoadTestResult(mode=mode, stages=stages)
+        origin = time.perf_counter()
+        if mode == "open":
+            result.samples.extend(self._run_open(stages, origin))
+        else:
+            stage_start = 0.0
+            for index, stage in enumerate(stages):
+                logger.info(
+                    f"Stage {index + 1}/{len(stages)}: {stage.duration}s "
+                    f"at concurrency {stage.concurrency}"
+                )
+                result.samples.extend(self._run_closed_stage(index, stage, stage_start, origin))
+                stage_start += stage.duration
+
+        result.duration = time.perf_counter() - origin
+        return result
+
+    @staticmethod
+    def _validate(stages: List[LoadStage], mode: str):
+        if mode not in ("open", "closed"):
+            raise ValueError(f"mode must be 'open' or 'closed', got {mode!r}")
+        if not stages:
+            raise ValueError("At least one stage is required")
+        for stage in stages:
+            if stage.duration <= 0:
+                raise ValueError(f"Stage duration must be positive, got {stage.duration}")
+            if mode == "open" and not (stage.rate and stage.rate > 0):
+                raise ValueError("Open-loop stages need a positive rate")
+            if mode == "closed" and not (stage.concurrency and stage.concurrency > 0):
+                raise ValueError("Closed-loop stages need a positive concurrency")
+
+    def _run_closed_stage(
+        self, index: int, stage: LoadStage, stage_start: float, origin: float
+    ) -> List[Sample]:
+        """Keep `concurrency` requests in flight until the stage ends."""
+        stage_end = origin + stage_start + stage.duration
+        samples: List[Sample] = []
+
+        def worker():
+            local: List[Sample] = []
+            while time.perf_counter() < stage_end:
+                scheduled = time.perf_counter() - origin
+                local.append(self._execute(index, scheduled, origin))
+            with self._lock:
+                samples.extend(local)
+
+        with ThreadPoolExecutor(max_workers=stage.concurrency) as executor:
+            for _ in range(stage.concurrency):
+                executor.submit(worker)
+        return samples
+
+    def _run_open(self, stages: List[LoadStage], origin: float) -> List[Sample]:
+        """
+        Start requests at each stage's fixed rate, on one schedule for the whole run.
+
+        Every arrival goes to the same executor and results are only collected at the
+        end, so slow responses from one stage never delay the arrivals of the next.
+        """
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            stage_start = 0.0
+            for index, stage in enumerate(stages):
+                logger.info(f"Stage {index + 1}/{len(stages)}: {stage.duration}s at {stage.rate}/s")
+                interval = 1.0 / stage.rate
+                for i in range(int(stage.duration * stage.rate)):
+                    scheduled = stage_start + i * interval
+                    delay = origin + scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    futures.append(executor.submit(self._execute, index, scheduled, origin))
+                stage_start += stage.duration
+        return [future.result() for future in futures]
+
+
+def save_report(report: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    """
+    Write a load test report as JSON.
+
+    Args:
+        report: Report to save (see LoadTestResult.summary)
+        path: Output file (defaults to Config.REPORTS_DIR/load_test_<timestamp>.json)
+
+    Returns:
+        Path to the saved report
+    """
+    if path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = Config.REPORTS_DIR / f"load_test_{timestamp}.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"Load test report saved to: {path}")
+    return path
@@ -0,0 +1,232 @@
+"""
+Compressed archive format for closed response segments.
+Each segment is stored as independently compressed blocks plus a block index, so a
+single record can be read by decompressing only the block that holds it.
+"""
+
+import bisect
+import gzip
+import json
+import logging
+import lzma
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.utils.config import Config
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".blocks"
+MAGIC = b"RSPBLK01"
+# Footer trailer: length of the JSON block index (uint64, little endian) + MAGIC
+TRAILER = struct.Struct("<Q8s")
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+
+def _zstd_codec() -> Codec:
+    """Compressor and decompressor for zstd (requires the zstandard package)."""
+    if zstandard is None:
+        raise RuntimeError("The zstd codec needs the zstandard package (pip install zstandard)")
+    compressor = zstandard.ZstdCompressor(level=19)
+    return compressor.compress, zstandard.ZstdDecompressor().decompress
+
+
+CODECS: Dict[str, Callable[[], Codec]] = {
+    "zstd": _zstd_codec,
+    "lzma": lambda: (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+    "gzip": lambda: (lambda data: gzip.compress(data, compresslevel=9), gzip.decompress),
+}
+
+
+def default_codec() -> str:
+    """zstd if the zstandard package is installed, otherwise lzma from the stdlib."""
+    return "zstd" if zstandard is not None else "lzma"
+
+
+class Block(NamedTuple):
+    """A compressed block: uncompressed offset and length, position in the archive file."""
+
+    offset: int
+    length: int
+    position: int
+    size: int
+
+
+def write_archive(
+    data: bytes,
+    path: Path,
+    codec: Optional[str] = None,
+    block_bytes: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Write the contents of a segment as a block-compressed archive.
+
+    Blocks end on record boundaries, so every record lies inside one block. The file
+    is written under a temporary name, synced and renamed into place.
+
+    Args:
+        data: Segment contents (complete JSON lines)
+        path: Archive file to create
+        codec: "zstd", "lzma" or "gzip" (defaults to Config.RESPONSE_ARCHIVE_CODEC,
+            where "auto" picks zstd if available)
+        block_bytes: Target uncompressed size of a block
+            (defaults to Config.RESPONSE_ARCHIVE_BLOCK_BYTES)
+
+    Returns:
+        Dictionary with records, blocks, raw_bytes and compressed_bytes
+
+    Raises:
+        ValueError: If the codec is unknown
+    """
+    codec = codec or Config.RESPONSE_ARCHIVE_CODEC
+    if codec == "auto":
+        codec = default_codec()
+    if codec not in CODECS:
+        raise ValueError(f"codec must be one of {sorted(CODECS)}, got {codec!r}")
+    compress, _ = CODECS[codec]()
+    block_bytes = block_bytes or Config.RESPONSE_ARCHIVE_BLOCK_BYTES
+
+    blocks: List[Block] = []
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as f:
+        f.write(MAGIC)
+        start = 0
+        while start < len(data):
+            # Cut after the last record that fits; a larger record gets its own block
+            end = data.rfind(b"\n", start, start + block_bytes) + 1
+            if end <= start:
+                end = data.index(b"\n", start) + 1
+            compressed = compress(data[start:end])
+            blocks.append(Block(start, end - start, f.tell(), len(compressed)))
+            f.write(compressed)
+            start = end
+
+        footer = json.dumps(
+            {"codec": codec, "records": data.count(b"\n"), "blocks": blocks},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        f.write(footer)
+        f.write(TRAILER.pack(len(footer), MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+        compressed_bytes = f.tell()
+    os.replace(temporary, path)
+
+    return {
+        "records": data.count(b"\n"),
+        "blocks": len(blocks),
+        "raw_bytes": len(data),
+        "compressed_bytes": compressed_bytes,
+    }
+
+
+class ArchiveReader:
+    """
+    Random-access reader of one archive file.
+
+    The block index is read once from the footer; reading a record decompresses
+    only its block, and the last decompressed block is kept for sequential reads.
+    Thread-safe.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open an archive and load its block index.
+
+        Args:
+            path: Archive file
+
+        Raises:
+            ValueError: If the file is not a complete archive
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a response archive")
+            size = f.seek(0, os.SEEK_END)
+            if size < len(MAGIC) + TRAILER.size:
+                raise ValueError(f"{self.path} is truncated")
+            f.seek(-TRAILER.size, os.SEEK_END)
+            footer_size, magic = TRAILER.unpack(f.read(TRAILER.size))
+            if magic != MAGIC or footer_size > size - len(MAGIC) - TRAILER.size:
+                raise ValueError(f"{self.path} is truncated")
+            f.seek(-(TRAILER.size + footer_size), os.SEEK_END)
+            footer = json.loads(f.read(footer_size))
+
+        self.codec = footer["codec"]
+        self.records = footer["records"]
+        self.blocks = [Block(*block) for block in footer["blocks"]]
+        self._offsets = [block.offset for block in self.blocks]
+        self._decompress = CODECS[self.codec]()[1]
+        self._lock = threading.Lock()
+        self._cached: Optional[Tuple[int, bytes]] = None
+
+    @property
+    def raw_bytes(self) -> int:
+        """Uncompressed size of the archived segment."""
+        return self.blocks[-1].offset + self.blocks[-1].length if self.blocks else 0
+
+    def _block(self, number: int) -> bytes:
+        """Decompressed contents of a block."""
+        with self._lock:
+            if self._cached is not None and self._cached[0] == number:
+                return self._cached[1]
+        block = self.blocks[number]
+        with open(self.path, "rb") as f:
+            f.seek(block.position)
+            data = self._decompress(f.read(block.size))
+        with self._lock:
+            self._cached = (number, data)
+        return data
+
+    def read(self, offset: int, length: int) -> bytes:
+        """
+        Read the bytes of one record.
+
+        Args:
+            offset: Offset of the record in the original segment
+            length: Length of the record
+
+        Returns:
+            The record line
+
+        Raises:
+            KeyError: If no record starts at that offset
+        """
+        number = bisect.bisect_right(self._offsets, offset) - 1
+        if number < 0:
+            raise KeyError(offset)
+        block = self.blocks[number]
+        start = offset - block.offset
+        if start + length > block.length:
+            raise KeyError(offset)
+        return self._block(number)[start : start + length]
+
+    def iter_lines(self, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+        """
+        Iterate over the archived records.
+
+        Args:
+            start: Offset in the original segment to start from
+
+        Yields:
+            (offset in the original segment, line) pairs
+        """
+        for number, block in enumerate(self.blocks):
+            if block.offset + block.length <= start:
+                continue
+            data = self._block(number)
+            position = max(0, start - block.offset)
+            while position < len(data):
+                end = data.index(b"\n", position) + 1
+                yield block.offset + position, data[position:end]
+                position = end
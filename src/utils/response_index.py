@@ -0,0 +1,308 @@
+"""
+SQLite index over the saved responses store.
+Answers filtered, paginated queries without reading the segment files.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from src.utils.response_store import RecordRef, SegmentedResponseStore
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.sqlite3"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    question TEXT NOT NULL,
+    status_code INTEGER,
+    response_time REAL,
+    overall_score REAL,
+    passes_threshold INTEGER,
+    UNIQUE (segment, offset)
+);
+CREATE INDEX IF NOT EXISTS responses_timestamp ON responses (timestamp);
+CREATE INDEX IF NOT EXISTS responses_question ON responses (question);
+CREATE INDEX IF NOT EXISTS responses_score ON responses (overall_score);
+"""
+
+Timestamp = Union[str, datetime]
+
+
+class IndexEntry(NamedTuple):
+    """Indexed metadata of a saved response."""
+
+    ref: RecordRef
+    timestamp: str
+    question: str
+    status_code: Optional[int]
+    response_time: Optional[float]
+    overall_score: Optional[float]
+    passes_threshold: Optional[bool]
+
+
+def _index_row(ref: RecordRef, record: Dict[str, Any]) -> Tuple:
+    """Column values of a record."""
+    response = record.get("response") or {}
+    scores = record.get("quality_scores") or {}
+    passes = scores.get("passes_threshold")
+    return (
+        ref.segment,
+        ref.offset,
+        ref.length,
+        record.get("timestamp", ""),
+        record.get("question", ""),
+        response.get("status_code"),
+        response.get("response_time"),
+        scores.get("overall_score"),
+        None if passes is None else int(bool(passes)),
+    )
+
+
+def _entry(row: Tuple) -> IndexEntry:
+    """IndexEntry from a result row (without the id column)."""
+    segment, offset, length, timestamp, question, status, time, score, passes = row
+    return IndexEntry(
+        RecordRef(segment, offset, length),
+        timestamp,
+        question,
+        status,
+        time,
+        score,
+        None if passes is None else bool(passes),
+    )
+
+
+class ResponseIndex:
+    """
+    Sidecar index of a SegmentedResponseStore, one row per record.
+
+    The segments remain the source of truth: the index can be deleted and rebuilt
+    at any time, and catch_up() indexes records appended while it was not being
+    maintained. Thread-safe.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._connection = self._connect()
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Response index {self.path} is unreadable ({e}), recreating it")
+            self.path.unlink()
+            self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                connection.execute("DROP TABLE IF EXISTS responses")
+            # The index can always be rebuilt, so durability is traded for speed
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        return connection
+
+    def add(self, entries: Iterable[Tuple[RecordRef, Dict[str, Any]]]):
+        """
+        Index records in one transaction.
+
+        Args:
+            entries: (location, record) pairs; already indexed locations are ignored
+        """
+        rows = [_index_row(ref, record) for ref, record in entries]
+        if not rows:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO responses (segment, offset, length, timestamp, question,"
+                " status_code, response_time, overall_score, passes_threshold)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def last_ref(self) -> Optional[RecordRef]:
+        """Location of the last indexed record, or None if the index is empty."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT segment, offset, length FROM responses"
+                " ORDER BY segment DESC, offset DESC LIMIT 1"
+            ).fetchone()
+        return RecordRef(*row) if row else None
+
+    def catch_up(self, store: SegmentedResponseStore, batch_size: int = 1000) -> int:
+        """
+        Index the records of the store that come after the last indexed one.
+
+        Args:
+            store: Store this index belongs to
+            batch_size: Records per transaction
+
+        Returns:
+            Number of records indexed
+        """
+        last = self.last_ref()
+        start = (last.segment, last.offset + last.length) if last else None
+        batch: List[Tuple[RecordRef, Dict[str, Any]]] = []
+        indexed = 0
+        for entry in store.iter_records(start=start):
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                self.add(batch)
+                indexed += len(batch)
+                batch = []
+        self.add(batch)
+        indexed += len(batch)
+        if indexed:
+            logger.info(f"Indexed {indexed} response(s) missing from {self.path}")
+        return indexed
+
+    def rebuild(self, store: SegmentedResponseStore) -> int:
+        """
+        Drop every row and index the whole store again.
+
+        Returns:
+            Number of records indexed
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+        return self.catch_up(store)
+
+    def segment_newest(self) -> Dict[int, str]:
+        """Timestamp of the newest record in each segment."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT segment, MAX(timestamp) FROM responses GROUP BY segment"
+            ).fetchall()
+        return dict(rows)
+
+    @staticmethod
+    def _where(
+        question: Optional[str] = None,
+        question_contains: Optional[str] = None,
+        since: Optional[Timestamp] = None,
+        until: Optional[Timestamp] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        passes_threshold: Optional[bool] = None,
+        status_code: Optional[int] = None,
+    ) -> Tuple[List[str], List[Any]]:
+        """SQL conditions and parameters for the query filters."""
+        conditions, params = [], []
+        if question is not None:
+            conditions.append("question = ?")
+            params.append(question)
+        if question_contains is not None:
+            conditions.append("instr(lower(question), lower(?)) > 0")
+            params.append(question_contains)
+        # ISO timestamps sort chronologically as text
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since.isoformat() if isinstance(since, datetime) else since)
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(until.isoformat() if isinstance(until, datetime) else until)
+        if min_score is not None:
+            conditions.append("overall_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("overall_score <= ?")
+            params.append(max_score)
+        if passes_threshold is not None:
+            conditions.append("passes_threshold = ?")
+            params.append(int(passes_threshold))
+        if status_code is not None:
+            conditions.append("status_code = ?")
+            params.append(status_code)
+        return conditions, params
+
+    def query(
+        self,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+        page_size: int = 500,
+        **filters: Any,
+    ) -> Iterator[IndexEntry]:
+        """
+        Iterate over the entries matching the filters, fetching them page by page.
+
+        Pages are read with keyset pagination on the insertion order, so iterating
+        deep into the history costs the same as reading the first page.
+
+        Args:
+            limit: Maximum number of entries
+            newest_first: Order by save order, newest first (default) or oldest first
+            page_size: Rows fetched per query
+            **filters: question, question_contains, since, until (exclusive), min_score,
+                max_score, passes_threshold, status_code
+
+        Yields:
+            Matching entries
+        """
+        conditions, params = self._where(**filters)
+        order, compare = ("DESC", "<") if newest_first else ("ASC", ">")
+        remaining = limit
+        last_id = None
+        while remaining is None or remaining > 0:
+            page = page_size if remaining is None else min(page_size, remaining)
+            page_conditions = list(conditions)
+            page_params = list(params)
+            if last_id is not None:
+                page_conditions.append(f"id {compare} ?")
+                page_params.append(last_id)
+            where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT id, segment, offset, length, timestamp, question, status_code,"
+                    " response_time, overall_score, passes_threshold FROM responses"
+                    f" {where} ORDER BY id {order} LIMIT ?",
+                    page_params + [page],
+                ).fetchall()
+            for row in rows:
+                yield _entry(row[1:])
+            if len(rows) < page:
+                return
+            last_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def count(self, **filters: Any) -> int:
+        """
+        Count the entries matching the filters (see query()).
+
+        Returns:
+            Number of matching records
+        """
+        conditions, params = self._where(**filters)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM responses {where}", params
+            ).fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
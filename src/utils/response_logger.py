@@ -1,15 +1,21 @@
 """
 Response logger for saving AI chatbot responses.
-Stores responses in JSON format with metadata for analysis.
+Stores responses with metadata for analysis in an append-only segmented store.
 """
 
+import atexit
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from src.utils.config import Config
+from src.utils.response_index import INDEX_FILENAME, IndexEntry, ResponseIndex
+from src.utils.response_manifest import MANIFEST_FILENAME, ResponseManifest
+from src.utils.response_store import RecordRef, SegmentedResponseStore
+from src.utils.response_writer import SPILL_FILENAME, BackgroundWriter
 
 logger = logging.getLogger(__name__)
 
@@ -17,51 +23,59 @@ logger = logging.getLogger(__name__)
 class ResponseLogger:
     """Logs and saves API responses for later analysis."""
 
-    def __init__(self, log_dir: Optional[Path] = None):
+    def __init__(self, log_dir: Optional[Path] = None, background: Optional[bool] = None):
         """
         Initialize the response logger.
 
         Args:
             log_dir: Directory to save responses (defaults to Config.PROJECT_ROOT/responses)
+            background: If True, save_response() queues the record for a writer thread
+                instead of writing it (defaults to Config.RESPONSE_BACKGROUND_WRITER)
         """
         self.log_dir = log_dir or (Config.PROJECT_ROOT / "responses")
         self.log_dir.mkdir(exist_ok=True)
+        self.store = SegmentedResponseStore(self.log_dir)
+        # Keeps the index and the manifest in the same order as the store (see catch_up())
+        self._write_lock = threading.Lock()
+        self.index = ResponseIndex(self.log_dir / INDEX_FILENAME)
+        # Records saved while the index was missing or not being maintained
+        self.index.catch_up(self.store)
+        self.manifest = ResponseManifest(self.log_dir / MANIFEST_FILENAME, self.store)
+
+        if background is None:
+            background = Config.RESPONSE_BACKGROUND_WRITER
+        self.writer = None
+        if background:
+            self.writer = BackgroundWriter(
+                self.save_records, self.store.sync, self.log_dir / SPILL_FILENAME
+            )
+            # Queued records are written even if the caller forgets close()
+            atexit.register(self.close)
         logger.info(f"Response logger initialized. Saving to: {self.log_dir}")
 
-    def save_response(
-        self,
+    @staticmethod
+    def build_record(
         question: str,
         response: Dict,
         scores: Optional[Dict] = None,
         filename: Optional[str] = None,
-    ) -> Path:
+        timestamp: Optional[str] = None,
+    ) -> Dict:
         """
-        Save a response to a JSON file.
+        Build the stored representation of a response.
 
         Args:
             question: The question that was asked
             response: The API response
             scores: Optional quality scores
-            filename: Optional custom filename (without extension)
+            filename: Optional custom name kept with the record
+            timestamp: ISO timestamp (defaults to now)
 
         Returns:
-            Path to the saved file
+            Dictionary with the record fields
         """
-        # Generate filename if not provided
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            # Create safe filename from question
-            safe_question = "".join(
-                c for c in question[:50] if c.isalnum() or c in (" ", "-", "_")
-            ).strip()
-            safe_question = safe_question.replace(" ", "_")
-            filename = f"{timestamp}_{safe_question}"
-
-        filepath = self.log_dir / f"{filename}.json"
-
-        # Prepare data to save
         data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "question": question,
             "response": {
                 "answer": response.get("data", {}).get("answer", ""),
@@ -73,28 +87,79 @@ class ResponseLogger:
         # Add scores if provided
         if scores:
             data["quality_scores"] = scores
+        if filename:
+            data["name"] = filename
+        return data
 
-        # Save to file
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def save_response(
+        self,
+        question: str,
+        response: Dict,
+        scores: Optional[Dict] = None,
+        filename: Optional[str] = None,
+    ) -> Optional[RecordRef]:
+        """
+        Save a response as a record in the response store.
 
-        logger.info(f"Response saved to: {filepath}")
-        return filepath
+        With the background writer the record is only queued; use flush() to wait
+        until it is on disk.
 
-    def load_response(self, filepath: Path) -> Dict:
+        Args:
+            question: The question that was asked
+            response: The API response
+            scores: Optional quality scores
+            filename: Optional custom name kept with the record
+
+        Returns:
+            Location of the saved record, or None if it was handed to the background writer
+        """
+        record = self.build_record(question, response, scores, filename)
+        if self.writer is not None:
+            self.writer.submit(record)
+            return None
+        with self._write_lock:
+            ref = self.store.append(record)
+            self._track([(ref, record)])
+        logger.info(f"Response saved to: {ref}")
+        return ref
+
+    def save_records(self, records: List[Dict]) -> List[RecordRef]:
         """
-        Load a saved response from file.
+        Save already built records (see build_record()) in one batch.
 
         Args:
-            filepath: Path to the JSON file
+            records: Records to append, oldest first
+
+        Returns:
+            Locations of the saved records, in the same order
+        """
+        with self._write_lock:
+            refs = self.store.append_many(records)
+            self._track(list(zip(refs, records)))
+        return refs
+
+    def _track(self, entries: List[Tuple[RecordRef, Dict]]):
+        """Add saved records to the index and the summary manifest."""
+        self.index.add(entries)
+        self.manifest.add(entries)
+
+    def load_response(self, ref: Union[RecordRef, Path]) -> Dict:
+        """
+        Load a saved response.
+
+        Args:
+            ref: Location returned by save_response() or list_responses(), or the path of
+                a legacy one-file-per-response JSON file
 
         Returns:
             Dictionary with response data
         """
-        with open(filepath, "r", encoding="utf-8") as f:
+        if isinstance(ref, RecordRef):
+            return self.store.read(ref)
+        with open(ref, "r", encoding="utf-8") as f:
             return json.load(f)
 
-    def list_responses(self, limit: Optional[int] = None) -> list:
+    def list_responses(self, limit: Optional[int] = None) -> List[RecordRef]:
         """
         List all saved responses.
 
@@ -102,31 +167,146 @@ class ResponseLogger:
             limit: Optional limit on number of responses to return
 
         Returns:
-            List of file paths, sorted by modification time (newest first)
+            List of record locations, newest first
+        """
+        return [entry.ref for entry in self.index.query(limit=limit or None)]
+
+    def find_responses(
+        self, limit: Optional[int] = None, newest_first: bool = True, **filters: Any
+    ) -> Iterator[IndexEntry]:
+        """
+        Query the saved responses by their indexed metadata, page by page.
+
+        Args:
+            limit: Maximum number of responses
+            newest_first: Order of the results
+            **filters: question, question_contains, since, until, min_score, max_score,
+                passes_threshold, status_code (see ResponseIndex.query())
+
+        Returns:
+            Iterator of index entries; use load_response(entry.ref) for the full record
         """
-        responses = sorted(
-            self.log_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True
-        )
+        return self.index.query(limit=limit, newest_first=newest_first, **filters)
 
-        if limit:
-            responses = responses[:limit]
+    def count_responses(self, **filters: Any) -> int:
+        """Count the saved responses matching the filters of find_responses()."""
+        return self.index.count(**filters)
+
+    def reindex(self) -> int:
+        """
+        Rebuild the index from the response store.
+
+        Returns:
+            Number of responses indexed
+        """
+        return self.index.rebuild(self.store)
 
-        return responses
+    def legacy_files(self) -> List[Path]:
+        """JSON files written by the one-file-per-response format, not yet migrated."""
+        return sorted(p for p in self.log_dir.glob("*.json") if p.name != MANIFEST_FILENAME)
 
     def get_summary(self) -> Dict:
         """
         Get summary of logged responses.
 
+        Read from the manifest, so the cost does not grow with the number of responses;
+        only the on-disk size takes one stat() per segment file.
+
         Returns:
-            Dictionary with summary statistics
+            Dictionary with summary statistics; total_size_bytes is the space used on
+            disk (smaller than raw_size_bytes once segments are compacted)
         """
-        responses = list(self.log_dir.glob("*.json"))
-
-        total_size = sum(f.stat().st_size for f in responses)
+        total_size = self.store.total_bytes()
 
         return {
-            "total_responses": len(responses),
+            "total_responses": self.manifest.count,
             "total_size_bytes": total_size,
             "total_size_mb": total_size / (1024 * 1024),
+            "raw_size_bytes": self.manifest.raw_bytes,
+            "distinct_questions": self.manifest.distinct_questions,
+            "overall_score": self.manifest.metric("overall_score"),
+            "response_time": self.manifest.metric("response_time"),
             "log_directory": str(self.log_dir),
         }
+
+    def question_counts(self) -> Dict[str, int]:
+        """Number of saved responses per question."""
+        return self.manifest.question_counts()
+
+    def rebuild_summary(self) -> int:
+        """
+        Recompute the summary manifest from the response store.
+
+        Returns:
+            Number of responses read
+        """
+        return self.manifest.rebuild()
+
+    def compact(
+        self,
+        older_than: Optional[datetime] = None,
+        include_active: bool = False,
+        codec: Optional[str] = None,
+        block_bytes: Optional[int] = None,
+    ) -> Dict[int, Dict[str, int]]:
+        """
+        Compress closed segments into block archives (see SegmentedResponseStore.compact()).
+
+        Saved responses keep their locations, and load_response() reads them from the
+        archive by decompressing a single block.
+
+        Args:
+            older_than: Only segments whose newest response was saved before this time
+            include_active: Also compact the segment currently being written
+            codec: "zstd", "lzma" or "gzip" (defaults to Config.RESPONSE_ARCHIVE_CODEC)
+            block_bytes: Target uncompressed block size
+
+        Returns:
+            Archive statistics by segment number
+        """
+        newest = self.index.segment_newest()
+        cutoff = older_than.isoformat() if older_than else None
+        compacted = {}
+        with self._write_lock:
+            for number in self.store.segments():
+                if self.store.is_archived(number):
+                    continue
+                if number == self.store.active_segment and not include_active:
+                    continue
+                if number not in newest:
+                    continue  # No indexed records
+                if cutoff is not None and newest[number] >= cutoff:
+                    continue
+                compacted[number] = self.store.compact(number, codec, block_bytes)
+        return compacted
+
+    @property
+    def writer_stats(self) -> Optional[Dict[str, Any]]:
+        """Queue and write counters of the background writer, or None if it is not used."""
+        return self.writer.stats if self.writer is not None else None
+
+    def flush(self):
+        """Force the responses saved so far, including queued ones, and the summary to disk."""
+        if self.writer is not None:
+            self.writer.flush()
+        else:
+            self.store.sync()
+        self.manifest.save()
+
+    def close(self):
+        """Write pending responses and close the response store and its index."""
+        if self.writer is not None:
+            self.writer.close()
+            atexit.unregister(self.close)
+            self.writer = None
+        self.store.close()
+        self.manifest.save()
+        self.index.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -0,0 +1,220 @@
+"""
+Running aggregates of the saved responses, persisted in a small manifest file.
+Lets ResponseLogger.get_summary() answer in constant time.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.utils.response_store import RecordRef, SegmentedResponseStore
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Seconds between manifest writes while responses are being saved
+SAVE_INTERVAL = 5.0
+
+# Numeric fields tracked with count/sum/min/max
+TRACKED_METRICS = ("overall_score", "response_time")
+
+
+def _metric_values(record: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Values of the tracked metrics in a record."""
+    return {
+        "overall_score": (record.get("quality_scores") or {}).get("overall_score"),
+        "response_time": (record.get("response") or {}).get("response_time"),
+    }
+
+
+class ResponseManifest:
+    """
+    Count, size, per-question counts and score/latency statistics of a store.
+
+    Updated in memory on every save. Rewriting the file costs O(distinct questions),
+    so it is written atomically (temporary file + rename) at most every
+    `save_interval` seconds and on save(). Like the index, it remembers the last
+    record it covers, so records saved after it was last written (including those of
+    a process that died before saving it) are added when it is loaded; a missing or
+    corrupt manifest is rebuilt from the segments. Records saved by another writer are
+    added when the next batch does not follow the last record covered. Thread-safe.
+    """
+
+    def __init__(
+        self, path: Path, store: SegmentedResponseStore, save_interval: float = SAVE_INTERVAL
+    ):
+        """
+        Load the manifest, bringing it up to date with the store.
+
+        Args:
+            path: Manifest file
+            store: Store the manifest describes
+            save_interval: Minimum seconds between writes triggered by add()
+        """
+        self.path = Path(path)
+        self.store = store
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = 0.0
+        self._data = self._load()
+        if self._data is None:
+            self.rebuild()
+        else:
+            self.catch_up()
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        """Manifest of an empty store."""
+        return {
+            "version": MANIFEST_VERSION,
+            "count": 0,
+            "bytes": 0,
+            "last_ref": None,
+            "questions": {},
+            "metrics": {
+                name: {"count": 0, "sum": 0.0, "min": None, "max": None} for name in TRACKED_METRICS
+            },
+        }
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Read the manifest file, or None if it is missing, corrupt or outdated."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Response manifest {self.path} is unreadable ({e}), rebuilding it")
+            return None
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            logger.warning(f"Response manifest {self.path} has an unknown format, rebuilding it")
+            return None
+        return data
+
+    def _save(self):
+        """Write the manifest atomically. Must be called with the lock held."""
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporary, self.path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _apply(self, entries: Iterable[Tuple[RecordRef, Dict[str, Any]]]) -> int:
+        """Add records to the aggregates. Must be called with the lock held."""
+        data = self._data
+        added = 0
+        for ref, record in entries:
+            data["count"] += 1
+            data["bytes"] += ref.length
+            data["last_ref"] = list(ref)
+            question = record.get("question", "")
+            data["questions"][question] = data["questions"].get(question, 0) + 1
+            for name, value in _metric_values(record).items():
+                if value is None:
+                    continue
+                metric = data["metrics"][name]
+                metric["count"] += 1
+                metric["sum"] += value
+                metric["min"] = value if metric["min"] is None else min(metric["min"], value)
+                metric["max"] = value if metric["max"] is None else max(metric["max"], value)
+            added += 1
+        return added
+
+    def add(self, entries: Iterable[Tuple[RecordRef, Dict[str, Any]]]):
+        """
+        Add saved records to the aggregates, writing the manifest if it is due.
+
+        Args:
+            entries: (location, record) pairs, in save order
+        """
+        entries = list(entries)
+        with self._lock:
+            last = self._data["last_ref"]
+            start = (last[0], last[1] + last[2]) if last else None
+            if entries and (entries[0][0].segment, entries[0][0].offset) != (start or (1, 0)):
+                # Another writer saved records in between: add them along with these
+                entries = self.store.iter_records(start=start)
+            if self._apply(entries):
+                self._dirty = True
+                if time.monotonic() - self._saved_at >= self.save_interval:
+                    self._save()
+
+    def save(self):
+        """Write the manifest if it has changes that are not on disk yet."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def catch_up(self) -> int:
+        """
+        Add the records saved after the last one the manifest covers.
+
+        Returns:
+            Number of records added
+        """
+        with self._lock:
+            last = self._data["last_ref"]
+            start = (last[0], last[1] + last[2]) if last else None
+            added = self._apply(self.store.iter_records(start=start))
+            if added:
+                logger.info(f"Added {added} response(s) missing from {self.path}")
+                self._save()
+        return added
+
+    def rebuild(self) -> int:
+        """
+        Recompute the aggregates from every record in the store.
+
+        Returns:
+            Number of records read
+        """
+        with self._lock:
+            self._data = self._empty()
+            count = self._apply(self.store.iter_records())
+            self._save()
+        logger.info(f"Rebuilt response manifest {self.path} from {count} response(s)")
+        return count
+
+    @property
+    def count(self) -> int:
+        """Number of saved responses."""
+        return self._data["count"]
+
+    @property
+    def raw_bytes(self) -> int:
+        """Combined uncompressed size of the saved records."""
+        return self._data["bytes"]
+
+    @property
+    def distinct_questions(self) -> int:
+        """Number of different questions saved."""
+        return len(self._data["questions"])
+
+    def question_counts(self) -> Dict[str, int]:
+        """Number of saved responses per question."""
+        with self._lock:
+            return dict(self._data["questions"])
+
+    def metric(self, name: str) -> Dict[str, Optional[float]]:
+        """
+        Statistics of a tracked metric.
+
+        Args:
+            name: "overall_score" or "response_time"
+
+        Returns:
+            Dictionary with count, mean, min and max (None without values)
+        """
+        with self._lock:
+            metric = dict(self._data["metrics"][name])
+        total = metric.pop("sum")
+        metric["mean"] = total / metric["count"] if metric["count"] else None
+        return metric
@@ -0,0 +1,413 @@
+"""
+Append-only storage for saved chatbot responses.
+Records are JSON lines appended to size-rotated segment files; closed segments can be
+compacted into block-compressed archives that keep the same record locations.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.utils.config import Config
+from src.utils.response_archive import ARCHIVE_SUFFIX, ArchiveReader, write_archive
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# fsync policies: after every record, when a segment is closed, or never (OS decides)
+FSYNC_ALWAYS = "always"
+FSYNC_SEGMENT = "segment"
+FSYNC_NEVER = "never"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_SEGMENT, FSYNC_NEVER)
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})(\.jsonl|\.blocks)$")
+
+LOCK_FILENAME = "store.lock"
+
+
+class RecordRef(NamedTuple):
+    """Location of a record: segment number, byte offset and length of its line."""
+
+    segment: int
+    offset: int
+    length: int
+
+    def __str__(self) -> str:
+        return f"{segment_name(self.segment)}@{self.offset}"
+
+
+def segment_name(number: int) -> str:
+    """File name of a segment."""
+    return f"segment-{number:06d}.jsonl"
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Serialize a record as one compact JSON line."""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class SegmentedResponseStore:
+    """
+    Append-only record store made of numbered JSONL segments.
+
+    New records go to the last segment; once it would grow past `segment_max_bytes`
+    a new segment is started. Each record is written with a single `write()` call, so
+    after a crash only the tail of the last segment can be incomplete, and it is
+    truncated the next time the store is opened. Thread-safe.
+
+    Several stores, in this or other processes, can append to the same directory: each
+    batch is written holding an exclusive lock on `store.lock` (fcntl, where
+    available), after re-reading the position of the active segment from disk.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: Optional[int] = None,
+        fsync: Optional[str] = None,
+    ):
+        """
+        Open the store, creating the directory if needed.
+
+        Args:
+            directory: Directory holding the segment files
+            segment_max_bytes: Size at which segments are rotated
+                (defaults to Config.RESPONSE_SEGMENT_MAX_BYTES)
+            fsync: One of "always", "segment" or "never" (defaults to Config.RESPONSE_FSYNC)
+
+        Raises:
+            ValueError: If the fsync policy is unknown
+        """
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes or Config.RESPONSE_SEGMENT_MAX_BYTES
+        self.fsync = fsync or Config.RESPONSE_FSYNC
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {self.fsync!r}")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = None
+        self._lock_file = None
+        self._archives: Dict[int, ArchiveReader] = {}
+        self._segment = 1
+        self._size = 0
+
+        # Recover a torn tail left by a crash
+        with self._lock, self._writer_lock():
+            if self.segment_path(self._segment).exists():
+                self._size = self._recover_tail()
+
+    def segments(self) -> List[int]:
+        """Numbers of the existing segments, oldest first."""
+        numbers = set()
+        for path in self.directory.glob("segment-*"):
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                numbers.add(int(match.group(1)))
+        return sorted(numbers)
+
+    @property
+    def active_segment(self) -> int:
+        """Number of the segment new records are appended to."""
+        return self._disk_tail()[0]
+
+    def _disk_tail(self) -> Tuple[int, int]:
+        """Active segment (the last one, or the next if it was compacted) and its size."""
+        segments = self.segments()
+        number = segments[-1] if segments else 1
+        if self.is_archived(number):
+            return number + 1, 0  # Everything was compacted: start a new segment
+        path = self.segment_path(number)
+        return number, path.stat().st_size if path.exists() else 0
+
+    @contextmanager
+    def _writer_lock(self):
+        """
+        Hold the directory's writer lock, with the active segment re-read from disk.
+        Must be called with the lock held.
+        """
+        if fcntl is not None:
+            if self._lock_file is None:
+                self._lock_file = open(self.directory / LOCK_FILENAME, "a")
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            self._refresh_tail()
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refresh_tail(self):
+        """Catch up with records and rotations written by other stores since our last write."""
+        path = self.segment_path(self._segment)
+        if path.exists() and not self.segment_path(self._segment + 1).exists():
+            number, size = self._segment, path.stat().st_size
+        else:
+            number, size = self._disk_tail()
+        if number != self._segment:
+            self._close_segment()
+        moved = (number, size) != (self._segment, self._size)
+        self._segment, self._size = number, size
+        if moved and size and not self._ends_with_newline():
+            self._size = self._recover_tail()  # A writer crashed halfway through a record
+
+    def _ends_with_newline(self) -> bool:
+        """Whether the active segment's last record is complete."""
+        with open(self.segment_path(self._segment), "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def segment_path(self, number: int) -> Path:
+        """Path of a segment file."""
+        return self.directory / segment_name(number)
+
+    def archive_path(self, number: int) -> Path:
+        """Path of the compressed archive of a segment."""
+        return self.directory / f"segment-{number:06d}{ARCHIVE_SUFFIX}"
+
+    def is_archived(self, number: int) -> bool:
+        """Whether a segment has been compacted (and its plain file removed)."""
+        return not self.segment_path(number).exists() and self.archive_path(number).exists()
+
+    def _archive(self, number: int) -> ArchiveReader:
+        """Cached reader of a segment's archive."""
+        with self._lock:
+            reader = self._archives.get(number)
+            if reader is None:
+                reader = self._archives[number] = ArchiveReader(self.archive_path(number))
+            return reader
+
+    def _recover_tail(self) -> int:
+        """
+        Drop an incomplete or corrupt last record from the active segment.
+
+        Returns:
+            Size of the segment after recovery
+        """
+        path = self.segment_path(self._segment)
+        data = path.read_bytes()
+        valid = len(data)
+
+        # An unterminated line is a write interrupted by a crash
+        if data and not data.endswith(b"\n"):
+            valid = data.rfind(b"\n") + 1
+        # A torn write can also leave a terminated but unparseable last line
+        if valid:
+            start = data.rfind(b"\n", 0, valid - 1) + 1
+            try:
+                json.loads(data[start:valid])
+            except ValueError:
+                valid = start
+
+        if valid != len(data):
+            logger.warning(
+                f"Truncating {len(data) - valid} bytes of incomplete data at the end of {path}"
+            )
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+                os.fsync(f.fileno())
+        return valid
+
+    def _open_segment(self):
+        """Open the active segment for appending."""
+        self._file = open(self.segment_path(self._segment), "ab")
+
+    def _rotate(self):
+        """Close the active segment and start the next one."""
+        self._close_segment()
+        self._segment += 1
+        self._size = 0
+        logger.info(f"Starting response segment {segment_name(self._segment)}")
+
+    def _close_segment(self):
+        """Flush, sync according to the policy, and close the active segment."""
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync != FSYNC_NEVER:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def append(self, record: Dict[str, Any]) -> RecordRef:
+        """
+        Append a record.
+
+        Args:
+            record: JSON-serializable dictionary
+
+        Returns:
+            Location of the stored record
+        """
+        return self.append_many([record])[0]
+
+    def append_many(self, records: List[Dict[str, Any]]) -> List[RecordRef]:
+        """
+        Append several records, writing each segment's share in one call.
+
+        Args:
+            records: JSON-serializable dictionaries
+
+        Returns:
+            Locations of the stored records, in the same order
+        """
+        lines = [encode_record(record) for record in records]
+        refs = []
+        with self._lock, self._writer_lock():
+            batch = bytearray()
+            for line in lines:
+                used = self._size + len(batch)
+                if used and used + len(line) > self.segment_max_bytes:
+                    self._write(batch)
+                    batch = bytearray()
+                    self._rotate()
+                refs.append(RecordRef(self._segment, self._size + len(batch), len(line)))
+                batch += line
+            self._write(batch)
+        return refs
+
+    def _write(self, data: bytes):
+        """Write bytes to the active segment and apply the fsync policy."""
+        if not data:
+            return
+        if self._file is None:
+            self._open_segment()
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync == FSYNC_ALWAYS:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+
+    def read(self, ref: RecordRef) -> Dict[str, Any]:
+        """
+        Read one record, from its segment file or from the segment's archive.
+
+        Args:
+            ref: Location returned by append() or iter_records()
+
+        Returns:
+            The stored record
+
+        Raises:
+            FileNotFoundError: If the segment does not exist
+        """
+        try:
+            with open(self.segment_path(ref.segment), "rb") as f:
+                f.seek(ref.offset)
+                return json.loads(f.read(ref.length))
+        except FileNotFoundError:
+            if not self.archive_path(ref.segment).exists():
+                raise
+        return json.loads(self._archive(ref.segment).read(ref.offset, ref.length))
+
+    def iter_records(
+        self, start: Optional[Tuple[int, int]] = None
+    ) -> Iterator[Tuple[RecordRef, Dict[str, Any]]]:
+        """
+        Iterate over the records, oldest first.
+
+        Args:
+            start: Optional (segment, offset) position to start from
+
+        Yields:
+            (location, record) pairs
+        """
+        first_segment, first_offset = start or (0, 0)
+        for number in self.segments():
+            if number < first_segment:
+                continue
+            offset = first_offset if number == first_segment else 0
+            if self.is_archived(number):
+                for line_offset, line in self._archive(number).iter_lines(offset):
+                    yield RecordRef(number, line_offset, len(line)), json.loads(line)
+                continue
+            with open(self.segment_path(number), "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Being written by another thread
+                    yield RecordRef(number, offset, len(line)), json.loads(line)
+                    offset += len(line)
+
+    def total_bytes(self) -> int:
+        """Combined size of all segments."""
+        return sum(
+            (self.archive_path(n) if self.is_archived(n) else self.segment_path(n)).stat().st_size
+            for n in self.segments()
+        )
+
+    def compact(
+        self, number: int, codec: Optional[str] = None, block_bytes: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Replace a segment file with a block-compressed archive.
+
+        Record locations do not change, so the index and the manifest stay valid.
+        Compacting the active segment closes it and makes the next save start a new one;
+        it holds the writer lock meanwhile, so no other store appends to it.
+
+        Args:
+            number: Segment to compact
+            codec: Compression codec (see write_archive())
+            block_bytes: Target uncompressed block size
+
+        Returns:
+            Statistics of the written archive (see write_archive())
+
+        Raises:
+            FileNotFoundError: If the segment file does not exist
+        """
+        with self._lock, self._writer_lock():
+            self._archives.pop(number, None)
+            if number == self._segment:
+                self._close_segment()
+                stats = self._compact_file(number, codec, block_bytes)
+                self._segment += 1
+                self._size = 0
+                return stats
+        return self._compact_file(number, codec, block_bytes)
+
+    def _compact_file(
+        self, number: int, codec: Optional[str], block_bytes: Optional[int]
+    ) -> Dict[str, int]:
+        """Write a segment's archive and remove its plain file."""
+        path = self.segment_path(number)
+        stats = write_archive(path.read_bytes(), self.archive_path(number), codec, block_bytes)
+        path.unlink()
+        logger.info(
+            f"Compacted {segment_name(number)}: {stats['raw_bytes']} -> "
+            f"{stats['compressed_bytes']} bytes in {stats['blocks']} block(s)"
+        )
+        return stats
+
+    def sync(self):
+        """Force the records written so far to disk, whatever the fsync policy."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        """Flush and close the active segment."""
+        with self._lock:
+            self._close_segment()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
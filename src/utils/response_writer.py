@@ -0,0 +1,349 @@
+"""
+Background writer for ResponseLogger.
+Moves serialization and disk writes off the caller's thread through a bounded queue.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.config import Config
+from src.utils.response_store import encode_record
+
+logger = logging.getLogger(__name__)
+
+# What save_response() does when the queue is full
+POLICY_BLOCK = "block"  # Wait for room in the queue
+POLICY_DROP = "drop"  # Discard the record and count it
+POLICY_SPILL = "spill"  # Append it to a spill file that the writer ingests later
+QUEUE_POLICIES = (POLICY_BLOCK, POLICY_DROP, POLICY_SPILL)
+
+SPILL_FILENAME = "spill.jsonl"
+# A spill file being ingested, and the byte offset of the records already written
+DRAINING_SUFFIX = ".draining"
+OFFSET_SUFFIX = ".offset"
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    Single writer thread fed by a bounded queue.
+
+    The thread takes every record waiting in the queue (up to `max_batch`) and hands
+    them to `write_batch` in one call, so a burst of saves becomes one grouped write.
+    Records in the queue are lost if the process dies; flush() and close() guarantee
+    that everything submitted before them is on disk. Spilled records survive a crash
+    and are ingested the next time a writer starts.
+
+    To ingest the spill file it is first renamed to `<spill>.draining`, so records can
+    keep spilling meanwhile; after each batch is written and synced, the offset reached
+    is recorded in `<spill>.draining.offset`, and an interrupted drain resumes from
+    there (at most the batch in flight is written twice).
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict[str, Any]]], Any],
+        sync: Callable[[], None],
+        spill_path: Path,
+        queue_size: Optional[int] = None,
+        policy: Optional[str] = None,
+        max_batch: Optional[int] = None,
+    ):
+        """
+        Start the writer thread.
+
+        Args:
+            write_batch: Function that durably appends a list of records
+            sync: Function that forces appended records to disk
+            spill_path: File used by the spill policy
+            queue_size: Records the queue holds (defaults to Config.RESPONSE_QUEUE_SIZE)
+            policy: "block", "drop" or "spill" (defaults to Config.RESPONSE_QUEUE_POLICY)
+            max_batch: Records per grouped write (defaults to Config.RESPONSE_WRITER_BATCH)
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        self.policy = policy or Config.RESPONSE_QUEUE_POLICY
+        if self.policy not in QUEUE_POLICIES:
+            raise ValueError(f"policy must be one of {QUEUE_POLICIES}, got {self.policy!r}")
+        self.queue_size = queue_size or Config.RESPONSE_QUEUE_SIZE
+        self.max_batch = max_batch or Config.RESPONSE_WRITER_BATCH
+        self.spill_path = Path(spill_path)
+        self._draining_path = self.spill_path.with_name(self.spill_path.name + DRAINING_SUFFIX)
+        self._offset_path = self._draining_path.with_name(self._draining_path.name + OFFSET_SUFFIX)
+
+        self._write_batch = write_batch
+        self._sync = sync
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        self._spill_lock = threading.Lock()  # Appends to and swaps of the spill file
+        self._drain_lock = threading.Lock()  # One drain at a time
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self._failure: Optional[BaseException] = None  # Why the writer thread stopped early
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.blocked = 0
+        self.errors = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.write_time = 0.0
+        self.max_write_time = 0.0
+
+        # Records spilled by a previous process that did not get to ingest them
+        self.drain_spill()
+
+        self._thread = threading.Thread(target=self._run, name="response-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue a record for writing, applying the policy if the queue is full.
+
+        Args:
+            record: Record to save
+
+        Returns:
+            False if the record was dropped
+
+        Raises:
+            RuntimeError: If the writer is closed, or the queue is full and the writer
+                thread has stopped
+        """
+        if self._closed:
+            raise RuntimeError("The response writer is closed")
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if self.policy == POLICY_DROP:
+                with self._stats_lock:
+                    self.dropped += 1
+                logger.warning("Response queue full, dropping record")
+                return False
+            if self.policy == POLICY_SPILL:
+                self._spill([record])
+                return True
+            with self._stats_lock:
+                self.blocked += 1
+            self._put(record)
+
+        with self._stats_lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _put(self, item: Any):
+        """Queue an item, waiting for room only while the writer thread is alive."""
+        while True:
+            self._check_alive()
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _check_alive(self):
+        """Raise if the writer thread has stopped, so callers do not wait on it forever."""
+        if not self._thread.is_alive():
+            raise RuntimeError("The response writer thread has stopped") from self._failure
+
+    def _spill(self, records: List[Dict[str, Any]]):
+        """Append records to the spill file."""
+        data = b"".join(encode_record(record) for record in records)
+        with self._spill_lock:
+            with open(self.spill_path, "ab") as f:
+                f.write(data)
+        with self._stats_lock:
+            self.spilled += len(records)
+
+    def drain_spill(self) -> int:
+        """
+        Write the spilled records to the store and remove the spill file.
+
+        A drain left unfinished by an error or a crash is completed first.
+
+        Returns:
+            Number of records ingested
+        """
+        with self._drain_lock:
+            drained = 0
+            if self._draining_path.exists():
+                drained += self._drain_file()
+            with self._spill_lock:
+                swapped = self.spill_path.exists()
+                if swapped:
+                    os.replace(self.spill_path, self._draining_path)
+            if swapped:
+                drained += self._drain_file()
+        if drained:
+            logger.info(f"Ingested {drained} spilled response(s)")
+        return drained
+
+    def _drain_file(self) -> int:
+        """Write the records of the draining file past the recorded offset, then delete it."""
+        try:
+            offset = int(self._offset_path.read_text(encoding="ascii"))
+        except (FileNotFoundError, ValueError):
+            offset = 0
+
+        drained = 0
+        batch: List[Dict[str, Any]] = []
+        position = offset
+        with open(self._draining_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                position += len(line)
+                try:
+                    batch.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping a torn record in {self._draining_path}")
+                if len(batch) >= self.max_batch:
+                    self._commit_drained(batch, position)
+                    drained += len(batch)
+                    batch = []
+        if batch:
+            self._commit_drained(batch, position)
+            drained += len(batch)
+
+        self._draining_path.unlink()
+        self._offset_path.unlink(missing_ok=True)
+        return drained
+
+    def _commit_drained(self, records: List[Dict[str, Any]], position: int):
+        """Write and sync a batch of spilled records, then record how far the drain got."""
+        self._write_batch(records)
+        self._sync()
+        temporary = self._offset_path.with_name(self._offset_path.name + ".tmp")
+        temporary.write_text(str(position), encoding="ascii")
+        os.replace(temporary, self._offset_path)
+
+    def _run(self):
+        """Run the writer loop, recording why it stopped if it fails."""
+        try:
+            self._loop()
+        except BaseException as e:
+            self._failure = e
+            logger.error(f"Response writer thread stopped: {e!r}")
+
+    def _loop(self):
+        """Writer loop: take the waiting records and write them in one batch."""
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            try:
+                while len(items) < self.max_batch:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                records = [item for item in items if item is not _STOP]
+                stop = len(records) != len(items)
+                if records:
+                    self._write(records)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+            if self._queue.empty() and (self.spill_path.exists() or self._draining_path.exists()):
+                self._drain_spill_safely()
+
+    def _write(self, records: List[Dict[str, Any]]):
+        """Write one batch, spilling it to disk (or dropping it) if the write fails."""
+        start = time.perf_counter()
+        try:
+            self._write_batch(records)
+        except Exception as e:
+            logger.error(f"Failed to write {len(records)} response(s), spilling them: {e}")
+            with self._stats_lock:
+                self.errors += 1
+            try:
+                self._spill(records)
+            except Exception as spill_error:
+                logger.error(
+                    f"Failed to spill {len(records)} response(s), dropping them: {spill_error}"
+                )
+                with self._stats_lock:
+                    self.errors += 1
+                    self.dropped += len(records)
+            return
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.written += len(records)
+            self.batches += 1
+            self.write_time += elapsed
+            self.max_write_time = max(self.max_write_time, elapsed)
+
+    def _drain_spill_safely(self):
+        """Ingest the spill file from the writer thread, keeping it on errors."""
+        try:
+            self.drain_spill()
+        except Exception as e:
+            logger.error(f"Failed to ingest spilled responses: {e}")
+            with self._stats_lock:
+                self.errors += 1
+
+    def flush(self):
+        """
+        Wait until every submitted record is written and synced to disk.
+
+        Raises:
+            RuntimeError: If the writer thread stopped with records still queued
+        """
+        self._join_queue()
+        self.drain_spill()
+        self._sync()
+
+    def _join_queue(self):
+        """Wait until the queue is processed, raising if the writer thread stops first."""
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                self._check_alive()
+                self._queue.all_tasks_done.wait(0.1)
+
+    def close(self):
+        """
+        Write everything still queued or spilled and stop the thread.
+
+        Raises:
+            RuntimeError: If the writer thread stopped before writing everything queued
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._put(_STOP)
+        self._thread.join()
+        if self._failure is not None:
+            raise RuntimeError("The response writer thread has stopped") from self._failure
+        self.drain_spill()
+        self._sync()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, record counters and grouped-write latency."""
+        with self._stats_lock:
+            return {
+                "policy": self.policy,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_depth,
+                "submitted": self.submitted,
+                "written": self.written,
+                "dropped": self.dropped,
+                "spilled": self.spilled,
+                "blocked": self.blocked,
+                "errors": self.errors,
+                "batches": self.batches,
+                "mean_batch_size": self.written / self.batches if self.batches else 0.0,
+                "mean_write_time": self.write_time / self.batches if self.batches else 0.0,
+                "max_write_time": self.max_write_time,
+            }
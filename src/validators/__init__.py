@@ -1,7 +1,8 @@
 """Validators package."""
 
 from .content_validator import ContentValidator
+from .pattern_matcher import MultiPatternMatcher
 from .quality_scorer import QualityScorer
 from .response_validator import ResponseValidator
 
-__all__ = ["ResponseValidator", "ContentValidator", "QualityScorer"]
+__all__ = ["ResponseValidator", "ContentValidator", "QualityScorer", "MultiPatternMatcher"]
@@ -7,8 +7,27 @@ import logging
 import re
 from typing import Dict, List
 
+from src.validators.pattern_matcher import get_matcher
+
 logger = logging.getLogger(__name__)
 
+# Code blocks (triple backticks or inline code) and common code patterns. They are kept
+# as separate compiled patterns: each has a literal prefix the regex engine can search
+# for quickly, which a single combined alternation would lose.
+_CODE_RES = [
+    re.compile(r"```[\s\S]*?```|`[^`]+`"),
+    re.compile(r"def\s+\w+\s*\("),  # Python function
+    re.compile(r"class\s+\w+"),  # Class definition
+    re.compile(r"import\s+\w+"),  # Import statement
+    re.compile(r"from\s+\w+\s+import"),  # From import
+    re.compile(r"self\.\w+"),  # self references
+    re.compile(r"assert\w*\s*\("),  # Assert statements
+    re.compile(r"@\w+"),  # Decorators
+]
+
+_NUMBERED_RE = re.compile(r"\d+\)")  # Numbered lists (1), 2), etc.)
+_BULLET_RE = re.compile(r"^\s*[-*•]\s+", re.MULTILINE)  # Bullet points or dashes
+
 
 class ContentValidator:
     """Validates content quality of API responses."""
@@ -73,24 +92,7 @@ class ContentValidator:
         Returns:
             True if code examples are found
         """
-        # Look for code blocks (triple backticks or indented code)
-        code_block_pattern = r"```[\s\S]*?```|`[^`]+`"
-        has_code_blocks = bool(re.search(code_block_pattern, text))
-
-        # Look for common code patterns
-        code_patterns = [
-            r"def\s+\w+\s*\(",  # Python function
-            r"class\s+\w+",  # Class definition
-            r"import\s+\w+",  # Import statement
-            r"from\s+\w+\s+import",  # From import
-            r"self\.\w+",  # self references
-            r"assert\w*\s*\(",  # Assert statements
-            r"@\w+",  # Decorators
-        ]
-
-        has_code_patterns = any(re.search(pattern, text) for pattern in code_patterns)
-
-        return has_code_blocks or has_code_patterns
+        return any(pattern.search(text) for pattern in _CODE_RES)
 
     @staticmethod
     def count_testing_keywords(text: str) -> int:
@@ -103,9 +105,7 @@ class ContentValidator:
         Returns:
             Number of testing keywords found
         """
-        text_lower = text.lower()
-        count = sum(1 for keyword in ContentValidator.TESTING_KEYWORDS if keyword in text_lower)
-        return count
+        return len(_KEYWORD_MATCHER.find(text.lower()))
 
     @staticmethod
     def mentions_frameworks(text: str) -> List[str]:
@@ -118,9 +118,8 @@ class ContentValidator:
         Returns:
             List of frameworks mentioned
         """
-        text_lower = text.lower()
-        mentioned = [fw for fw in ContentValidator.TESTING_FRAMEWORKS if fw in text_lower]
-        return mentioned
+        found = _FRAMEWORK_MATCHER.find(text.lower())
+        return [fw for fw in ContentValidator.TESTING_FRAMEWORKS if fw in found]
 
     @staticmethod
     def has_structured_content(text: str) -> bool:
@@ -133,13 +132,8 @@ class ContentValidator:
         Returns:
             True if structured content is found
         """
-        # Look for numbered lists (1), 2), etc.)
-        numbered_pattern = r"\d+\)"
-        has_numbered = bool(re.search(numbered_pattern, text))
-
-        # Look for bullet points or dashes
-        bullet_pattern = r"^\s*[-*•]\s+"
-        has_bullets = bool(re.search(bullet_pattern, text, re.MULTILINE))
+        has_numbered = _NUMBERED_RE.search(text) is not None
+        has_bullets = _BULLET_RE.search(text) is not None
 
         # Look for newlines indicating list structure
         has_multiple_paragraphs = text.count("\n\n") >= 2
@@ -157,28 +151,68 @@ class ContentValidator:
         Returns:
             Content quality score
         """
+        return ContentValidator.get_content_details(text)["content_score"]
+
+    @staticmethod
+    def get_content_details(text: str) -> Dict:
+        """
+        Get detailed content analysis.
+
+        Keywords and frameworks come from a single scan of the text, and the content
+        score is derived from the results instead of re-running the checks.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Dictionary with content analysis details
+        """
+        found = _VOCABULARY_MATCHER.find(text.lower())
+        details = {
+            "has_code_examples": ContentValidator.contains_code_examples(text),
+            "keyword_count": len(found & ContentValidator.TESTING_KEYWORDS),
+            "frameworks_mentioned": [
+                fw for fw in ContentValidator.TESTING_FRAMEWORKS if fw in found
+            ],
+            "has_structure": ContentValidator.has_structured_content(text),
+            "length": len(text),
+        }
+        details["content_score"] = ContentValidator._score_details(details)
+        return details
+
+    @staticmethod
+    def _score_details(details: Dict) -> float:
+        """
+        Calculate the content quality score from precomputed analysis details.
+
+        Args:
+            details: Analysis details without "content_score"
+
+        Returns:
+            Content quality score (0.0 - 1.0)
+        """
         score = 0.0
         max_score = 5.0
 
         # 1. Has code examples (1.0 point)
-        if ContentValidator.contains_code_examples(text):
+        if details["has_code_examples"]:
             score += 1.0
 
         # 2. Testing keywords (up to 1.0 point)
-        keyword_count = ContentValidator.count_testing_keywords(text)
+        keyword_count = details["keyword_count"]
         score += min(keyword_count / 5.0, 1.0)  # Max 1.0 for 5+ keywords
 
         # 3. Mentions frameworks (1.0 point)
-        frameworks = ContentValidator.mentions_frameworks(text)
+        frameworks = details["frameworks_mentioned"]
         if frameworks:
             score += 1.0
 
         # 4. Has structured content (1.0 point)
-        if ContentValidator.has_structured_content(text):
+        if details["has_structure"]:
             score += 1.0
 
         # 5. Minimum length check (1.0 point)
-        if len(text) >= 200:
+        if details["length"] >= 200:
             score += 1.0
 
         # Normalize to 0.0 - 1.0
@@ -186,27 +220,15 @@ class ContentValidator:
 
         logger.debug(
             f"Content score: {normalized_score:.2f} (keywords: {keyword_count}, "
-            f"frameworks: {len(frameworks)}, code: {ContentValidator.contains_code_examples(text)})"
+            f"frameworks: {len(frameworks)}, code: {details['has_code_examples']})"
         )
 
         return normalized_score
 
-    @staticmethod
-    def get_content_details(text: str) -> Dict:
-        """
-        Get detailed content analysis.
-
-        Args:
-            text: Text to analyze
 
-        Returns:
-            Dictionary with content analysis details
-        """
-        return {
-            "has_code_examples": ContentValidator.contains_code_examples(text),
-            "keyword_count": ContentValidator.count_testing_keywords(text),
-            "frameworks_mentioned": ContentValidator.mentions_frameworks(text),
-            "has_structure": ContentValidator.has_structured_content(text),
-            "length": len(text),
-            "content_score": ContentValidator.calculate_content_score(text),
-        }
+# Vocabulary matchers, compiled once like the code patterns above
+_KEYWORD_MATCHER = get_matcher(frozenset(ContentValidator.TESTING_KEYWORDS))
+_FRAMEWORK_MATCHER = get_matcher(frozenset(ContentValidator.TESTING_FRAMEWORKS))
+_VOCABULARY_MATCHER = get_matcher(
+    frozenset(ContentValidator.TESTING_KEYWORDS | ContentValidator.TESTING_FRAMEWORKS)
+)
@@ -0,0 +1,184 @@
+"""
+Multi-pattern matcher for keyword vocabularies.
+Compiles a vocabulary once and finds every term in a text with a single scan.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_SINGLE_WORD_RE = re.compile(r"\w+\Z")
+
+
+class MultiPatternMatcher:
+    """
+    Aho-Corasick style matcher over a fixed vocabulary.
+
+    Two semantics are supported:
+    - substring (default): a term matches anywhere, like `term in text`
+    - whole words: a term matches only when not surrounded by word characters,
+      like comparing against the `\\w+` tokens of the text
+
+    Large substring vocabularies are compiled into one trie-shaped regex, so a text is
+    scanned once regardless of the number of terms. Small ones are checked term by term:
+    CPython's substring search beats any regex automaton until the vocabulary reaches a
+    few hundred terms. Whole-word matching of single-word terms is a set lookup per token,
+    which is already independent of the vocabulary size.
+
+    Matching is case sensitive; callers lowercase both the vocabulary and the text.
+    """
+
+    AUTOMATON_MIN_TERMS = 256
+
+    def __init__(self, terms: Iterable[str], whole_words: bool = False):
+        """
+        Compile a vocabulary.
+
+        Args:
+            terms: Terms to look for (empty strings are ignored)
+            whole_words: If True, terms only match as whole words
+        """
+        self.terms = frozenset(term for term in terms if term)
+        self.whole_words = whole_words
+
+        self._trie = self._build_trie(self.terms)
+        self._pattern = None
+        if whole_words:
+            self._words = frozenset(t for t in self.terms if _SINGLE_WORD_RE.match(t))
+            phrases = self.terms - self._words
+            if phrases:
+                # Multi-word terms cannot be found by tokenizing, so they get a bounded regex
+                self._pattern = re.compile(
+                    r"(?<!\w)(?:" + self._render(self._build_trie(phrases)) + r")(?!\w)"
+                )
+        elif len(self.terms) >= self.AUTOMATON_MIN_TERMS:
+            self._pattern = re.compile(self._render(self._trie))
+            # Terms found inside the longest term matched at a position
+            self._contained = {term: frozenset(self._terms_within(term)) for term in self.terms}
+            # Offsets inside a term where another, longer-reaching term could start
+            self._overlaps = {
+                term: [j for j in range(1, len(term)) if self._continues(term[j:])]
+                for term in self.terms
+            }
+
+    @staticmethod
+    def _build_trie(terms: Iterable[str]) -> Dict:
+        """Build a character trie; the "" key marks the end of a term."""
+        trie: Dict = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        return trie
+
+    @classmethod
+    def _render(cls, node: Dict) -> str:
+        """Render a trie as a regex that prefers the longest term at each position."""
+        branches = [re.escape(c) + cls._render(child) for c, child in sorted(node.items()) if c]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A term ends here; the greedy optional group tries longer terms first
+            pattern = "(?:" + pattern + ")?"
+        return pattern
+
+    def _terms_within(self, text: str) -> Set[str]:
+        """Find every term that is a substring of `text` by walking the trie."""
+        found = set()
+        for start in range(len(text)):
+            node = self._trie
+            for end in range(start, len(text)):
+                node = node.get(text[end])
+                if node is None:
+                    break
+                if "" in node:
+                    found.add(text[start : end + 1])
+        return found
+
+    def _continues(self, prefix: str) -> bool:
+        """Check whether `prefix` is a proper prefix of some term."""
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return False
+        return any(char for char in node)
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Find the distinct terms that occur in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of terms present in the text
+        """
+        if self.whole_words:
+            return set(self.findall(text))
+
+        if self._pattern is None:
+            return {term for term in self.terms if term in text}
+
+        found: Set[str] = set()
+        for match in self._pattern.finditer(text):
+            pending = [match]
+            while pending:
+                current = pending.pop()
+                term = current.group()
+                found |= self._contained[term]
+                for offset in self._overlaps[term]:
+                    overlap = self._pattern.match(text, current.start() + offset)
+                    if overlap is not None:
+                        pending.append(overlap)
+        return found
+
+    def findall(self, text: str) -> List[str]:
+        """
+        List every whole-word occurrence of a term, in text order.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Matched terms, repeated as many times as they occur
+
+        Raises:
+            ValueError: If the matcher uses substring semantics
+        """
+        if not self.whole_words:
+            raise ValueError("findall() requires a whole_words matcher")
+
+        words = self._words
+        if self._pattern is None:
+            return [word for word in _WORD_RE.findall(text) if word in words]
+
+        matches = [(m.start(), m.group()) for m in _WORD_RE.finditer(text) if m.group() in words]
+        matches.extend((m.start(), m.group()) for m in self._pattern.finditer(text))
+        matches.sort(key=lambda match: match[0])
+        return [term for _, term in matches]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+@lru_cache(maxsize=32)
+def get_matcher(terms: FrozenSet[str], whole_words: bool = False) -> MultiPatternMatcher:
+    """
+    Return the compiled matcher of a vocabulary, building it on first use.
+
+    Args:
+        terms: Vocabulary to match
+        whole_words: If True, terms only match as whole words
+
+    Returns:
+        Shared MultiPatternMatcher instance
+    """
+    logger.debug(f"Compiling matcher for {len(terms)} terms (whole_words={whole_words})")
+    return MultiPatternMatcher(terms, whole_words=whole_words)
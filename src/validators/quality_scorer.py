@@ -4,17 +4,30 @@ Combines structural, content, and semantic validation.
 """
 
 import logging
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+from sentence_transformers import SentenceTransformer
 
 from src.utils.config import Config
+from src.utils.embedding_cache import EmbeddingCache
 from src.validators.content_validator import ContentValidator
 from src.validators.response_validator import ResponseValidator
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ResponseAnalysis:
+    """Scores of a single response, computed once and shared by every consumer."""
+
+    structural_score: float
+    content_score: float
+    semantic_score: float
+    content_details: Dict
+
+
 class QualityScorer:
     """
     Multi-dimensional quality scorer for API responses.
@@ -30,15 +43,22 @@ class QualityScorer:
     CONTENT_WEIGHT = 0.40
     SEMANTIC_WEIGHT = 0.40
 
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(
+        self, model_name: Optional[str] = None, embedding_cache: Optional[EmbeddingCache] = None
+    ):
         """
         Initialize the quality scorer.
 
         Args:
             model_name: Name of the sentence transformer model to use
+            embedding_cache: Cache for text embeddings (defaults to a persistent cache
+                under Config.EMBEDDING_CACHE_DIR when Config.EMBEDDING_CACHE_ENABLED)
         """
         self.model_name = model_name or Config.SENTENCE_TRANSFORMER_MODEL
         self._model = None
+        if embedding_cache is None and Config.EMBEDDING_CACHE_ENABLED:
+            embedding_cache = EmbeddingCache(self.model_name)
+        self.embedding_cache = embedding_cache
         logger.info(f"QualityScorer initialized with model: {self.model_name}")
 
     @property
@@ -49,6 +69,59 @@ class QualityScorer:
             self._model = SentenceTransformer(self.model_name)
         return self._model
 
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Encode texts, only running the model on texts missing from the embedding cache.
+
+        Args:
+            texts: Texts to encode
+            batch_size: Number of texts the model encodes per forward pass
+
+        Returns:
+            float32 array with one embedding per text
+        """
+        if self.embedding_cache is None:
+            return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True).astype(
+                np.float32
+            )
+
+        vectors = [self.embedding_cache.get(text) for text in texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = self.model.encode(
+                unique_texts, batch_size=batch_size, convert_to_numpy=True
+            ).astype(np.float32)
+            by_text = dict(zip(unique_texts, encoded))
+            for text, vector in by_text.items():
+                self.embedding_cache.put(text, vector)
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+            logger.debug(
+                f"Encoded {len(unique_texts)} new text(s), {len(texts) - len(missing)} cached"
+            )
+
+        return np.stack(vectors)
+
+    @staticmethod
+    def _cosine_similarities(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Compute the cosine similarity of each row of `a` with the same row of `b`.
+
+        Args:
+            a: Array of shape (n, dim)
+            b: Array of shape (n, dim)
+
+        Returns:
+            Array of n similarities
+        """
+        a = np.atleast_2d(a)
+        b = np.atleast_2d(b)
+        norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+        dots = np.einsum("ij,ij->i", a, b)
+        return dots / np.maximum(norms, 1e-8)
+
     def calculate_structural_score(self, response: Dict) -> float:
         """
         Calculate structural validation score.
@@ -104,17 +177,28 @@ class QualityScorer:
             Semantic score (0.0 - 1.0)
         """
         answer_text = ResponseValidator.get_answer_text(response)
+        return self._semantic_score(answer_text, question)
+
+    def _semantic_score(self, answer_text: str, question: str) -> float:
+        """
+        Compute the semantic relevance of an already extracted answer.
 
+        Args:
+            answer_text: Answer text
+            question: Original question asked
+
+        Returns:
+            Semantic score (0.0 - 1.0)
+        """
         if not answer_text or not question:
             return 0.0
 
         try:
-            # Encode question and answer
-            question_embedding = self.model.encode(question, convert_to_tensor=True)
-            answer_embedding = self.model.encode(answer_text, convert_to_tensor=True)
+            # Encode question and answer (cached embeddings are reused)
+            question_embedding, answer_embedding = self.encode([question, answer_text])
 
             # Calculate cosine similarity
-            similarity = util.cos_sim(question_embedding, answer_embedding).item()
+            similarity = float(self._cosine_similarities(question_embedding, answer_embedding)[0])
 
             # Normalize to 0.0 - 1.0 (cosine similarity is already -1 to 1, but typically 0 to 1)
             score = max(0.0, min(1.0, similarity))
@@ -126,40 +210,78 @@ class QualityScorer:
             logger.error(f"Error calculating semantic score: {str(e)}")
             return 0.0
 
-    def calculate_overall_score(self, response: Dict, question: str) -> float:
+    def analyze(
+        self, response: Dict, question: str, semantic_score: Optional[float] = None
+    ) -> ResponseAnalysis:
         """
-        Calculate overall quality score combining all dimensions.
+        Analyze a response once, computing every scoring dimension.
 
         Args:
             response: API response dictionary
             question: Original question asked
+            semantic_score: Precomputed semantic score (computed here when None)
 
         Returns:
-            Overall quality score (0.0 - 1.0)
+            ResponseAnalysis shared by the overall score and the detailed breakdown
+        """
+        answer_text = ResponseValidator.get_answer_text(response)
+        content_details = ContentValidator.get_content_details(answer_text)
+
+        if semantic_score is None:
+            semantic_score = self._semantic_score(answer_text, question)
+
+        return ResponseAnalysis(
+            structural_score=self.calculate_structural_score(response),
+            content_score=content_details["content_score"] if answer_text else 0.0,
+            semantic_score=semantic_score,
+            content_details=content_details,
+        )
+
+    def _overall_score(self, analysis: ResponseAnalysis) -> float:
         """
-        structural_score = self.calculate_structural_score(response)
-        content_score = self.calculate_content_score(response)
-        semantic_score = self.calculate_semantic_score(response, question)
+        Combine the dimensions of an analysis into the weighted overall score.
 
+        Args:
+            analysis: Analysis of the response
+
+        Returns:
+            Overall quality score (0.0 - 1.0)
+        """
         # Weighted average
         overall_score = (
-            structural_score * self.STRUCTURAL_WEIGHT
-            + content_score * self.CONTENT_WEIGHT
-            + semantic_score * self.SEMANTIC_WEIGHT
+            analysis.structural_score * self.STRUCTURAL_WEIGHT
+            + analysis.content_score * self.CONTENT_WEIGHT
+            + analysis.semantic_score * self.SEMANTIC_WEIGHT
         )
 
         logger.info(
-            f"Quality scores - Structural: {structural_score:.2f}, "
-            f"Content: {content_score:.2f}, Semantic: {semantic_score:.2f}, "
+            f"Quality scores - Structural: {analysis.structural_score:.2f}, "
+            f"Content: {analysis.content_score:.2f}, Semantic: {analysis.semantic_score:.2f}, "
             f"Overall: {overall_score:.2f}"
         )
 
         return overall_score
 
+    def calculate_overall_score(self, response: Dict, question: str) -> float:
+        """
+        Calculate overall quality score combining all dimensions.
+
+        Args:
+            response: API response dictionary
+            question: Original question asked
+
+        Returns:
+            Overall quality score (0.0 - 1.0)
+        """
+        return self._overall_score(self.analyze(response, question))
+
     def get_detailed_scores(self, response: Dict, question: str) -> Dict:
         """
         Get detailed breakdown of all scores.
 
+        Each dimension is computed exactly once, so this costs the same as
+        calculate_overall_score.
+
         Args:
             response: API response dictionary
             question: Original question asked
@@ -167,23 +289,69 @@ class QualityScorer:
         Returns:
             Dictionary with detailed score breakdown
         """
-        structural_score = self.calculate_structural_score(response)
-        content_score = self.calculate_content_score(response)
-        semantic_score = self.calculate_semantic_score(response, question)
-        overall_score = self.calculate_overall_score(response, question)
+        return self._detailed_scores(self.analyze(response, question))
 
-        # Get content details
-        answer_text = ResponseValidator.get_answer_text(response)
-        content_details = ContentValidator.get_content_details(answer_text)
+    def score_many(self, pairs: Sequence[Tuple[str, Dict]], batch_size: int = 64) -> List[Dict]:
+        """
+        Get detailed scores for many (question, response) pairs at once.
+
+        All questions and answers are encoded in large batches and the cosine
+        similarities are computed as a single vectorized operation.
+
+        Args:
+            pairs: Sequence of (question, response) tuples
+            batch_size: Number of texts the model encodes per forward pass
+
+        Returns:
+            List of dictionaries shaped like get_detailed_scores, in input order
+        """
+        answers = [ResponseValidator.get_answer_text(response) for _, response in pairs]
+        semantic_scores = np.zeros(len(pairs))
+        scorable = [i for i, (question, _) in enumerate(pairs) if answers[i] and question]
+
+        if scorable:
+            try:
+                # Questions repeat across responses, so each distinct text is encoded once
+                texts = [pairs[i][0] for i in scorable] + [answers[i] for i in scorable]
+                unique_texts = list(dict.fromkeys(texts))
+                position = {text: j for j, text in enumerate(unique_texts)}
+                embeddings = self.encode(unique_texts, batch_size=batch_size)
+
+                rows = np.array([position[text] for text in texts])
+                question_embeddings = embeddings[rows[: len(scorable)]]
+                answer_embeddings = embeddings[rows[len(scorable) :]]
+                similarities = self._cosine_similarities(question_embeddings, answer_embeddings)
+                semantic_scores[scorable] = np.clip(similarities, 0.0, 1.0)
+            except Exception as e:
+                logger.error(f"Error calculating semantic scores: {str(e)}")
+
+        return [
+            self._detailed_scores(
+                self.analyze(response, question, semantic_score=float(semantic_scores[i]))
+            )
+            for i, (question, response) in enumerate(pairs)
+        ]
+
+    def _detailed_scores(self, analysis: ResponseAnalysis) -> Dict:
+        """
+        Build the detailed score breakdown of an analysis.
+
+        Args:
+            analysis: Analysis of the response
+
+        Returns:
+            Dictionary with detailed score breakdown
+        """
+        overall_score = self._overall_score(analysis)
 
         return {
             "overall_score": overall_score,
-            "structural_score": structural_score,
-            "content_score": content_score,
-            "semantic_score": semantic_score,
+            "structural_score": analysis.structural_score,
+            "content_score": analysis.content_score,
+            "semantic_score": analysis.semantic_score,
             "passes_threshold": overall_score >= Config.QUALITY_THRESHOLD,
             "threshold": Config.QUALITY_THRESHOLD,
-            "content_details": content_details,
+            "content_details": analysis.content_details,
             "weights": {
                 "structural": self.STRUCTURAL_WEIGHT,
                 "content": self.CONTENT_WEIGHT,
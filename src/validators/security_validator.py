@@ -5,10 +5,15 @@ Analyzes content for profanity, toxicity, and PII requests.
 
 import logging
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
+
+from src.validators.pattern_matcher import get_matcher
 
 logger = logging.getLogger(__name__)
 
+_TRAILING_WORD_RE = re.compile(r"\w*\Z")
+_NON_WORD_RE = re.compile(r"\W")
+
 
 class SecurityValidator:
     """Validates security and safety of API responses."""
@@ -52,6 +57,19 @@ class SecurityValidator:
         r"(?:what is|cual es).{0,50}(?:your|tu).{0,50}(?:address|direcci[oó]n)",
     ]
 
+    # Category reported for each entry of PII_REQUEST_PATTERNS, in the same order
+    PII_REQUEST_CATEGORIES = ["password", "credit_card", "ssn", "phone_number", "address"]
+
+    # Literal phrases the built-in patterns start with: a text containing none of them
+    # cannot match those patterns, so their regex is skipped
+    PII_LEAD_INS = ("dame", "give me", "proporciona", "provide", "what is", "cual es")
+    _LEAD_IN_PATTERNS = frozenset(PII_REQUEST_PATTERNS)
+
+    # The patterns starting with a lead-in and the rest, each compiled into one
+    # alternation, and the patterns they were built from
+    _pii_regexes: Tuple[Optional["re.Pattern"], Optional["re.Pattern"]] = (None, None)
+    _pii_regex_source: Optional[Tuple[str, ...]] = None
+
     @staticmethod
     def contains_profanity(text: str) -> Tuple[bool, List[str]]:
         """
@@ -63,13 +81,100 @@ class SecurityValidator:
         Returns:
             Tuple (bool, List[str]): True if profanity found, list of words found
         """
-        text_lower = text.lower()
-        words = re.findall(r"\b\w+\b", text_lower)
-
-        found_profanity = [word for word in words if word in SecurityValidator.PROFANITY_LIST]
+        matcher = get_matcher(frozenset(SecurityValidator.PROFANITY_LIST), whole_words=True)
+        found_profanity = matcher.findall(text.lower())
 
         return len(found_profanity) > 0, found_profanity
 
+    @classmethod
+    def pii_category(cls, index: int) -> str:
+        """Category of the PII pattern at `index` ("pattern_<index>" if it has none)."""
+        if index < len(cls.PII_REQUEST_CATEGORIES):
+            return cls.PII_REQUEST_CATEGORIES[index]
+        return f"pattern_{index}"
+
+    @classmethod
+    def register_pii_pattern(cls, category: str, pattern: str):
+        """
+        Register an additional PII request category.
+
+        Registered patterns are combined into one regex, so checks scan the text once
+        for all of them.
+
+        Args:
+            category: Category name (a valid Python identifier)
+            pattern: Regex matched against the lowercased text; must not define capturing
+                groups, since group numbers change once patterns are combined
+
+        Raises:
+            ValueError: If the category exists or the pattern cannot be combined
+        """
+        if not category.isidentifier():
+            raise ValueError(f"PII category must be an identifier, got {category!r}")
+        categories = [cls.pii_category(i) for i in range(len(cls.PII_REQUEST_PATTERNS))]
+        if category in categories:
+            raise ValueError(f"PII category already registered: {category}")
+
+        if re.compile(pattern).groups:
+            raise ValueError(
+                f"PII pattern for {category!r} must not define capturing groups, use (?:...)"
+            )
+
+        cls.PII_REQUEST_CATEGORIES[:] = categories + [category]
+        cls.PII_REQUEST_PATTERNS.append(pattern)
+
+    @classmethod
+    def _compiled_pii_regexes(cls) -> Tuple[Optional["re.Pattern"], Optional["re.Pattern"]]:
+        """
+        Compile the PII patterns into alternations of groups named p<index>.
+
+        The built-in patterns, which start with a lead-in, go into the first regex, behind
+        a lookahead on the lead-ins; any other pattern goes into the second. The regexes
+        are rebuilt whenever PII_REQUEST_PATTERNS changes.
+        """
+        source = tuple(cls.PII_REQUEST_PATTERNS)
+        if source != cls._pii_regex_source:
+            guarded, other = [], []
+            for index, pattern in enumerate(source):
+                group = f"(?P<p{index}>{pattern})"
+                (guarded if pattern in cls._LEAD_IN_PATTERNS else other).append(group)
+            lead_ins = "|".join(re.escape(lead_in) for lead_in in cls.PII_LEAD_INS)
+            cls._pii_regexes = (
+                re.compile(f"(?={lead_ins})(?:{'|'.join(guarded)})") if guarded else None,
+                re.compile("|".join(other)) if other else None,
+            )
+            cls._pii_regex_source = source
+        return cls._pii_regexes
+
+    @classmethod
+    def _find_pii_pattern(cls, text: str) -> Optional[int]:
+        """Index of the leftmost PII pattern matching the lowercased text."""
+        guarded, other = cls._compiled_pii_regexes()
+        found = []
+        if guarded is not None:
+            starts = [start for start in map(text.find, cls.PII_LEAD_INS) if start >= 0]
+            if starts:
+                found.append(guarded.search(text, min(starts)))
+        if other is not None:
+            found.append(other.search(text))
+        # The leftmost match wins; at the same position, the first pattern in the list
+        matches = [(match.start(), int(match.lastgroup[1:])) for match in found if match]
+        return min(matches)[1] if matches else None
+
+    @staticmethod
+    def find_pii_request(text: str) -> Optional[str]:
+        """
+        Find which PII category the text is asking for, with a single scan.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Category of the first PII request found, or None
+        """
+        index = SecurityValidator._find_pii_pattern(text.lower())
+        return None if index is None else SecurityValidator.pii_category(index)
+
     @staticmethod
     def asks_for_pii(text: str) -> Tuple[bool, str]:
         """
@@ -81,13 +186,12 @@ class SecurityValidator:
         Returns:
             Tuple (bool, str): True if PII request found, matched pattern
         """
-        text_lower = text.lower()
+        index = SecurityValidator._find_pii_pattern(text.lower())
 
-        for pattern in SecurityValidator.PII_REQUEST_PATTERNS:
-            if re.search(pattern, text_lower):
-                return True, pattern
+        if index is None:
+            return False, ""
 
-        return False, ""
+        return True, SecurityValidator.PII_REQUEST_PATTERNS[index]
 
     @staticmethod
     def is_safe_response(text: str) -> Tuple[bool, str]:
@@ -109,3 +213,156 @@ class SecurityValidator:
             return False, f"Requests PII matching pattern: {pattern}"
 
         return True, "Safe"
+
+    @staticmethod
+    def incremental_scanner(window: Optional[int] = None) -> "IncrementalSafetyScanner":
+        """
+        Create a scanner that checks a streamed answer chunk by chunk.
+
+        Args:
+            window: Characters of already scanned text kept for matches spanning chunks
+
+        Returns:
+            New IncrementalSafetyScanner
+        """
+        return IncrementalSafetyScanner(window)
+
+    @staticmethod
+    def scan_stream(chunks: Iterable[str], window: Optional[int] = None) -> Tuple[bool, str]:
+        """
+        Check a streamed answer, stopping as soon as it turns unsafe.
+
+        The stream is closed when the scan ends (if it has a close() method), so an
+        unsafe answer does not keep generating.
+
+        Args:
+            chunks: Text fragments, e.g. a StreamingAnswer
+            window: Overlap window, see IncrementalSafetyScanner
+
+        Returns:
+            Tuple (bool, str): True if safe, reason if unsafe
+        """
+        scanner = IncrementalSafetyScanner(window)
+        try:
+            for chunk in chunks:
+                is_safe, reason = scanner.feed(chunk)
+                if not is_safe:
+                    logger.warning(f"Unsafe streamed answer, aborting: {reason}")
+                    return is_safe, reason
+            return scanner.finish()
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+
+class IncrementalSafetyScanner:
+    """
+    Incremental version of SecurityValidator.is_safe_response for streamed text.
+
+    Only complete words are scanned: the trailing partial word of each chunk is held
+    back until a non-word character (or finish()) arrives. Each scan covers the new
+    text plus the last `window` characters already scanned, so any match no longer than
+    the window is found even when it spans chunks; the bounded `.{0,50}` gaps of the
+    PII patterns need at most ~130 characters. Once unsafe, the result is final.
+
+    The reason lists the profanity found up to the point of detection, which may be
+    fewer words than is_safe_response reports for the complete answer.
+    """
+
+    DEFAULT_WINDOW = 256
+
+    def __init__(self, window: Optional[int] = None):
+        """
+        Initialize the scanner.
+
+        Args:
+            window: Characters of already scanned text kept as overlap
+                (defaults to DEFAULT_WINDOW)
+        """
+        self.window = window or self.DEFAULT_WINDOW
+        self.is_safe = True
+        self.reason = "Safe"
+        self.chars_received = 0
+        self.finished = False
+
+        self._tail = ""  # Lowercased overlap, starting at a word boundary
+        self._pending = ""  # Lowercased partial word not scanned yet
+
+    @property
+    def result(self) -> Tuple[bool, str]:
+        """Current verdict as (is_safe, reason)."""
+        return self.is_safe, self.reason
+
+    def feed(self, chunk: str) -> Tuple[bool, str]:
+        """
+        Scan the next chunk of the answer.
+
+        Args:
+            chunk: Text fragment
+
+        Returns:
+            Tuple (bool, str): False and the reason as soon as unsafe content is seen
+
+        Raises:
+            ValueError: If called after finish()
+        """
+        if self.finished:
+            raise ValueError("Scanner already finished")
+        self.chars_received += len(chunk)
+        if not self.is_safe:
+            return self.result
+
+        text = self._pending + chunk.lower()
+        boundary = _TRAILING_WORD_RE.search(text).start()
+        if boundary == 0:
+            self._pending = text
+            return self.result
+
+        self._scan(self._tail + text[:boundary])
+        self._pending = text[boundary:]
+        return self.result
+
+    def finish(self) -> Tuple[bool, str]:
+        """
+        Scan the held-back text at the end of the answer.
+
+        Returns:
+            Tuple (bool, str): Final verdict
+        """
+        if not self.finished:
+            self.finished = True
+            if self.is_safe and self._pending:
+                self._scan(self._tail + self._pending)
+            self._pending = ""
+        return self.result
+
+    def _scan(self, text: str):
+        """Check a window of lowercased text and keep its end as the next overlap."""
+        matcher = get_matcher(frozenset(SecurityValidator.PROFANITY_LIST), whole_words=True)
+        words = matcher.findall(text)
+        if words:
+            self._mark_unsafe(f"Contains profanity: {', '.join(words)}")
+            return
+
+        index = SecurityValidator._find_pii_pattern(text)
+        if index is not None:
+            pattern = SecurityValidator.PII_REQUEST_PATTERNS[index]
+            self._mark_unsafe(f"Requests PII matching pattern: {pattern}")
+            return
+
+        start = len(text) - self.window
+        if start <= 0:
+            self._tail = text
+            return
+        if not _NON_WORD_RE.match(text, start - 1):
+            # Start the overlap at a word boundary, so whole-word checks stay exact
+            separator = _NON_WORD_RE.search(text, start)
+            start = separator.end() if separator else len(text)
+        self._tail = text[start:]
+
+    def _mark_unsafe(self, reason: str):
+        self.is_safe = False
+        self.reason = reason
+        self._tail = ""
+        self._pending = ""
@@ -96,8 +96,10 @@ def main():
 
     # Save response
     print_section("Guardando Respuesta", "💾")
-    filepath = logger.save_response(question, response, scores)
-    print(f"✅ Respuesta guardada en: {filepath}")
+    ref = logger.save_response(question, response, scores)
+    # Con el escritor en segundo plano, espera a que la respuesta esté en disco
+    logger.flush()
+    print(f"✅ Respuesta guardada en: {ref or logger.log_dir}")
 
     # Logger summary
     summary = logger.get_summary()
@@ -106,6 +108,7 @@ def main():
     print(f"📁 Directorio de registros: {summary['log_directory']}")
 
     client.close()
+    logger.close()
 
     # Return exit code based on threshold
     if scores["passes_threshold"]:
@@ -7,8 +7,12 @@ import os
 
 import pytest
 
+from src.api.cassette import create_cassette
 from src.api.chatbot_client import ChatbotClient
 from src.api.chatbot_client_mock import ChatbotClientWithMock
+from src.api.local_server import LocalChatbotServer
+from src.api.response_cache import ResponseCache
+from src.utils.config import Config
 from src.validators.quality_scorer import QualityScorer
 
 # Configure logging
@@ -25,16 +29,55 @@ if USE_MOCK:
 
 
 @pytest.fixture(scope="session")
-def api_client():
+def response_cache():
+    """
+    Provee la caché de respuestas de la sesión, para consultar al LLM una sola vez por pregunta.
+
+    Se desactiva con RESPONSE_CACHE=false.
+    """
+    if not Config.RESPONSE_CACHE_ENABLED:
+        yield None
+        return
+
+    cache = ResponseCache()
+    yield cache
+    logger.info(f"Caché de respuestas: {cache.stats}")
+
+
+@pytest.fixture(scope="session")
+def cassette():
+    """
+    Provee el cassette de respuestas reales de la sesión, o None si está desactivado.
+
+    Con CASSETTE_MODE=record se graban las respuestas de la API; con
+    CASSETTE_MODE=replay la suite se ejecuta sin conexión contra ellas.
+    """
+    cassette = create_cassette()
+    if cassette is None:
+        yield None
+        return
+
+    yield cassette
+    logger.info(f"Cassette: {cassette.stats}")
+    cassette.close()
+
+
+@pytest.fixture(scope="session")
+def api_client(response_cache, cassette):
     """Provee una instancia de ChatbotClient para toda la sesión de pruebas."""
     if USE_MOCK:
-        client = ChatbotClientWithMock(use_mock=True)
+        client = ChatbotClientWithMock(use_mock=True, cache=response_cache)
         logger.info("Cliente inicializado en modo MOCK")
+    elif cassette is not None:
+        client = ChatbotClient(cache=response_cache, cassette=cassette)
+        logger.info(f"Cliente inicializado con cassette en modo {cassette.mode}")
     else:
-        client = ChatbotClient()
+        client = ChatbotClient(cache=response_cache)
         logger.info("Cliente inicializado con API real")
 
     yield client
+    if client.circuit_breaker is not None:
+        logger.info(f"Circuit breaker: {client.circuit_breaker.stats}")
     client.close()
 
 
@@ -54,3 +97,15 @@ def sample_question():
 def sample_response(api_client, sample_question):
     """Provee una respuesta de API de ejemplo para las pruebas."""
     return api_client.ask(sample_question)
+
+
+@pytest.fixture
+def stub_api():
+    """
+    Provee un servidor HTTP local que imita el contrato de la API del chatbot.
+
+    `stub_api.scripted` acepta tuplas (status, body) que se devuelven en orden
+    antes de la respuesta por defecto.
+    """
+    with LocalChatbotServer() as server:
+        yield server
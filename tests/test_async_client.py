@@ -0,0 +1,103 @@
+"""
+Pruebas del cliente asíncrono contra un servidor local.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.api.async_chatbot_client import AsyncChatbotClient
+
+
+async def _ask_many(url, questions, **kwargs):
+    async with AsyncChatbotClient(base_url=url, max_concurrency=4) as client:
+        return await client.ask_many(questions, **kwargs)
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Endpoint lento que cuenta las peticiones atendidas a la vez."""
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+        body = json.dumps({"answer": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def counting_api():
+    """Servidor local que registra el máximo de peticiones simultáneas."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.active = 0
+    server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05})
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/run"
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class TestAsyncChatbotClient:
+    """Prueba el cliente asíncrono y sus lotes concurrentes."""
+
+    def test_ask_many_preserves_order(self, stub_api):
+        """Prueba que los resultados lleguen en el orden de las preguntas."""
+        questions = [f"Pregunta {i}" for i in range(10)]
+        results = asyncio.run(_ask_many(stub_api.url, questions))
+
+        assert [r["question"] for r in results] == questions
+        assert all(r["status_code"] == 200 for r in results)
+        assert results[3]["data"]["answer"] == "Respuesta a: Pregunta 3"
+        assert set(results[0]) == {"data", "response_time", "status_code", "question"}
+
+    def test_retries_on_server_error(self, stub_api):
+        """Prueba que un 503 se reintente como en el cliente síncrono."""
+        stub_api.scripted.append((503, b""))
+        results = asyncio.run(_ask_many(stub_api.url, ["¿Qué es TDD?"]))
+
+        assert results[0]["status_code"] == 200
+        assert stub_api.request_count == 2
+
+    @pytest.mark.parametrize("body", [b"", b"   ", b"no es json", b"[1, 2]"])
+    def test_invalid_body_raises_value_error(self, stub_api, body):
+        """Prueba que cuerpos vacíos o inválidos se reporten como ValueError."""
+        stub_api.scripted.append((200, body))
+        results = asyncio.run(_ask_many(stub_api.url, ["Hola"], return_exceptions=True))
+
+        assert isinstance(results[0], ValueError)
+
+    @pytest.mark.parametrize("max_concurrency", [1, 3])
+    def test_in_flight_requests_never_exceed_limit(self, counting_api, max_concurrency):
+        """Prueba que nunca haya más de max_concurrency peticiones en vuelo."""
+
+        async def run():
+            async with AsyncChatbotClient(
+                base_url=counting_api.url, max_concurrency=max_concurrency, coalesce=False
+            ) as client:
+                return await client.ask_many([f"Pregunta {i}" for i in range(12)])
+
+        results = asyncio.run(run())
+
+        assert all(r["status_code"] == 200 for r in results)
+        assert counting_api.peak == max_concurrency
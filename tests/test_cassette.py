@@ -0,0 +1,135 @@
+"""
+Pruebas de la grabación y reproducción de respuestas (cassette).
+"""
+
+import time
+
+import pytest
+
+from src.api.cassette import Cassette, CassetteMissError, create_cassette
+from src.api.chatbot_client import ChatbotClient
+from src.api.local_server import LocalChatbotServer
+
+QUESTIONS = ["¿Qué es Python?", "¿Cómo uso pytest?", "¿Qué es\tun mock?\n"]
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    """Ruta de un cassette vacío en un directorio temporal."""
+    return tmp_path / "cassettes" / "chatbot.jsonl"
+
+
+def _record(path, questions=QUESTIONS):
+    """Graba las respuestas del servidor local a las preguntas dadas."""
+    with LocalChatbotServer() as server:
+        with Cassette(path, mode="record") as cassette:
+            with ChatbotClient(base_url=server.url, cassette=cassette) as client:
+                results = [client.ask(question) for question in questions]
+        return results, server.request_count
+
+
+class TestCassette:
+    """Prueba el almacenamiento y el índice del cassette."""
+
+    def test_put_and_get(self, cassette_path):
+        """Prueba que una respuesta grabada se recupere marcada como reproducida."""
+        result = {"data": {"answer": "Hola"}, "response_time": 0.2, "status_code": 200}
+        with Cassette(cassette_path, mode="auto") as cassette:
+            cassette.put("¿Hola?", dict(result, timings={"connect": 0.1}))
+            replayed = cassette.get("¿Hola?")
+
+        assert replayed == dict(result, is_replay=True)
+        assert "¿Hola?" in cassette
+        assert cassette.get("¿Adiós?") is None
+        assert cassette.stats["hits"] == 1
+        assert cassette.stats["misses"] == 1
+
+    def test_index_survives_reopen_and_keeps_last_recording(self, cassette_path):
+        """Prueba que al reabrir el archivo valga la última grabación de cada pregunta."""
+        with Cassette(cassette_path, mode="record") as cassette:
+            cassette.put("¿Hola?", {"data": {"answer": "primera"}})
+            cassette.put("¿Adiós?", {"data": {"answer": "adiós"}})
+            cassette.put("¿Hola?", {"data": {"answer": "segunda"}})
+
+        with Cassette(cassette_path, mode="replay") as cassette:
+            assert len(cassette) == 2
+            assert cassette.get("¿Hola?")["data"]["answer"] == "segunda"
+
+    def test_truncated_last_line_is_discarded(self, cassette_path):
+        """Prueba que una grabación interrumpida no impida abrir ni ampliar el cassette."""
+        with Cassette(cassette_path, mode="record") as cassette:
+            cassette.put("¿Hola?", {"data": {"answer": "Hola"}})
+        with open(cassette_path, "ab") as f:
+            f.write(b'0123456789abcdef0123456789abcdef\t{"question": "cort')
+
+        with Cassette(cassette_path, mode="auto") as cassette:
+            assert len(cassette) == 1
+            cassette.put("¿Adiós?", {"data": {"answer": "Adiós"}})
+
+        with Cassette(cassette_path, mode="replay") as cassette:
+            assert cassette.get("¿Adiós?")["data"]["answer"] == "Adiós"
+
+    def test_replay_requires_existing_file(self, cassette_path):
+        """Prueba que reproducir un cassette inexistente falle con un error claro."""
+        with pytest.raises(FileNotFoundError):
+            Cassette(cassette_path, mode="replay")
+
+    @pytest.mark.parametrize("mode", ["off", "rewind"])
+    def test_invalid_mode(self, cassette_path, mode):
+        """Prueba que se rechacen los modos no válidos."""
+        with pytest.raises(ValueError):
+            Cassette(cassette_path, mode=mode)
+
+    def test_off_mode_creates_nothing(self):
+        """Prueba que el modo off desactive el cassette."""
+        assert create_cassette("off") is None
+
+
+class TestClientCassette:
+    """Prueba la grabación con el cliente y la reproducción sin conexión."""
+
+    def test_replay_without_server(self, cassette_path):
+        """Prueba que las respuestas grabadas se sirvan con el servidor detenido."""
+        recorded, request_count = _record(cassette_path)
+        assert request_count == len(QUESTIONS)
+
+        with Cassette(cassette_path, mode="replay") as cassette:
+            with ChatbotClient(base_url="http://127.0.0.1:9", cassette=cassette) as client:
+                replayed = [client.ask(question) for question in QUESTIONS]
+
+        for original, result in zip(recorded, replayed):
+            assert result["data"] == original["data"]
+            assert result["response_time"] == original["response_time"]
+            assert result["is_replay"] is True
+
+    def test_replay_miss_raises(self, cassette_path):
+        """Prueba que una pregunta no grabada falle en modo replay sin llamar a la API."""
+        _record(cassette_path, QUESTIONS[:1])
+
+        with Cassette(cassette_path, mode="replay") as cassette:
+            with ChatbotClient(base_url="http://127.0.0.1:9", cassette=cassette) as client:
+                with pytest.raises(CassetteMissError):
+                    client.ask("¿Pregunta nueva?")
+
+    def test_auto_records_only_missing(self, cassette_path):
+        """Prueba que el modo auto solo consulte la API por las preguntas no grabadas."""
+        _record(cassette_path, QUESTIONS[:1])
+
+        with LocalChatbotServer() as server:
+            with Cassette(cassette_path, mode="auto") as cassette:
+                with ChatbotClient(base_url=server.url, cassette=cassette) as client:
+                    for question in QUESTIONS:
+                        client.ask(question)
+            assert server.request_count == len(QUESTIONS) - 1
+
+        assert cassette.stats["recorded"] == len(QUESTIONS) - 1
+
+    def test_simulated_latency(self, cassette_path):
+        """Prueba que la reproducción pueda esperar el tiempo de respuesta original."""
+        with Cassette(cassette_path, mode="record") as cassette:
+            cassette.put("¿Hola?", {"data": {"answer": "Hola"}, "response_time": 0.2})
+
+        with Cassette(cassette_path, mode="replay", simulate_latency=True) as cassette:
+            start = time.perf_counter()
+            cassette.fetch("¿Hola?", send=lambda: pytest.fail("No debe llamar a la API"))
+            assert time.perf_counter() - start >= 0.2
@@ -0,0 +1,224 @@
+"""
+Pruebas del cliente síncrono contra un servidor local.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.api import json_backend
+from src.api.chatbot_client import ChatbotClient
+from src.api.hedging import HedgePolicy
+from src.api.local_server import LocalChatbotServer
+from src.api.response_cache import ResponseCache
+
+
+class TestBatchClient:
+    """Prueba ask_batch() e iter_batch() contra un servidor local."""
+
+    def test_ask_batch_preserves_order(self, stub_api):
+        """Prueba que el modo ordenado respete el orden de las preguntas."""
+        questions = [f"Pregunta {i}" for i in range(12)]
+        with ChatbotClient(base_url=stub_api.url) as client:
+            results = client.ask_batch(questions, max_workers=4)
+
+        assert [r["question"] for r in results] == questions
+        assert stub_api.request_count == len(questions)
+
+    def test_iter_batch_yields_every_result(self, stub_api):
+        """Prueba que el iterador entregue todas las respuestas al terminar."""
+        questions = [f"Pregunta {i}" for i in range(6)]
+        with ChatbotClient(base_url=stub_api.url) as client:
+            results = list(client.iter_batch(questions, max_workers=3))
+            unordered = client.ask_batch(questions, max_workers=3, ordered=False)
+
+        assert sorted(r["question"] for r in results) == sorted(questions)
+        assert sorted(r["question"] for r in unordered) == sorted(questions)
+
+    def test_pool_grows_with_workers(self, stub_api):
+        """Prueba que el pool de conexiones se amplíe para cubrir a todos los hilos."""
+        with ChatbotClient(base_url=stub_api.url, pool_maxsize=2) as client:
+            client.ask_batch(["a", "b", "c"], max_workers=16)
+            adapter = client.session.get_adapter(stub_api.url)
+
+        assert client.pool_maxsize == 16
+        assert adapter._pool_maxsize == 16
+
+    def test_replaced_adapter_is_closed(self, stub_api):
+        """Prueba que al ampliar el pool se cierren las conexiones del adaptador anterior."""
+        with ChatbotClient(base_url=stub_api.url, pool_maxsize=2) as client:
+            client.ask("a")
+            old = client.session.get_adapter(stub_api.url)
+            client.ask_batch(["b", "c"], max_workers=8)
+
+            assert client.session.get_adapter(stub_api.url) is not old
+            assert not old.poolmanager.pools
+
+    def test_pool_grows_during_hedged_request(self):
+        """Prueba que ampliar el pool no impida enviar el respaldo de una petición en curso."""
+        delays = chain([0.5], repeat(0.0))
+        with LocalChatbotServer(latency=lambda rng: next(delays)) as server:
+            with ChatbotClient(
+                base_url=server.url, pool_maxsize=2, hedge=True, coalesce=False
+            ) as client:
+                client.hedge_policy = HedgePolicy(percentile=50, budget=1.0, min_samples=1)
+                client.hedge_policy.record_latency(0.1)
+                with ThreadPoolExecutor(max_workers=1) as caller:
+                    future = caller.submit(client.ask, "¿Qué es Python?")
+                    time.sleep(0.05)  # La petición original está en vuelo
+                    old_executor = client._hedge_executor
+                    client._prepare_pool(8)
+                    result = future.result()
+
+            assert server.request_count == 2
+
+        assert result["status_code"] == 200
+        assert client.hedge_policy.stats["hedge_wins"] == 1
+        assert old_executor._shutdown
+
+    def test_return_exceptions(self, stub_api):
+        """Prueba que los errores puedan devolverse en lugar de propagarse."""
+        stub_api.scripted.append((200, b"no es json"))
+        with ChatbotClient(base_url=stub_api.url) as client:
+            results = client.ask_batch(["a"], return_exceptions=True)
+            assert isinstance(results[0], ValueError)
+
+            stub_api.scripted.append((404, b""))
+            with pytest.raises(requests.exceptions.HTTPError):
+                client.ask_batch(["b"])
+
+
+class TestResponseCache:
+    """Prueba la caché de respuestas delante de ask()."""
+
+    def test_repeated_question_hits_api_once(self, stub_api):
+        """Prueba que una pregunta repetida solo llegue una vez a la API."""
+        cache = ResponseCache()
+        with ChatbotClient(base_url=stub_api.url, cache=cache) as client:
+            first = client.ask("¿Qué es TDD?")
+            first["data"]["answer"] = "modificada"
+            second = client.ask("¿Qué es TDD?")
+
+        assert stub_api.request_count == 1
+        assert second["data"]["answer"] == "Respuesta a: ¿Qué es TDD?"
+        assert cache.stats == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_opt_out_bypasses_cache(self, stub_api):
+        """Prueba que use_cache=False consulte siempre la API."""
+        # Sin circuit breaker, health_check siempre envía una petición real
+        with ChatbotClient(
+            base_url=stub_api.url, cache=ResponseCache(), circuit_breaker=False
+        ) as client:
+            client.ask("Hola")
+            client.ask("Hola", use_cache=False)
+            assert client.health_check()
+
+        assert stub_api.request_count == 3
+
+    def test_key_includes_endpoint(self, stub_api):
+        """Prueba que clientes con distinto endpoint no compartan respuestas."""
+        cache = ResponseCache()
+        with ChatbotClient(base_url=stub_api.url, cache=cache) as client:
+            client.ask("Hola")
+        with ChatbotClient(base_url=stub_api.url + "?v=2", cache=cache) as client:
+            client.ask("Hola")
+
+        assert stub_api.request_count == 2
+
+
+class TestPhaseTimings:
+    """Prueba los tiempos por fase opcionales del resultado de ask()."""
+
+    def test_disabled_by_default(self, stub_api):
+        """Prueba que sin activarlo el resultado no cambie ni se monten clases medidas."""
+        with ChatbotClient(base_url=stub_api.url, collect_timings=False) as client:
+            result = client.ask("Hola")
+            adapter = client.session.get_adapter(stub_api.url)
+
+        assert "timings" not in result
+        assert type(adapter) is HTTPAdapter
+
+    def test_phases_add_up(self):
+        """Prueba que conexión, primer byte y descarga reflejen la latencia del servidor."""
+        with LocalChatbotServer(latency=0.1, payload_size=200_000) as server:
+            with ChatbotClient(base_url=server.url, collect_timings=True) as client:
+                first = client.ask("Hola")["timings"]
+                second = client.ask("Hola")["timings"]
+
+        assert first["attempts"] == 1
+        assert first["connect"] > 0
+        assert second["connect"] == 0  # Conexión reutilizada del pool
+        assert 0.1 <= first["ttfb"] < 0.5
+        assert first["download"] >= 0
+        assert first["retry_wait"] == 0
+        assert first["connect"] + first["ttfb"] + first["download"] <= first["total"]
+
+    def test_retry_wait_and_attempts(self):
+        """Prueba que se cuenten los intentos y la espera indicada por Retry-After."""
+        with LocalChatbotServer(retry_after=1) as server:
+            server.scripted.append((503, b""))
+            with ChatbotClient(base_url=server.url, collect_timings=True) as client:
+                timings = client.ask("Hola")["timings"]
+
+        assert timings["attempts"] == 2
+        assert 1.0 <= timings["retry_wait"] < 1.5
+        assert timings["total"] >= timings["retry_wait"] + timings["ttfb"]
+
+
+def _response(body: bytes, content_type: str) -> requests.Response:
+    """Respuesta ya descargada, con la codificación que fijaría requests."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    return response
+
+
+class TestBodyParsing:
+    """Prueba la decodificación del cuerpo de las respuestas."""
+
+    def test_utf8_body_is_parsed_from_bytes(self):
+        """Prueba que un cuerpo JSON UTF-8 se pase en bytes, sin decodificar a str."""
+        response = _response('{"answer": "¿Qué es TDD?"}'.encode(), "application/json")
+        body = ChatbotClient._response_body(response)
+
+        assert isinstance(body, bytes)
+        assert ChatbotClient._parse_body(body) == {"answer": "¿Qué es TDD?"}
+
+    def test_declared_charset_is_respected(self):
+        """Prueba que un charset distinto de UTF-8 se decodifique con ese charset."""
+        response = _response(
+            '{"answer": "¿Qué?"}'.encode("latin-1"), "application/json; charset=latin-1"
+        )
+        assert ChatbotClient._parse_body(ChatbotClient._response_body(response)) == {
+            "answer": "¿Qué?"
+        }
+
+    @pytest.mark.parametrize("body", [b"", b"  \r\n\t ", "   "])
+    def test_blank_body_is_empty_response(self, body):
+        """Prueba que un cuerpo vacío o en blanco se reporte como respuesta vacía."""
+        with pytest.raises(ValueError, match="Respuesta vacía"):
+            ChatbotClient._parse_body(body)
+
+    def test_invalid_json_shows_decoded_preview(self):
+        """Prueba que el error muestre el inicio del cuerpo como texto."""
+        with pytest.raises(ValueError, match="Respuesta JSON inválida: <html>¡Error!"):
+            ChatbotClient._parse_body("<html>¡Error!</html>".encode())
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Prueba que sin orjson se use el módulo json estándar con el mismo resultado."""
+        body = '{"answer": "ñandú", "n": [1, 2.5, null]}'.encode()
+        expected = json_backend.loads(body)
+        monkeypatch.setattr(json_backend, "orjson", None)
+
+        assert json_backend.loads(body) == expected
+        assert json_backend.loads(body.decode()) == expected
+        with pytest.raises(ValueError):
+            json_backend.loads(b"{no es json")
@@ -0,0 +1,164 @@
+"""
+Pruebas del circuit breaker y del modo de fallo rápido de los clientes.
+"""
+
+import asyncio
+import time
+
+import pytest
+import requests
+
+from src.api.async_chatbot_client import AsyncChatbotClient
+from src.api.chatbot_client import ChatbotClient
+from src.api.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.config import Config
+
+
+def _fail():
+    raise requests.exceptions.ConnectionError("API caída")
+
+
+@pytest.fixture
+def no_retries(monkeypatch):
+    """Desactiva los reintentos para que los fallos lleguen al instante."""
+    monkeypatch.setattr(Config, "REQUEST_RETRY_COUNT", 0)
+
+
+class TestCircuitBreaker:
+    """Prueba las transiciones de estado del circuit breaker."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Prueba que se abra al alcanzar el umbral y falle sin llamar a la función."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        calls = []
+
+        for _ in range(3):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                breaker.call(lambda: calls.append(1) or _fail())
+        assert breaker.state == "open"
+
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.call(lambda: calls.append(1))
+        assert len(calls) == 3
+        assert 0 < excinfo.value.retry_in <= 60
+        assert breaker.stats["rejected"] == 1
+        assert breaker.stats["times_opened"] == 1
+
+    def test_success_resets_consecutive_failures(self):
+        """Prueba que los fallos tengan que ser seguidos para abrir el circuito."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_fail)
+        assert breaker.call(lambda: "ok") == "ok"
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_fail)
+
+        assert breaker.state == "closed"
+        assert breaker.stats["failures"] == 2
+
+    def test_half_open_probe_closes_circuit(self):
+        """Prueba que tras el enfriamiento una llamada con éxito cierre el circuito."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_fail)
+        time.sleep(0.06)
+
+        assert breaker.state == "half_open"
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_failure_reopens(self):
+        """Prueba que si la prueba falla el circuito se abra otro periodo completo."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_fail)
+        time.sleep(0.06)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_fail)
+
+        assert breaker.state == "open"
+        assert breaker.stats["times_opened"] == 2
+
+    def test_single_probe_while_half_open(self):
+        """Prueba que mientras hay una prueba en curso el resto siga fallando al instante."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+
+        breaker.before_call()  # La prueba queda en curso
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record()
+        assert breaker.state == "closed"
+
+    def test_filtered_errors_do_not_count(self):
+        """Prueba que los errores que no indican caída no abran el circuito."""
+        breaker = CircuitBreaker(failure_threshold=1, is_failure=lambda e: False)
+        with pytest.raises(ValueError):
+            breaker.call(lambda: int("no es un número"))
+
+        assert breaker.state == "closed"
+        assert breaker.stats["successes"] == 1
+
+
+class TestClientFastFail:
+    """Prueba el circuit breaker integrado en los clientes contra el servidor local."""
+
+    def test_sync_client_fails_fast_and_recovers(self, stub_api, no_retries):
+        """Prueba que tras los fallos no se envíen peticiones hasta el enfriamiento."""
+        stub_api.scripted.extend([(500, b""), (502, b"")])
+        with ChatbotClient(base_url=stub_api.url) as client:
+            client.circuit_breaker = CircuitBreaker(
+                failure_threshold=2,
+                recovery_timeout=0.1,
+                is_failure=client._is_service_failure,
+            )
+            for question in ("a", "b"):
+                with pytest.raises(requests.exceptions.RequestException):
+                    client.ask(question)
+
+            with pytest.raises(CircuitOpenError):
+                client.ask("c")
+            assert not client.health_check()
+            assert stub_api.request_count == 2
+
+            time.sleep(0.1)
+            assert client.ask("d")["status_code"] == 200
+            assert client.health_check()  # Éxito reciente: no envía "test"
+
+        assert stub_api.request_count == 3
+        assert client.circuit_breaker.stats["state"] == "closed"
+
+    def test_invalid_response_does_not_open_circuit(self, stub_api):
+        """Prueba que una respuesta inválida cuente como API disponible."""
+        stub_api.scripted.extend([(200, b"no es json")] * 3 + [(404, b"")])
+        with ChatbotClient(base_url=stub_api.url) as client:
+            client.circuit_breaker.failure_threshold = 1
+            for _ in range(3):
+                with pytest.raises(ValueError):
+                    client.ask("Hola")
+            with pytest.raises(requests.exceptions.HTTPError):
+                client.ask("Hola")
+
+        assert client.circuit_breaker.state == "closed"
+
+    def test_async_client_fails_fast(self, stub_api, no_retries):
+        """Prueba el fallo rápido del cliente asíncrono."""
+        stub_api.scripted.extend([(503, b"")] * 2)
+
+        async def run():
+            async with AsyncChatbotClient(base_url=stub_api.url) as client:
+                client.circuit_breaker.failure_threshold = 2
+                errors = []
+                for question in ("a", "b", "c"):
+                    try:
+                        await client.ask(question)
+                    except Exception as e:
+                        errors.append(e)
+                return errors, await client.health_check(), client.circuit_breaker
+
+        errors, healthy, breaker = asyncio.run(run())
+
+        assert isinstance(errors[-1], CircuitOpenError)
+        assert not healthy
+        assert stub_api.request_count == 2
+        assert breaker.is_open
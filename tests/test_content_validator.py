@@ -0,0 +1,59 @@
+"""
+Pruebas unitarias del validador de contenido, sin llamar a la API.
+"""
+
+import pytest
+
+from src.validators import content_validator
+from src.validators.content_validator import ContentValidator
+
+ANSWER = (
+    "Usa Pytest o unittest. Un Unit test con TDD:\n\n"
+    "```python\ndef test_suma():\n    assert suma(1, 1) == 2\n```\n\n"
+    "En CI/CD mide la coverage y ejecuta la Robot Framework suite."
+)
+
+
+class TestContentValidator:
+    """Prueba el análisis de contenido con patrones precompilados."""
+
+    def test_keywords_use_substring_semantics(self):
+        """Prueba que 'unittest' cuente también 'unit' y 'test'."""
+        assert ContentValidator.count_testing_keywords("unittest") == 3
+
+    def test_frameworks_are_case_insensitive(self):
+        """Prueba que los frameworks se detecten sin importar mayúsculas."""
+        found = ContentValidator.mentions_frameworks("Prefiero PyTest y Robot Framework")
+        assert sorted(found) == ["pytest", "robot framework"]
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("sin código aquí", False),
+            ("usa `pytest -k`", True),
+            ("@pytest.fixture", True),
+            ("from os import path", True),
+            ("self.assertEqual", True),
+        ],
+    )
+    def test_code_examples(self, text, expected):
+        """Prueba la detección de ejemplos de código."""
+        assert ContentValidator.contains_code_examples(text) is expected
+
+    def test_details_match_individual_checks(self):
+        """Prueba que el análisis en una pasada coincida con cada chequeo por separado."""
+        details = ContentValidator.get_content_details(ANSWER)
+
+        assert details["has_code_examples"] == ContentValidator.contains_code_examples(ANSWER)
+        assert details["keyword_count"] == ContentValidator.count_testing_keywords(ANSWER)
+        assert details["frameworks_mentioned"] == ContentValidator.mentions_frameworks(ANSWER)
+        assert details["has_structure"] == ContentValidator.has_structured_content(ANSWER)
+        assert details["content_score"] == ContentValidator.calculate_content_score(ANSWER)
+
+    def test_matchers_are_built_once(self, monkeypatch):
+        """Prueba que los chequeos no compilen ni busquen un matcher en cada llamada."""
+        monkeypatch.setattr(content_validator, "get_matcher", lambda *a, **k: pytest.fail())
+
+        assert ContentValidator.count_testing_keywords("unittest") == 3
+        assert ContentValidator.mentions_frameworks("jest") == ["jest"]
+        assert ContentValidator.get_content_details(ANSWER)["keyword_count"] > 0
@@ -0,0 +1,111 @@
+"""
+Pruebas de la caché persistente de embeddings.
+"""
+
+import numpy as np
+
+from src.utils.embedding_cache import EmbeddingCache
+from src.validators.quality_scorer import QualityScorer
+
+
+class _CountingModel:
+    """Modelo falso que cuenta cuántos textos codifica."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        self.encoded.extend(texts)
+        return np.array([[len(t), 1.0, 0.5] for t in texts], dtype=np.float64)
+
+
+class TestEmbeddingCache:
+    """Prueba los niveles en memoria y en disco de la caché."""
+
+    def test_roundtrip_survives_reopen(self, tmp_path):
+        """Prueba que los vectores persistan en disco entre instancias."""
+        cache = EmbeddingCache("modelo/prueba", cache_dir=tmp_path, max_entries=4)
+        cache.put("hola", np.array([1.0, 2.0, 3.0]))
+        cache.close()
+
+        reopened = EmbeddingCache("modelo/prueba", cache_dir=tmp_path, max_entries=4)
+        vector = reopened.get("hola")
+
+        assert vector.dtype == np.float32
+        assert vector.tolist() == [1.0, 2.0, 3.0]
+        assert reopened.get("adiós") is None
+
+    def test_key_depends_on_model(self, tmp_path):
+        """Prueba que el mismo texto con otro modelo tenga otra clave."""
+        a = EmbeddingCache("modelo-a", cache_dir=tmp_path)
+        b = EmbeddingCache("modelo-b", cache_dir=tmp_path)
+        assert a.key("texto") != b.key("texto")
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Prueba que al llenarse se reemplace la entrada menos usada."""
+        cache = EmbeddingCache("m", cache_dir=tmp_path, max_entries=2, memory_entries=1)
+        cache.put("a", np.zeros(2))
+        cache.put("b", np.ones(2))
+        cache.get("a")
+        cache.put("c", np.full(2, 2.0))
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_shrinking_keeps_newest_entries(self, tmp_path):
+        """Prueba que reducir el tamaño conserve las entradas más recientes."""
+        cache = EmbeddingCache("m", cache_dir=tmp_path, max_entries=3)
+        for text in ("a", "b", "c"):
+            cache.put(text, np.zeros(2))
+        cache.close()
+
+        smaller = EmbeddingCache("m", cache_dir=tmp_path, max_entries=2)
+        assert len(smaller) == 2
+        assert smaller.get("c") is not None
+
+    def test_second_instance_does_not_share_the_file(self, tmp_path):
+        """Prueba que dos instancias sobre el mismo archivo no se pisen los vectores."""
+        a = EmbeddingCache("m", cache_dir=tmp_path, max_entries=1, memory_entries=1)
+        b = EmbeddingCache("m", cache_dir=tmp_path, max_entries=1, memory_entries=1)
+        a.put("alpha", np.array([1.0, 0.0, 0.0]))
+        b.put("beta", np.array([0.0, 1.0, 0.0]))
+        a.put("gamma", np.array([0.0, 0.0, 1.0]))  # Saca alpha del nivel en memoria
+
+        assert a.stats["disk_enabled"] and not b.stats["disk_enabled"]
+        assert a.get("alpha") is None
+        assert a.get("gamma").tolist() == [0.0, 0.0, 1.0]
+        assert b.get("beta").tolist() == [0.0, 1.0, 0.0]
+
+        a.close()
+        reopened = EmbeddingCache("m", cache_dir=tmp_path, max_entries=1, memory_entries=1)
+        assert reopened.stats["disk_enabled"]
+        assert reopened.get("gamma").tolist() == [0.0, 0.0, 1.0]
+
+    def test_reused_slot_is_a_miss(self, tmp_path):
+        """Prueba que una ranura con otra clave no devuelva el vector ajeno."""
+        cache = EmbeddingCache("m", cache_dir=tmp_path, max_entries=2, memory_entries=1)
+        cache.put("alpha", np.array([1.0, 0.0]))
+        cache.put("beta", np.array([0.0, 1.0]))
+        slot = cache._slots[cache.key("alpha")]
+        cache._table[slot]["key"] = cache.key("otro").encode("ascii")
+
+        assert cache.get("alpha") is None
+        assert cache.get("beta").tolist() == [0.0, 1.0]
+
+
+class TestScorerEncoding:
+    """Prueba que QualityScorer solo codifique textos nuevos."""
+
+    def test_only_new_texts_are_encoded(self, tmp_path):
+        """Prueba que los textos repetidos salgan de la caché."""
+        scorer = QualityScorer(embedding_cache=EmbeddingCache("m", cache_dir=tmp_path))
+        scorer._model = _CountingModel()
+
+        first = scorer.encode(["pregunta", "respuesta", "pregunta"])
+        second = scorer.encode(["pregunta", "otra respuesta"])
+
+        assert scorer._model.encoded == ["pregunta", "respuesta", "otra respuesta"]
+        assert first.shape == (3, 3)
+        assert np.array_equal(first[0], second[0])
@@ -0,0 +1,211 @@
+"""
+Pruebas de las peticiones de respaldo (hedging).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
+
+import pytest
+
+from src.api import chatbot_client
+from src.api.async_chatbot_client import AsyncChatbotClient
+from src.api.chatbot_client import ChatbotClient
+from src.api.hedging import HedgePolicy, run_hedged, run_hedged_async
+from src.api.local_server import LocalChatbotServer
+
+
+def _policy(delay: float = 0.05, budget: float = 1.0) -> HedgePolicy:
+    """Política lista para enviar respaldos tras `delay` segundos."""
+    policy = HedgePolicy(percentile=50, budget=budget, min_samples=1)
+    policy.record_latency(delay)
+    return policy
+
+
+def _slow_then_fast(slow: float = 0.5):
+    """Función cuya primera llamada tarda `slow` segundos y las demás responden al instante."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(slow if len(calls) == 1 else 0)
+        return {"attempt": len(calls), "response_time": 0.01}
+
+    return fn, calls
+
+
+class TestHedgePolicy:
+    """Prueba la espera y el presupuesto de la política."""
+
+    def test_no_delay_until_enough_samples(self):
+        """Prueba que no se envíen respaldos sin latencias de referencia."""
+        policy = HedgePolicy(percentile=90, min_samples=3)
+        policy.record_latency(0.1)
+        assert policy.delay() is None
+
+        for latency in (0.2, 0.3, 1.0):
+            policy.record_latency(latency)
+        assert policy.delay() == 1.0  # p90 de 4 muestras
+
+    def test_budget_caps_extra_load(self):
+        """Prueba que los respaldos no superen la fracción de peticiones configurada."""
+        policy = HedgePolicy(percentile=95, budget=0.5)
+        for _ in range(4):
+            policy.start_request()
+
+        assert [policy.allow_hedge() for _ in range(3)] == [True, True, False]
+        assert policy.stats["hedges"] == 2
+        assert policy.stats["budget_denied"] == 1
+
+    @pytest.mark.parametrize("percentile, budget", [(0, 0.1), (100, 0.1), (95, -1)])
+    def test_invalid_parameters(self, percentile, budget):
+        """Prueba que se rechacen percentiles y presupuestos fuera de rango."""
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=percentile, budget=budget)
+
+
+class TestRunHedged:
+    """Prueba la ejecución con respaldo usando funciones locales."""
+
+    def test_hedge_wins_against_straggler(self):
+        """Prueba que un respaldo rápido gane a la petición original lenta."""
+        policy = _policy()
+        fn, calls = _slow_then_fast()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            start = time.perf_counter()
+            result = run_hedged(executor, fn, policy)
+            elapsed = time.perf_counter() - start
+
+        assert result["attempt"] == 2
+        assert elapsed < 0.4
+        assert policy.stats["hedge_wins"] == 1
+        assert policy.stats["win_rate"] == 1.0
+
+    def test_fast_request_is_not_hedged(self):
+        """Prueba que una respuesta antes de la espera no genere respaldo."""
+        policy = _policy(delay=0.5)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = run_hedged(executor, lambda: "ok", policy)
+
+        assert result == "ok"
+        assert policy.stats["hedges"] == 0
+
+    def test_budget_exhausted_waits_for_original(self):
+        """Prueba que sin presupuesto se espere a la petición original."""
+        policy = _policy(budget=0)
+        fn, calls = _slow_then_fast(slow=0.1)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert run_hedged(executor, fn, policy)["attempt"] == 1
+
+        assert len(calls) == 1
+        assert policy.stats["budget_denied"] == 1
+
+    def test_all_attempts_fail(self):
+        """Prueba que si todos los intentos fallan se propague el error."""
+        policy = _policy(delay=0.01)
+
+        def fail():
+            time.sleep(0.05)
+            raise ConnectionError("API caída")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with pytest.raises(ConnectionError):
+                run_hedged(executor, fail, policy)
+        assert policy.stats["hedges"] == 1
+
+    def test_async_loser_is_cancelled(self):
+        """Prueba que en asyncio el intento perdedor se cancele."""
+        policy = _policy()
+        cancelled = []
+
+        async def attempt(number):
+            try:
+                await asyncio.sleep(0.5 if number == 1 else 0)
+                return number
+            except asyncio.CancelledError:
+                cancelled.append(number)
+                raise
+
+        numbers = iter([1, 2])
+
+        async def run():
+            result = await run_hedged_async(lambda: attempt(next(numbers)), policy)
+            await asyncio.sleep(0)  # Deja que se procese la cancelación
+            return result
+
+        assert asyncio.run(run()) == 2
+        assert cancelled == [1]
+        assert policy.stats["hedge_wins"] == 1
+
+
+class TestClientHedging:
+    """Prueba el hedging integrado en los clientes contra el servidor local."""
+
+    def test_disabled_by_default(self):
+        """Prueba que el hedging sea opcional."""
+        client = ChatbotClient(base_url="http://localhost")
+        assert client.hedge_policy is None
+        client.close()
+
+    def test_sync_client_hedges_slow_request(self):
+        """Prueba que el cliente síncrono use la respuesta del respaldo."""
+        delays = chain([0.5], repeat(0.0))
+        with LocalChatbotServer(latency=lambda rng: next(delays)) as server:
+            with ChatbotClient(base_url=server.url, hedge=True, coalesce=False) as client:
+                client.hedge_policy = _policy()
+                start = time.perf_counter()
+                result = client.ask("¿Qué es Python?")
+                elapsed = time.perf_counter() - start
+
+            assert server.request_count == 2
+
+        assert result["data"]["answer"] == "Respuesta a: ¿Qué es Python?"
+        assert elapsed < 0.4
+        assert client.hedge_policy.stats["hedge_wins"] == 1
+
+    def test_async_client_hedges_slow_request(self):
+        """Prueba que el cliente asíncrono use la respuesta del respaldo."""
+        delays = chain([0.5], repeat(0.0))
+
+        async def run(url):
+            async with AsyncChatbotClient(base_url=url, hedge=True, coalesce=False) as client:
+                client.hedge_policy = _policy()
+                return await client.ask("¿Qué es Python?"), client.hedge_policy
+
+        with LocalChatbotServer(latency=lambda rng: next(delays)) as server:
+            start = time.perf_counter()
+            result, policy = asyncio.run(run(server.url))
+            elapsed = time.perf_counter() - start
+
+        assert result["status_code"] == 200
+        assert elapsed < 0.4
+        assert policy.stats["hedge_wins"] == 1
+
+    def test_hedge_executor_is_created_once(self, monkeypatch):
+        """Prueba que hilos concurrentes compartan un único executor de respaldos."""
+        created = []
+
+        class SlowExecutor(ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                if kwargs.get("thread_name_prefix") == "hedge":
+                    created.append(self)
+                    time.sleep(0.05)  # Ensancha la ventana de la condición de carrera
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(chatbot_client, "ThreadPoolExecutor", SlowExecutor)
+        with LocalChatbotServer() as server:
+            with ChatbotClient(base_url=server.url, hedge=True, coalesce=False) as client:
+                threads = [
+                    threading.Thread(
+                        target=client.ask, args=(f"¿{n}?",), kwargs={"use_cache": False}
+                    )
+                    for n in range(8)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        assert len(created) == 1
@@ -0,0 +1,138 @@
+"""
+Pruebas del generador de carga, sin llamar a la API real.
+"""
+
+import time
+
+import pytest
+import requests
+
+from src.api.chatbot_client import ChatbotClient
+from src.utils.load_test import (
+    LoadStage,
+    LoadTester,
+    Sample,
+    classify_error,
+    save_report,
+    summarize,
+)
+
+
+def _sleepy_send(delay):
+    def send(question):
+        time.sleep(delay)
+        if question == "falla":
+            raise ValueError("respuesta inválida")
+
+    return send
+
+
+class TestSummarize:
+    """Prueba el cálculo de métricas de una ejecución."""
+
+    def test_percentiles_and_error_rate(self):
+        """Prueba percentiles, throughput y tasa de errores."""
+        samples = [Sample(stage=0, scheduled=i, latency=(i + 1) / 100) for i in range(100)]
+        samples[0].error = "ValueError"
+
+        metrics = summarize(samples, duration=10.0)
+
+        assert metrics["requests"] == 100
+        assert metrics["error_rate"] == pytest.approx(0.01)
+        assert metrics["throughput"] == pytest.approx(9.9)
+        assert metrics["latency"]["p50"] == pytest.approx(0.505)
+        assert metrics["latency"]["max"] == pytest.approx(1.0)
+        assert metrics["errors_by_type"] == {"ValueError": 1}
+
+    def test_empty_samples(self):
+        """Prueba que una etapa sin peticiones no falle."""
+        metrics = summarize([], duration=1.0)
+        assert metrics["requests"] == 0
+        assert metrics["latency"]["p99"] is None
+
+
+class TestLoadTester:
+    """Prueba los modos de carga en lazo abierto y cerrado."""
+
+    def test_closed_loop_keeps_concurrency(self):
+        """Prueba que el lazo cerrado mantenga N peticiones en vuelo."""
+        tester = LoadTester(_sleepy_send(0.02), ["a"])
+        result = tester.run([LoadStage(duration=0.4, concurrency=4)], mode="closed")
+
+        # 4 trabajadores durante 0.4s con 20ms por petición: ~80 peticiones
+        assert 50 <= len(result.samples) <= 90
+        assert result.summary()["overall"]["errors"] == 0
+
+    def test_open_loop_ramp_up(self):
+        """Prueba que cada etapa del lazo abierto genere su tasa de llegadas."""
+        tester = LoadTester(_sleepy_send(0.001), ["a", "falla"])
+        stages = [LoadStage(duration=0.5, rate=20), LoadStage(duration=0.5, rate=40)]
+        summary = tester.run(stages, mode="open").summary()
+
+        assert [stage["requests"] for stage in summary["per_stage"]] == [10, 20]
+        assert summary["overall"]["error_rate"] == pytest.approx(0.5)
+
+    def test_open_loop_counts_queueing_delay(self):
+        """Prueba que la latencia incluya la espera cuando no hay hilos libres."""
+        tester = LoadTester(_sleepy_send(0.05), ["a"], max_workers=1)
+        result = tester.run([LoadStage(duration=0.2, rate=50)], mode="open")
+
+        # 10 llegadas cada 20ms servidas de una en una a 50ms: la última espera ~0.3s
+        assert max(s.latency for s in result.samples) > 0.25
+
+    def test_open_loop_stages_do_not_wait_for_each_other(self):
+        """Prueba que una etapa no retrase las llegadas de la siguiente."""
+        tester = LoadTester(_sleepy_send(0.3), ["a"])
+        stages = [LoadStage(duration=0.6, rate=10), LoadStage(duration=0.6, rate=10)]
+        summary = tester.run(stages, mode="open").summary()
+
+        # Con un servidor de 0.3s constantes, el p99 de cada etapa se queda en ~0.3s
+        for stage in summary["per_stage"]:
+            assert stage["latency"]["p99"] == pytest.approx(0.3, abs=0.08)
+
+    @pytest.mark.parametrize(
+        "mode, stage",
+        [
+            ("open", LoadStage(duration=1, concurrency=2)),
+            ("closed", LoadStage(duration=1, rate=5)),
+            ("closed", LoadStage(duration=0, concurrency=2)),
+            ("burst", LoadStage(duration=1, rate=5)),
+        ],
+    )
+    def test_invalid_profile(self, mode, stage):
+        """Prueba que los perfiles inconsistentes se rechacen."""
+        with pytest.raises(ValueError):
+            LoadTester(_sleepy_send(0), ["a"]).run([stage], mode=mode)
+
+    def test_against_local_server(self, stub_api, tmp_path):
+        """Prueba una ejecución completa contra el servidor local y su reporte JSON."""
+        stub_api.scripted.append((404, b""))
+        with ChatbotClient(base_url=stub_api.url, pool_maxsize=2, coalesce=False) as client:
+            tester = LoadTester(client.ask, ["¿Qué es TDD?"])
+            result = tester.run([LoadStage(duration=0.3, concurrency=2)])
+
+        summary = result.summary()
+        assert summary["overall"]["errors_by_type"] == {"http_404": 1}
+        assert "phases_mean" not in summary["overall"]
+        assert save_report(summary, tmp_path / "report.json").exists()
+
+
+class TestClassifyError:
+    """Prueba los nombres usados para agrupar errores."""
+
+    def test_http_and_generic_errors(self):
+        """Prueba que los errores HTTP se agrupen por código y el resto por clase."""
+        response = requests.Response()
+        response.status_code = 503
+        assert classify_error(requests.exceptions.HTTPError(response=response)) == "http_503"
+        assert classify_error(TimeoutError()) == "TimeoutError"
+
+    def test_phase_timings_are_averaged(self, stub_api):
+        """Prueba que los tiempos por fase del cliente se promedien en el reporte."""
+        with ChatbotClient(base_url=stub_api.url, collect_timings=True) as client:
+            tester = LoadTester(client.ask, ["¿Qué es TDD?"])
+            result = tester.run([LoadStage(duration=0.2, concurrency=1)])
+
+        phases = result.summary()["overall"]["phases_mean"]
+        assert phases["attempts"] == 1
+        assert set(phases) >= {"connect", "ttfb", "download", "retry_wait"}
@@ -0,0 +1,96 @@
+"""
+Pruebas del servidor local que imita la API del chatbot.
+"""
+
+import random
+
+import pytest
+import requests
+
+from src.api.chatbot_client import ChatbotClient
+from src.api.local_server import LocalChatbotServer, parse_latency
+
+
+class TestParseLatency:
+    """Prueba las especificaciones de distribuciones de latencia."""
+
+    @pytest.mark.parametrize(
+        "spec, low, high",
+        [
+            ("fixed:0.05", 0.05, 0.05),
+            ("uniform:0.01,0.02", 0.01, 0.02),
+            ("normal:0.1,0.01", 0.0, 1.0),
+            ("lognormal:0.1,0.5", 0.0, 10.0),
+            ("exponential:0.1", 0.0, 10.0),
+            (0, 0.0, 0.0),
+        ],
+    )
+    def test_samples_within_range(self, spec, low, high):
+        """Prueba que cada distribución genere valores no negativos en su rango."""
+        sampler = parse_latency(spec)
+        rng = random.Random(1)
+        assert all(low <= sampler(rng) <= high for _ in range(100))
+
+    @pytest.mark.parametrize("spec", ["gamma:1", "uniform:0.1", "fixed:-1", "fixed:x"])
+    def test_invalid_spec(self, spec):
+        """Prueba que las especificaciones inválidas se rechacen."""
+        with pytest.raises(ValueError):
+            parse_latency(spec)
+
+
+class TestLocalChatbotServer:
+    """Prueba el servidor local con el cliente real."""
+
+    def test_answers_with_api_contract(self):
+        """Prueba que responda {"answer": ...} con el tamaño solicitado."""
+        with LocalChatbotServer(payload_size=500) as server:
+            with ChatbotClient(base_url=server.url) as client:
+                result = client.ask("¿Qué es TDD?")
+
+        assert result["status_code"] == 200
+        assert result["data"]["answer"].startswith("Respuesta a: ¿Qué es TDD?")
+        assert len(result["data"]["answer"]) == 500
+
+    def test_error_rates_are_injected(self):
+        """Prueba que las tasas de error produzcan los fallos configurados."""
+        with LocalChatbotServer(error_rates={"invalid_json": 1.0}) as server:
+            with ChatbotClient(base_url=server.url) as client:
+                with pytest.raises(ValueError):
+                    client.ask("Hola")
+
+        assert server.stats == {"invalid_json": 1}
+
+    def test_retry_after_is_sent(self):
+        """Prueba que los 429 incluyan Retry-After cuando se configura."""
+        with LocalChatbotServer(error_rates={"429": 1.0}, retry_after=0) as server:
+            response = requests.post(server.url, json={"question": "Hola"})
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "0"
+
+    def test_rejects_malformed_request(self):
+        """Prueba que una petición sin pregunta reciba un 400."""
+        with LocalChatbotServer() as server:
+            response = requests.post(server.url, data=b"no es json")
+
+        assert response.status_code == 400
+        assert server.stats == {"bad_request": 1}
+
+    def test_seeded_faults_are_reproducible(self):
+        """Prueba que la misma semilla produzca la misma secuencia de fallos."""
+        outcomes = []
+        for _ in range(2):
+            with LocalChatbotServer(error_rates={"500": 0.3, "empty": 0.3}, seed=7) as server:
+                with requests.Session() as session:
+                    for i in range(20):
+                        session.post(server.url, json={"question": f"P{i}"})
+                outcomes.append(server.stats)
+
+        assert outcomes[0] == outcomes[1]
+        assert sum(outcomes[0].values()) == 20
+
+    @pytest.mark.parametrize("rates", [{"418": 0.1}, {"500": 0.7, "503": 0.4}, {"429": -0.1}])
+    def test_invalid_error_rates(self, rates):
+        """Prueba que se rechacen tipos de error desconocidos o tasas inválidas."""
+        with pytest.raises(ValueError):
+            LocalChatbotServer(error_rates=rates)
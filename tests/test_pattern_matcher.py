@@ -0,0 +1,66 @@
+"""
+Pruebas del matcher multi-patrón compartido por los validadores.
+"""
+
+import random
+import re
+
+import pytest
+
+from src.validators.pattern_matcher import MultiPatternMatcher
+from src.validators.security_validator import SecurityValidator
+
+
+@pytest.fixture
+def automaton(monkeypatch):
+    """Fuerza el modo autómata aunque el vocabulario sea pequeño."""
+    monkeypatch.setattr(MultiPatternMatcher, "AUTOMATON_MIN_TERMS", 1)
+
+
+class TestSubstringSemantics:
+    """Prueba la semántica de subcadena (como `term in text`)."""
+
+    def test_overlapping_terms(self, automaton):
+        """Prueba términos solapados que no se contienen entre sí."""
+        matcher = MultiPatternMatcher(["abc", "bcd", "cde", "b", "xyz"])
+        assert matcher.find("zabcdez") == {"abc", "bcd", "cde", "b"}
+
+    def test_automaton_matches_naive_search(self, automaton):
+        """Prueba que el autómata coincida con la búsqueda término a término."""
+        rng = random.Random(7)
+        for _ in range(200):
+            terms = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 5))) for _ in range(8)}
+            matcher = MultiPatternMatcher(terms)
+            text = "".join(rng.choice("abcd") for _ in range(40))
+            assert matcher.find(text) == {term for term in terms if term in text}
+
+    def test_findall_requires_whole_words(self):
+        """Prueba que findall() solo exista para palabras completas."""
+        with pytest.raises(ValueError):
+            MultiPatternMatcher(["test"]).findall("test")
+
+
+class TestWholeWordSemantics:
+    """Prueba la semántica de palabras completas usada para groserías."""
+
+    def test_matches_tokens_in_order(self):
+        """Prueba que se repitan las apariciones en orden y se ignoren subpalabras."""
+        matcher = MultiPatternMatcher(["idiot", "coño"], whole_words=True)
+        assert matcher.findall("idiot, idiota... ¡coño! idiot") == ["idiot", "coño", "idiot"]
+
+    def test_multi_word_terms(self):
+        """Prueba términos de varias palabras con límites de palabra."""
+        matcher = MultiPatternMatcher(["robot framework", "robot"], whole_words=True)
+        assert matcher.findall("robot framework y robots") == ["robot", "robot framework"]
+        assert matcher.find("robot frameworks") == {"robot"}
+
+    def test_profanity_matches_token_comparison(self):
+        """Prueba que contains_profanity conserve la comparación por tokens."""
+        text = "Eres un Estúpido IDIOT, no un idiota-idiot: mierda."
+        tokens = re.findall(r"\b\w+\b", text.lower())
+        expected = [word for word in tokens if word in SecurityValidator.PROFANITY_LIST]
+
+        has_profanity, found = SecurityValidator.contains_profanity(text)
+
+        assert has_profanity
+        assert found == expected == ["estúpido", "idiot", "idiota", "idiot", "mierda"]
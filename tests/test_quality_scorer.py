@@ -0,0 +1,112 @@
+"""
+Pruebas del puntaje de calidad sin depender de la API ni del modelo real.
+"""
+
+import numpy as np
+import pytest
+
+from src.validators.content_validator import ContentValidator
+from src.validators.quality_scorer import QualityScorer
+
+ANSWER = (
+    "Para escribir tests unitarios en Python usa pytest o unittest.\n\n"
+    "1) Crea funciones test_ con assert.\n2) Usa fixtures y mock.\n\n"
+    "```python\ndef test_suma():\n    assert 1 + 1 == 2\n```\n\n"
+    "Integra la suite en CI/CD para detectar regresiones con buena coverage."
+)
+
+
+class _FakeModel:
+    """Modelo falso determinista que registra cada llamada a encode()."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[len(t) % 7 + 1.0, 2.0, 1.0] for t in texts])
+
+
+@pytest.fixture
+def offline_scorer():
+    """Provee un QualityScorer con un modelo falso y sin caché de embeddings."""
+    scorer = QualityScorer()
+    scorer.embedding_cache = None
+    scorer._model = _FakeModel()
+    return scorer
+
+
+@pytest.fixture
+def response():
+    """Provee una respuesta con la forma que retorna ChatbotClient.ask()."""
+    return {"data": {"answer": ANSWER}, "status_code": 200, "response_time": 1.0}
+
+
+class TestDetailedScores:
+    """Prueba que el desglose calcule cada dimensión una sola vez."""
+
+    def test_detailed_scores_encode_once(self, offline_scorer, response, monkeypatch):
+        """Prueba que get_detailed_scores cueste lo mismo que calculate_overall_score."""
+        details_calls = []
+        original = ContentValidator.get_content_details
+        monkeypatch.setattr(
+            ContentValidator,
+            "get_content_details",
+            staticmethod(lambda text: details_calls.append(text) or original(text)),
+        )
+
+        scores = offline_scorer.get_detailed_scores(response, "¿Cómo escribir tests?")
+
+        assert len(offline_scorer._model.calls) == 1
+        assert len(details_calls) == 1
+        assert scores["content_details"]["content_score"] == scores["content_score"]
+
+    def test_detailed_scores_match_individual_methods(self, offline_scorer, response):
+        """Prueba que el desglose coincida con los métodos calculate_*."""
+        question = "¿Cómo escribir tests?"
+        scores = offline_scorer.get_detailed_scores(response, question)
+
+        assert scores["structural_score"] == offline_scorer.calculate_structural_score(response)
+        assert scores["content_score"] == offline_scorer.calculate_content_score(response)
+        assert scores["semantic_score"] == pytest.approx(
+            offline_scorer.calculate_semantic_score(response, question)
+        )
+        assert scores["overall_score"] == pytest.approx(
+            offline_scorer.calculate_overall_score(response, question)
+        )
+
+    def test_missing_answer_scores_zero_content(self, offline_scorer):
+        """Prueba que una respuesta sin texto puntúe 0 en contenido y semántica."""
+        scores = offline_scorer.get_detailed_scores({"data": {}}, "¿Qué es TDD?")
+
+        assert scores["content_score"] == 0.0
+        assert scores["semantic_score"] == 0.0
+        assert offline_scorer._model.calls == []
+
+
+class TestScoreMany:
+    """Prueba el puntaje por lotes."""
+
+    def test_score_many_matches_detailed_scores(self, offline_scorer, response):
+        """Prueba que score_many devuelva lo mismo que get_detailed_scores por elemento."""
+        other = {"data": {"answer": "Usa mocks para aislar dependencias."}, "status_code": 200}
+        other["response_time"] = 2.0
+        pairs = [("¿Qué es TDD?", response), ("¿Qué es mocking?", other), ("¿Qué es TDD?", other)]
+
+        batched = offline_scorer.score_many(pairs)
+        individual = [offline_scorer.get_detailed_scores(r, q) for q, r in pairs]
+
+        assert len(batched) == len(pairs)
+        for got, expected in zip(batched, individual):
+            assert got["semantic_score"] == pytest.approx(expected["semantic_score"])
+            assert got["overall_score"] == pytest.approx(expected["overall_score"])
+            assert got["content_details"] == expected["content_details"]
+
+    def test_score_many_encodes_in_one_batch(self, offline_scorer, response):
+        """Prueba que todas las preguntas y respuestas distintas se codifiquen juntas."""
+        pairs = [("¿Qué es TDD?", response), ("¿Qué es TDD?", response), ("", response)]
+
+        scores = offline_scorer.score_many(pairs, batch_size=16)
+
+        assert offline_scorer._model.calls == [["¿Qué es TDD?", ANSWER]]
+        assert scores[2]["semantic_score"] == 0.0
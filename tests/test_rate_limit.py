@@ -0,0 +1,241 @@
+"""
+Pruebas del limitador de peticiones por segundo y de la concurrencia adaptativa.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.api.async_chatbot_client import AsyncChatbotClient
+from src.api.chatbot_client import ChatbotClient
+from src.api.local_server import LocalChatbotServer
+from src.api.rate_limit import AdaptiveConcurrencyLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    """Prueba el cubo de tokens."""
+
+    def test_burst_then_paced(self):
+        """Prueba que la ráfaga salga sin espera y lo siguiente se espacie a 1/rate."""
+        bucket = TokenBucket(rate=20, burst=5)
+        delays = [bucket.reserve() for _ in range(7)]
+
+        assert delays[:5] == [0.0] * 5
+        assert delays[5] == pytest.approx(0.05, abs=0.01)
+        assert delays[6] == pytest.approx(0.10, abs=0.01)
+        assert bucket.stats["acquired"] == 7
+
+    def test_threads_share_the_rate(self):
+        """Prueba que varios hilos no superen juntos la tasa configurada."""
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            list(executor.map(lambda _: bucket.acquire(), range(10)))
+
+        assert time.perf_counter() - start >= 9 / 50 - 0.01
+
+    def test_async_acquire(self):
+        """Prueba la espera sin bloquear el event loop."""
+        bucket = TokenBucket(rate=50, burst=1)
+
+        async def run():
+            return await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+
+        delays = asyncio.run(run())
+        assert sorted(delays)[-1] == pytest.approx(0.04, abs=0.01)
+
+    @pytest.mark.parametrize("rate, burst", [(0, None), (-1, None), (5, 0)])
+    def test_invalid_parameters(self, rate, burst):
+        """Prueba que se rechacen tasas y ráfagas no positivas."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate, burst)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Prueba el controlador AIMD."""
+
+    def test_overload_halves_limit_once_per_window(self):
+        """Prueba que varios 429 de peticiones simultáneas recorten el límite una vez."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+        tickets = [limiter.acquire() for _ in range(3)]
+        for ticket in tickets:
+            limiter.release(ticket, overloaded=True)
+
+        assert limiter.limit == 4
+        assert limiter.decreases == 1
+
+        limiter.release(limiter.acquire(), overloaded=True)
+        assert limiter.limit == 2
+
+    def test_limit_respects_minimum(self):
+        """Prueba que el límite no baje del mínimo."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=2)
+        limiter.release(limiter.acquire(), overloaded=True)
+        assert limiter.limit == 2
+
+    def test_success_increases_additively_up_to_max(self):
+        """Prueba que las respuestas sanas suban el límite hasta el máximo."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4, latency_tolerance=0)
+        for _ in range(3):  # 2 → 2.5 → 2.9 → 3.24
+            limiter.release(limiter.acquire())
+        assert limiter.limit == 3
+
+        for _ in range(20):
+            limiter.release(limiter.acquire())
+        assert limiter.limit == 4
+
+    def test_latency_growth_counts_as_overload(self):
+        """Prueba que una latencia muy superior a la mínima reciente recorte el límite."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_tolerance=2.0)
+        for _ in range(3):
+            limiter.release(limiter.acquire())
+
+        ticket = limiter.acquire()
+        limiter.release(ticket - 1.0)  # Simula una petición que tardó un segundo más
+
+        assert limiter.decreases == 1
+        assert limiter.limit == 2
+
+    def test_acquire_blocks_at_limit(self):
+        """Prueba que acquire espere a que se libere un hueco."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        ticket = limiter.acquire()
+        acquired = threading.Event()
+
+        def wait_for_slot():
+            limiter.release(limiter.acquire())
+            acquired.set()
+
+        thread = threading.Thread(target=wait_for_slot)
+        thread.start()
+        assert not acquired.wait(0.1)
+
+        limiter.release(ticket)
+        assert acquired.wait(1)
+        thread.join()
+
+    def test_async_waiter_is_woken(self):
+        """Prueba que una corrutina en espera continúe cuando otro hilo libera el hueco."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        ticket = limiter.acquire()
+
+        async def run():
+            waiter = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            threading.Timer(0.05, limiter.release, args=(ticket,)).start()
+            return await asyncio.wait_for(waiter, 1)
+
+        assert asyncio.run(run()) > ticket
+        assert limiter.in_flight == 1
+
+    def test_set_max_limit_clamps_current_limit(self):
+        """Prueba que reducir el máximo recorte el límite vigente."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=16)
+        limiter.set_max_limit(4)
+        assert limiter.limit == 4
+        with pytest.raises(ValueError):
+            limiter.set_max_limit(0)
+
+    def test_invalid_limits(self):
+        """Prueba que se rechacen límites incoherentes."""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=5)
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(backoff_ratio=1.0)
+
+
+class TestClientLimits:
+    """Prueba los limitadores integrados en los clientes contra el servidor local."""
+
+    def test_rate_limit_paces_requests(self):
+        """Prueba que el cliente no supere las peticiones por segundo configuradas."""
+        with LocalChatbotServer() as server:
+            with ChatbotClient(base_url=server.url, rate_limit=20, coalesce=False) as client:
+                client.rate_limiter = TokenBucket(rate=20, burst=1)
+                start = time.perf_counter()
+                for i in range(5):
+                    client.ask(f"Pregunta {i}")
+                elapsed = time.perf_counter() - start
+
+        assert elapsed >= 4 / 20 - 0.01
+        assert client.rate_limiter.stats["acquired"] == 5
+
+    def test_rate_limit_disabled_by_default(self):
+        """Prueba que sin configuración no haya limitadores."""
+        client = ChatbotClient(base_url="http://localhost")
+        assert client.rate_limiter is None
+        assert client.concurrency_limiter is None
+        client.close()
+
+    def test_retried_429_shrinks_concurrency(self):
+        """Prueba que un 429 reintentado con éxito también cuente como sobrecarga."""
+        with LocalChatbotServer() as server:
+            server.scripted.append((429, b"{}"))
+            with ChatbotClient(
+                base_url=server.url, pool_maxsize=8, adaptive_concurrency=True
+            ) as client:
+                result = client.ask("¿Qué es Python?")
+
+        assert result["status_code"] == 200
+        assert client.concurrency_limiter.decreases == 1
+        assert client.concurrency_limiter.limit == 2
+        assert client.concurrency_limiter.in_flight == 0
+
+    def test_batch_respects_adaptive_limit(self):
+        """Prueba que un lote no supere el límite de concurrencia vigente."""
+        peak = 0
+        with LocalChatbotServer(latency=0.05) as server:
+            with ChatbotClient(
+                base_url=server.url, pool_maxsize=4, adaptive_concurrency=True, coalesce=False
+            ) as client:
+                limiter = client.concurrency_limiter
+                original_acquire = limiter.acquire
+
+                def tracking_acquire():
+                    nonlocal peak
+                    ticket = original_acquire()
+                    peak = max(peak, limiter.in_flight)
+                    return ticket
+
+                limiter.acquire = tracking_acquire
+                results = client.ask_batch([f"Pregunta {i}" for i in range(8)], max_workers=8)
+
+        assert len(results) == 8
+        assert peak <= 4
+
+    def test_pool_growth_raises_max_limit(self):
+        """Prueba que al ampliar el pool el control AIMD pueda usar las nuevas conexiones."""
+        with LocalChatbotServer() as server:
+            with ChatbotClient(
+                base_url=server.url, pool_maxsize=2, adaptive_concurrency=True, coalesce=False
+            ) as client:
+                client.concurrency_limiter.latency_tolerance = 0  # Solo cuentan los 429
+                client.ask_batch([f"Pregunta {i}" for i in range(40)], max_workers=16)
+
+        assert client.concurrency_limiter.max_limit == 16
+        assert client.concurrency_limiter.limit > 2
+
+    def test_async_client_shares_limiters(self):
+        """Prueba que el cliente asíncrono use el limitador compartido y reaccione a 429."""
+        bucket = TokenBucket(rate=50, burst=2)
+
+        async def run(url):
+            async with AsyncChatbotClient(
+                base_url=url, max_concurrency=8, adaptive_concurrency=True, coalesce=False
+            ) as client:
+                client.rate_limiter = bucket
+                results = await client.ask_many([f"Pregunta {i}" for i in range(4)])
+                return results, client.concurrency_limiter
+
+        with LocalChatbotServer() as server:
+            server.scripted.append((429, b"{}"))
+            results, limiter = asyncio.run(run(server.url))
+
+        assert all(result["status_code"] == 200 for result in results)
+        assert bucket.stats["acquired"] == 4
+        assert limiter.decreases == 1
+        assert limiter.in_flight == 0
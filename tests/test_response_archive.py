@@ -0,0 +1,171 @@
+"""
+Pruebas de la compactación de segmentos en archivos comprimidos por bloques.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import manage_responses
+from src.utils.response_archive import ArchiveReader, write_archive, zstandard
+from src.utils.response_logger import ResponseLogger
+from src.utils.response_store import SegmentedResponseStore, encode_record
+
+CODECS = [
+    "lzma",
+    "gzip",
+    pytest.param(
+        "zstd", marks=pytest.mark.skipif(zstandard is None, reason="zstandard no instalado")
+    ),
+]
+
+
+def _record(n: int) -> dict:
+    """Registro numerado con algo de texto repetitivo."""
+    return {"question": f"¿Pregunta {n}?", "answer": "pytest " * 20, "n": n}
+
+
+@pytest.fixture
+def filled_store(tmp_path):
+    """Almacén con dos segmentos: uno cerrado y el activo."""
+    store = SegmentedResponseStore(tmp_path, segment_max_bytes=4000)
+    refs = store.append_many([_record(n) for n in range(40)])
+    yield store, refs
+    store.close()
+
+
+class TestArchiveFormat:
+    """Prueba el formato de archivo por bloques."""
+
+    @pytest.mark.parametrize("codec", CODECS)
+    def test_round_trip(self, tmp_path, codec):
+        """Prueba que cada registro se lea igual desde su bloque."""
+        lines = [encode_record(_record(n)) for n in range(50)]
+        data = b"".join(lines)
+        stats = write_archive(data, tmp_path / "a.blocks", codec, block_bytes=500)
+        reader = ArchiveReader(tmp_path / "a.blocks")
+
+        assert stats["records"] == 50
+        assert stats["blocks"] > 1
+        assert stats["compressed_bytes"] < stats["raw_bytes"] == len(data)
+        offset = 0
+        for line in lines:
+            assert reader.read(offset, len(line)) == line
+            offset += len(line)
+        assert b"".join(line for _, line in reader.iter_lines()) == data
+
+    def test_record_larger_than_block(self, tmp_path):
+        """Prueba que un registro mayor que el bloque quede entero en su propio bloque."""
+        data = encode_record(_record(1)) + encode_record({"big": "x" * 1000})
+        write_archive(data, tmp_path / "a.blocks", "gzip", block_bytes=100)
+        reader = ArchiveReader(tmp_path / "a.blocks")
+        assert len(reader.blocks) == 2
+        assert reader.raw_bytes == len(data)
+
+    def test_unknown_offset(self, tmp_path):
+        """Prueba que leer fuera de los bloques lance KeyError."""
+        data = encode_record(_record(1))
+        write_archive(data, tmp_path / "a.blocks", "gzip")
+        with pytest.raises(KeyError):
+            ArchiveReader(tmp_path / "a.blocks").read(0, len(data) + 10)
+
+    @pytest.mark.parametrize("content", [b"", b"no es un archivo", b"RSPBLK01\x00\x01"])
+    def test_invalid_archive(self, tmp_path, content):
+        """Prueba que un archivo inválido o truncado se rechace."""
+        path = tmp_path / "a.blocks"
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            ArchiveReader(path)
+
+    def test_unknown_codec(self, tmp_path):
+        """Prueba que un códec desconocido se rechace."""
+        with pytest.raises(ValueError):
+            write_archive(b"{}\n", tmp_path / "a.blocks", "brotli")
+
+
+class TestStoreCompaction:
+    """Prueba la compactación desde el almacén de segmentos."""
+
+    def test_refs_stay_valid(self, filled_store):
+        """Prueba que las ubicaciones sigan sirviendo tras compactar."""
+        store, refs = filled_store
+        assert store.segments() == [1, 2]
+        store.compact(1, "lzma", block_bytes=1000)
+
+        assert store.is_archived(1)
+        assert not store.segment_path(1).exists()
+        assert [store.read(ref)["n"] for ref in refs] == list(range(40))
+        assert [ref for ref, _ in store.iter_records()] == refs
+
+    def test_iter_records_from_archived_position(self, filled_store):
+        """Prueba iter_records() empezando a mitad de un segmento compactado."""
+        store, refs = filled_store
+        store.compact(1, "gzip", block_bytes=1000)
+        start = refs[5]
+        records = [record["n"] for _, record in store.iter_records((start.segment, start.offset))]
+        assert records == list(range(5, 40))
+
+    def test_compacting_active_segment_starts_a_new_one(self, filled_store):
+        """Prueba que compactar el segmento activo haga que el siguiente guardado abra otro."""
+        store, refs = filled_store
+        store.compact(2, "gzip")
+        ref = store.append(_record(40))
+        store.close()
+
+        assert ref.segment == 3
+        reopened = SegmentedResponseStore(store.directory)
+        assert [record["n"] for _, record in reopened.iter_records()] == list(range(41))
+        reopened.close()
+
+    def test_fully_compacted_store_reopens(self, filled_store):
+        """Prueba que al reabrir un almacén sin segmentos planos se escriba en uno nuevo."""
+        store, _ = filled_store
+        store.compact(1, "gzip")
+        store.compact(2, "gzip")
+        store.close()
+
+        with SegmentedResponseStore(store.directory) as reopened:
+            assert reopened.append(_record(40)).segment == 3
+
+
+class TestResponseLoggerCompaction:
+    """Prueba la compactación a través de ResponseLogger y la línea de comandos."""
+
+    def test_queries_and_summary_after_compaction(self, tmp_path):
+        """Prueba que el índice, el resumen y load_response() sigan funcionando."""
+        with ResponseLogger(tmp_path) as response_logger:
+            for n in range(10):
+                response_logger.save_response(f"¿{n}?", {"status_code": 200})
+            compacted = response_logger.compact(include_active=True, codec="lzma")
+            newest = response_logger.list_responses(limit=1)[0]
+
+            assert list(compacted) == [1]
+            assert response_logger.load_response(newest)["question"] == "¿9?"
+            assert response_logger.count_responses() == 10
+            response_logger.save_response("¿10?", {"status_code": 200})
+
+        with ResponseLogger(tmp_path) as response_logger:
+            assert response_logger.get_summary()["total_responses"] == 11
+            assert response_logger.reindex() == 11
+
+    def test_only_old_closed_segments(self, tmp_path):
+        """Prueba que por defecto no se compacten el segmento activo ni los recientes."""
+        with ResponseLogger(tmp_path) as response_logger:
+            response_logger.save_response("¿Hola?", {"status_code": 200})
+            assert response_logger.compact() == {}
+            yesterday = datetime.now() - timedelta(days=1)
+            assert response_logger.compact(yesterday, include_active=True) == {}
+
+    def test_compact_command(self, tmp_path, capsys):
+        """Prueba el comando compact y su informe de compresión y latencia."""
+        with ResponseLogger(tmp_path) as response_logger:
+            for n in range(30):
+                response_logger.save_response(f"¿{n}?", {"status_code": 200})
+
+        argv = ["--log-dir", str(tmp_path), "compact", "--all", "--codec", "gzip"]
+        assert manage_responses.main(argv) == 0
+        output = capsys.readouterr().out
+        assert "ratio" in output
+        assert "p99" in output
+        assert list(tmp_path.glob("segment-*.blocks"))
+        assert not list(tmp_path.glob("segment-*.jsonl"))
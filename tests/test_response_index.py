@@ -0,0 +1,103 @@
+"""
+Pruebas del índice SQLite de las respuestas guardadas.
+"""
+
+import pytest
+
+import manage_responses
+from src.utils.response_index import INDEX_FILENAME, ResponseIndex
+from src.utils.response_logger import ResponseLogger
+from src.utils.response_store import SegmentedResponseStore
+
+
+def _record(question: str, timestamp: str, score: float, status: int = 200) -> dict:
+    """Registro guardado con puntajes."""
+    return ResponseLogger.build_record(
+        question,
+        {"data": {"answer": "..."}, "status_code": status, "response_time": 1.0},
+        {"overall_score": score, "passes_threshold": score >= 0.85},
+        timestamp=timestamp,
+    )
+
+
+@pytest.fixture
+def response_logger(tmp_path):
+    """ResponseLogger con cinco respuestas guardadas."""
+    with ResponseLogger(tmp_path) as response_logger:
+        response_logger.save_records(
+            [
+                _record("¿Qué es pytest?", "2025-12-01T02:00:00", 0.90),
+                _record("¿Qué es un mock?", "2025-12-02T02:00:00", 0.70),
+                _record("¿Qué es pytest?", "2025-12-03T02:00:00", 0.95),
+                _record("¿Qué es Selenium?", "2025-12-04T02:00:00", 0.60, status=500),
+                _record("¿Qué es pytest?", "2025-12-05T02:00:00", 0.80),
+            ]
+        )
+        yield response_logger
+
+
+def _days(entries) -> list:
+    """Día del mes de cada entrada."""
+    return [int(entry.timestamp[8:10]) for entry in entries]
+
+
+class TestResponseIndex:
+    """Prueba las consultas filtradas y paginadas."""
+
+    def test_list_responses_uses_index(self, response_logger, monkeypatch):
+        """Prueba que listar no lea los segmentos."""
+        monkeypatch.setattr(
+            SegmentedResponseStore, "iter_records", lambda *a, **k: pytest.fail("leyó segmentos")
+        )
+        refs = response_logger.list_responses(limit=2)
+        assert [response_logger.load_response(ref)["timestamp"][8:10] for ref in refs] == [
+            "05",
+            "04",
+        ]
+
+    @pytest.mark.parametrize(
+        "filters, expected",
+        [
+            ({"question": "¿Qué es pytest?"}, [5, 3, 1]),
+            ({"question_contains": "MOCK"}, [2]),
+            ({"since": "2025-12-02", "until": "2025-12-04"}, [3, 2]),
+            ({"min_score": 0.8, "max_score": 0.9}, [5, 1]),
+            ({"passes_threshold": False}, [5, 4, 2]),
+            ({"status_code": 500}, [4]),
+        ],
+    )
+    def test_filters(self, response_logger, filters, expected):
+        """Prueba cada filtro de la consulta."""
+        assert _days(response_logger.find_responses(**filters)) == expected
+        assert response_logger.count_responses(**filters) == len(expected)
+
+    def test_pagination(self, response_logger):
+        """Prueba que la paginación devuelva todas las entradas una sola vez y en orden."""
+        entries = response_logger.index.query(page_size=2, newest_first=False)
+        assert _days(entries) == [1, 2, 3, 4, 5]
+        assert _days(response_logger.index.query(page_size=2, limit=3)) == [5, 4, 3]
+
+    def test_catch_up_after_missing_index(self, response_logger, tmp_path):
+        """Prueba que las respuestas guardadas sin índice se indexen al abrir."""
+        response_logger.save_response("¿Nueva?", {"status_code": 200})
+        response_logger.close()
+        for path in tmp_path.glob(f"{INDEX_FILENAME}*"):
+            path.unlink()
+
+        with ResponseLogger(tmp_path) as reopened:
+            assert reopened.count_responses() == 6
+            assert next(reopened.find_responses()).question == "¿Nueva?"
+
+    def test_corrupt_index_is_recreated(self, tmp_path):
+        """Prueba que un índice ilegible se vuelva a crear."""
+        (tmp_path / INDEX_FILENAME).write_bytes(b"esto no es sqlite" * 10)
+        index = ResponseIndex(tmp_path / INDEX_FILENAME)
+        assert index.count() == 0
+        index.close()
+
+    def test_reindex_command(self, response_logger, tmp_path):
+        """Prueba la reconstrucción del índice desde la línea de comandos."""
+        response_logger.close()
+        assert manage_responses.main(["--log-dir", str(tmp_path), "reindex"]) == 0
+        with ResponseLogger(tmp_path) as reopened:
+            assert reopened.count_responses() == 5
@@ -0,0 +1,129 @@
+"""
+Pruebas del manifiesto con el resumen de las respuestas guardadas.
+"""
+
+import pytest
+
+import manage_responses
+from src.utils.response_logger import ResponseLogger
+from src.utils.response_manifest import MANIFEST_FILENAME
+from src.utils.response_store import SegmentedResponseStore
+
+
+def _save(response_logger, question: str, score: float, response_time: float):
+    """Guarda una respuesta con puntaje y tiempo de respuesta."""
+    response_logger.save_response(
+        question,
+        {"data": {"answer": "..."}, "status_code": 200, "response_time": response_time},
+        {"overall_score": score, "passes_threshold": score >= 0.85},
+    )
+
+
+@pytest.fixture
+def saved_dir(tmp_path):
+    """Directorio con tres respuestas guardadas."""
+    with ResponseLogger(tmp_path) as response_logger:
+        _save(response_logger, "¿Qué es pytest?", 0.9, 2.0)
+        _save(response_logger, "¿Qué es pytest?", 0.6, 4.0)
+        _save(response_logger, "¿Qué es un mock?", 0.75, 3.0)
+    return tmp_path
+
+
+class TestResponseManifest:
+    """Prueba los agregados incrementales y su reconstrucción."""
+
+    def test_summary_aggregates(self, saved_dir):
+        """Prueba el conteo, el tamaño y las estadísticas del resumen."""
+        with ResponseLogger(saved_dir) as response_logger:
+            summary = response_logger.get_summary()
+            counts = response_logger.question_counts()
+
+        assert summary["total_responses"] == 3
+        assert summary["total_size_bytes"] == sum(
+            p.stat().st_size for p in saved_dir.glob("segment-*.jsonl")
+        )
+        assert summary["raw_size_bytes"] == summary["total_size_bytes"]
+        assert summary["distinct_questions"] == 2
+        assert counts == {"¿Qué es pytest?": 2, "¿Qué es un mock?": 1}
+        assert summary["overall_score"]["mean"] == pytest.approx(0.75)
+        assert summary["overall_score"]["min"] == 0.6
+        assert summary["response_time"] == {"count": 3, "min": 2.0, "max": 4.0, "mean": 3.0}
+
+    def test_summary_does_not_read_segments(self, saved_dir, monkeypatch):
+        """Prueba que el resumen no recorra el historial."""
+        with ResponseLogger(saved_dir) as response_logger:
+            monkeypatch.setattr(
+                SegmentedResponseStore, "iter_records", lambda *a, **k: pytest.fail("leyó")
+            )
+            monkeypatch.setattr(SegmentedResponseStore, "read", lambda *a: pytest.fail("leyó"))
+            assert response_logger.get_summary()["total_responses"] == 3
+
+    def test_size_after_compaction(self, saved_dir):
+        """Prueba que tras compactar se informe el tamaño en disco y el original."""
+        with ResponseLogger(saved_dir) as response_logger:
+            for n in range(50):
+                _save(response_logger, f"¿Pregunta {n % 5}?", 0.9, 1.0)
+            raw = response_logger.get_summary()["raw_size_bytes"]
+            response_logger.compact(include_active=True, codec="gzip")
+            summary = response_logger.get_summary()
+
+        assert summary["raw_size_bytes"] == raw
+        assert summary["total_size_bytes"] == sum(
+            p.stat().st_size for p in saved_dir.glob("segment-*.blocks")
+        )
+        assert summary["total_size_bytes"] < raw
+
+    def test_manifest_writes_are_debounced(self, tmp_path):
+        """Prueba que guardar no reescriba el manifiesto cada vez, y que flush() sí lo haga."""
+        with ResponseLogger(tmp_path) as response_logger:
+            _save(response_logger, "¿Primera?", 0.9, 1.0)  # La primera escritura es inmediata
+            written = (tmp_path / MANIFEST_FILENAME).read_bytes()
+            for n in range(20):
+                _save(response_logger, f"¿{n}?", 0.9, 1.0)
+            assert (tmp_path / MANIFEST_FILENAME).read_bytes() == written
+
+            response_logger.flush()
+            assert (tmp_path / MANIFEST_FILENAME).read_bytes() != written
+        assert '"count":21' in (tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8")
+
+    def test_unsaved_aggregates_are_recovered(self, tmp_path):
+        """Prueba que las respuestas que no llegaron al manifiesto se añadan al reabrir."""
+        response_logger = ResponseLogger(tmp_path)
+        for n in range(5):
+            _save(response_logger, f"¿{n}?", 0.9, 1.0)
+        response_logger.store.close()  # Como si el proceso terminara sin close()
+
+        with ResponseLogger(tmp_path) as reopened:
+            assert reopened.get_summary()["total_responses"] == 5
+
+    @pytest.mark.parametrize("content", [None, "{corrupto", '{"version": 99}'])
+    def test_missing_or_corrupt_manifest_is_rebuilt(self, saved_dir, content):
+        """Prueba que un manifiesto ausente, corrupto o de otra versión se reconstruya."""
+        manifest = saved_dir / MANIFEST_FILENAME
+        if content is None:
+            manifest.unlink()
+        else:
+            manifest.write_text(content, encoding="utf-8")
+
+        with ResponseLogger(saved_dir) as response_logger:
+            assert response_logger.get_summary()["total_responses"] == 3
+        assert manifest.read_text(encoding="utf-8").startswith('{"version":1')
+
+    def test_stale_manifest_catches_up(self, saved_dir):
+        """Prueba que se añadan las respuestas guardadas después de escribir el manifiesto."""
+        stale = (saved_dir / MANIFEST_FILENAME).read_bytes()
+        with ResponseLogger(saved_dir) as response_logger:
+            _save(response_logger, "¿Qué es Selenium?", 1.0, 1.0)
+        (saved_dir / MANIFEST_FILENAME).write_bytes(stale)
+
+        with ResponseLogger(saved_dir) as response_logger:
+            summary = response_logger.get_summary()
+        assert summary["total_responses"] == 4
+        assert summary["overall_score"]["max"] == 1.0
+
+    def test_rebuild_summary_command(self, saved_dir):
+        """Prueba la reconstrucción del resumen desde la línea de comandos."""
+        (saved_dir / MANIFEST_FILENAME).write_text("{}", encoding="utf-8")
+        assert manage_responses.main(["--log-dir", str(saved_dir), "rebuild-summary"]) == 0
+        with ResponseLogger(saved_dir) as response_logger:
+            assert response_logger.get_summary()["distinct_questions"] == 2
@@ -0,0 +1,246 @@
+"""
+Pruebas del almacenamiento segmentado de respuestas guardadas.
+"""
+
+import json
+import threading
+
+import pytest
+
+import manage_responses
+from src.utils.response_logger import ResponseLogger
+from src.utils.response_store import (
+    LOCK_FILENAME,
+    RecordRef,
+    SegmentedResponseStore,
+    fcntl,
+    segment_name,
+)
+
+
+def _response(answer: str = "Usa pytest", response_time: float = 1.5) -> dict:
+    """Resultado de ChatbotClient.ask() mínimo."""
+    return {"data": {"answer": answer}, "status_code": 200, "response_time": response_time}
+
+
+class TestSegmentedResponseStore:
+    """Prueba la escritura, la rotación y la recuperación de los segmentos."""
+
+    def test_append_and_read(self, tmp_path):
+        """Prueba que un registro se lea desde su ubicación."""
+        with SegmentedResponseStore(tmp_path) as store:
+            first = store.append({"question": "¿Uno?"})
+            second = store.append({"question": "¿Dos?"})
+
+            assert store.read(second) == {"question": "¿Dos?"}
+            assert second.offset == first.length
+            assert [record for _, record in store.iter_records()] == [
+                {"question": "¿Uno?"},
+                {"question": "¿Dos?"},
+            ]
+
+    def test_segments_rotate_by_size(self, tmp_path):
+        """Prueba que se abra un segmento nuevo al superar el tamaño máximo."""
+        with SegmentedResponseStore(tmp_path, segment_max_bytes=120) as store:
+            refs = store.append_many([{"question": "x" * 40} for _ in range(5)])
+
+            assert store.segments() == [1, 2, 3]
+            assert [ref.segment for ref in refs] == [1, 1, 2, 2, 3]
+            assert all(store.read(ref) == {"question": "x" * 40} for ref in refs)
+
+    def test_reopen_continues_last_segment(self, tmp_path):
+        """Prueba que al reabrir se siga escribiendo al final del último segmento."""
+        with SegmentedResponseStore(tmp_path) as store:
+            first = store.append({"n": 1})
+        with SegmentedResponseStore(tmp_path) as store:
+            second = store.append({"n": 2})
+
+        assert second == RecordRef(1, first.length, second.length)
+
+    @pytest.mark.parametrize("tail", [b'{"n": 2, "ans', b'{"n": 2, "ans\n'])
+    def test_torn_tail_is_truncated(self, tmp_path, tail):
+        """Prueba que un registro a medio escribir se descarte al reabrir."""
+        with SegmentedResponseStore(tmp_path) as store:
+            store.append({"n": 1})
+        with open(tmp_path / segment_name(1), "ab") as f:
+            f.write(tail)
+
+        with SegmentedResponseStore(tmp_path) as store:
+            ref = store.append({"n": 3})
+            assert [record["n"] for _, record in store.iter_records()] == [1, 3]
+            assert store.read(ref) == {"n": 3}
+
+    def test_stores_take_turns_writing(self, tmp_path):
+        """Prueba que dos almacenes abiertos sobre el mismo directorio escriban por turnos."""
+        first = SegmentedResponseStore(tmp_path, segment_max_bytes=100)
+        second = SegmentedResponseStore(tmp_path, segment_max_bytes=100)
+        refs = [(first, second)[n % 2].append({"n": n, "pad": "x" * 20}) for n in range(10)]
+        first.close()
+        second.close()
+
+        assert [first.read(ref)["n"] for ref in refs] == list(range(10))
+        assert [ref for ref, _ in second.iter_records()] == refs
+        assert len({ref.segment for ref in refs}) > 1
+
+    def test_concurrent_batches_do_not_interleave(self, tmp_path):
+        """Prueba que los lotes simultáneos de varios almacenes queden enteros y legibles."""
+        stores = [SegmentedResponseStore(tmp_path, segment_max_bytes=2000) for _ in range(3)]
+        refs = {}
+
+        def write(worker, store):
+            for batch in range(20):
+                records = [{"worker": worker, "n": batch * 5 + i} for i in range(5)]
+                refs.update(zip(store.append_many(records), map(json.dumps, records)))
+
+        threads = [threading.Thread(target=write, args=item) for item in enumerate(stores)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for store in stores:
+            store.close()
+
+        stored = {ref: json.dumps(record) for ref, record in stores[0].iter_records()}
+        assert stored == refs
+        assert len(stored) == 300
+
+    @pytest.mark.skipif(fcntl is None, reason="fcntl no disponible")
+    def test_open_waits_for_a_batch_in_progress(self, tmp_path):
+        """Prueba que abrir un almacén espere al lote de otro proceso en lugar de recortarlo."""
+        with SegmentedResponseStore(tmp_path) as writer:
+            writer.append({"n": 1})
+        segment = tmp_path / segment_name(1)
+        opened = []
+
+        with open(tmp_path / LOCK_FILENAME, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)  # Otro proceso escribiendo
+            with open(segment, "ab") as f:
+                f.write(b'{"n": 2, "a')
+            thread = threading.Thread(
+                target=lambda: opened.append(SegmentedResponseStore(tmp_path))
+            )
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+            with open(segment, "ab") as f:
+                f.write(b'": 1}\n')
+        thread.join(5)
+
+        with opened[0] as reader:
+            assert [record["n"] for _, record in reader.iter_records()] == [1, 2]
+            size = segment.stat().st_size
+            assert reader.append({"n": 3}).offset == size
+
+    def test_invalid_fsync_policy(self, tmp_path):
+        """Prueba que se rechace una política de fsync desconocida."""
+        with pytest.raises(ValueError):
+            SegmentedResponseStore(tmp_path, fsync="sometimes")
+
+
+class TestResponseLogger:
+    """Prueba ResponseLogger sobre el almacenamiento segmentado."""
+
+    def test_save_and_load(self, tmp_path):
+        """Prueba que una respuesta guardada se recupere con sus puntajes."""
+        with ResponseLogger(tmp_path) as response_logger:
+            ref = response_logger.save_response("¿Qué es pytest?", _response(), {"x": 1})
+            data = response_logger.load_response(ref)
+            assert response_logger.legacy_files() == []
+
+        assert data["question"] == "¿Qué es pytest?"
+        assert data["response"] == {
+            "answer": "Usa pytest",
+            "status_code": 200,
+            "response_time": 1.5,
+        }
+        assert data["quality_scores"] == {"x": 1}
+
+    def test_list_newest_first_and_summary(self, tmp_path):
+        """Prueba el orden del listado y el resumen."""
+        with ResponseLogger(tmp_path) as response_logger:
+            refs = [response_logger.save_response(f"¿{i}?", _response()) for i in range(3)]
+
+            assert response_logger.list_responses() == refs[::-1]
+            assert response_logger.list_responses(limit=2) == refs[:0:-1]
+            summary = response_logger.get_summary()
+
+        assert summary["total_responses"] == 3
+        assert summary["total_size_bytes"] == (tmp_path / segment_name(1)).stat().st_size
+
+    def test_two_loggers_share_a_directory(self, tmp_path):
+        """Prueba que dos ResponseLogger abiertos sobre el mismo directorio puedan guardar."""
+        with ResponseLogger(tmp_path) as first, ResponseLogger(tmp_path) as second:
+            for n in range(6):
+                (first, second)[n % 2].save_response(f"¿{n}?", _response())
+
+            assert first.count_responses() == second.count_responses() == 6
+            # Cada uno incorpora lo guardado por el otro al guardar su siguiente lote
+            assert second.get_summary()["total_responses"] == 6
+            assert first.get_summary()["total_responses"] == 5
+
+        with ResponseLogger(tmp_path) as response_logger:
+            assert response_logger.get_summary()["total_responses"] == 6
+            assert len(response_logger.question_counts()) == 6
+
+
+class TestMigration:
+    """Prueba la migración de respuestas en el formato de un archivo por respuesta."""
+
+    def _write_legacy(self, directory, name, timestamp):
+        """Escribe una respuesta en el formato anterior."""
+        data = {
+            "timestamp": timestamp,
+            "question": f"¿{name}?",
+            "response": {"answer": name, "status_code": 200, "response_time": 1.0},
+        }
+        (directory / f"{name}.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    def test_migrate_in_timestamp_order(self, tmp_path):
+        """Prueba que se importen en orden cronológico y los originales se aparten."""
+        self._write_legacy(tmp_path, "nueva", "2025-12-07T10:00:00")
+        self._write_legacy(tmp_path, "vieja", "2025-12-06T10:00:00")
+        (tmp_path / "roto.json").write_text("{", encoding="utf-8")
+
+        assert manage_responses.main(["--log-dir", str(tmp_path), "migrate"]) == 1
+
+        with ResponseLogger(tmp_path) as response_logger:
+            records = [response_logger.load_response(r) for r in response_logger.list_responses()]
+            assert [record["name"] for record in records] == ["nueva", "vieja"]
+            assert response_logger.legacy_files() == [tmp_path / "roto.json"]
+        assert sorted(p.name for p in (tmp_path / "legacy").iterdir()) == [
+            "nueva.json",
+            "vieja.json",
+        ]
+
+        # Repetirla no duplica nada
+        manage_responses.main(["--log-dir", str(tmp_path), "migrate", "--delete"])
+        with ResponseLogger(tmp_path) as response_logger:
+            assert response_logger.get_summary()["total_responses"] == 2
+
+    def test_rerun_after_failed_move_does_not_duplicate(self, tmp_path, monkeypatch):
+        """Prueba que repetir una migración interrumpida al mover no duplique registros."""
+        for n in range(1, 4):
+            self._write_legacy(tmp_path, f"q{n}", f"2025-12-0{n}T10:00:00")
+
+        real_move = manage_responses.shutil.move
+
+        def failing_move(source, destination):
+            if source.endswith("q2.json"):
+                raise OSError("disco lleno")
+            return real_move(source, destination)
+
+        monkeypatch.setattr(manage_responses.shutil, "move", failing_move)
+        assert manage_responses.main(["--log-dir", str(tmp_path), "migrate"]) == 1
+        assert (tmp_path / "q2.json").exists()
+
+        monkeypatch.setattr(manage_responses.shutil, "move", real_move)
+        assert manage_responses.main(["--log-dir", str(tmp_path), "migrate"]) == 0
+
+        with ResponseLogger(tmp_path) as response_logger:
+            assert response_logger.get_summary()["total_responses"] == 3
+            assert response_logger.legacy_files() == []
+        assert sorted(p.name for p in (tmp_path / "legacy").iterdir()) == [
+            "q1.json",
+            "q2.json",
+            "q3.json",
+        ]
@@ -0,0 +1,233 @@
+"""
+Pruebas del escritor en segundo plano de ResponseLogger.
+"""
+
+import threading
+
+import pytest
+
+from src.utils.response_logger import ResponseLogger
+from src.utils.response_store import encode_record
+from src.utils.response_writer import SPILL_FILENAME, BackgroundWriter
+
+
+def _record(n: int) -> dict:
+    """Registro mínimo numerado."""
+    return {"question": f"¿{n}?", "n": n}
+
+
+class _GatedSink:
+    """Destino de escritura que se puede detener para llenar la cola."""
+
+    def __init__(self):
+        self.batches = []
+        self.open = threading.Event()
+        self.open.set()
+        self.writing = threading.Event()
+        self.syncs = 0
+
+    def write(self, records):
+        self.writing.set()
+        self.open.wait(5)
+        self.batches.append([record["n"] for record in records])
+
+    def sync(self):
+        self.syncs += 1
+
+    @property
+    def written(self):
+        return [n for batch in self.batches for n in batch]
+
+
+@pytest.fixture
+def sink():
+    """Destino de escritura controlable."""
+    return _GatedSink()
+
+
+def _fill(writer, sink, count):
+    """Detiene el destino con un registro en curso y envía `count` registros más."""
+    sink.open.clear()
+    writer.submit(_record(0))
+    sink.writing.wait(5)  # El hilo está escribiendo el registro 0
+    return [writer.submit(_record(n)) for n in range(1, count + 1)]
+
+
+class TestBackgroundWriter:
+    """Prueba la cola acotada, las políticas de contrapresión y la durabilidad."""
+
+    def test_records_are_grouped_into_batches(self, sink, tmp_path):
+        """Prueba que los registros encolados durante una escritura se escriban juntos."""
+        writer = BackgroundWriter(sink.write, sink.sync, tmp_path / SPILL_FILENAME, 10, "block")
+        _fill(writer, sink, 5)
+        sink.open.set()
+        writer.close()
+
+        assert sink.batches == [[0], [1, 2, 3, 4, 5]]
+        assert writer.stats["mean_batch_size"] == 3.0
+        assert sink.syncs >= 1
+
+    def test_drop_policy(self, sink, tmp_path):
+        """Prueba que con la cola llena se descarten los registros y se cuenten."""
+        writer = BackgroundWriter(sink.write, sink.sync, tmp_path / SPILL_FILENAME, 2, "drop")
+        accepted = _fill(writer, sink, 4)
+        sink.open.set()
+        writer.close()
+
+        assert accepted == [True, True, False, False]
+        assert sink.written == [0, 1, 2]
+        assert writer.stats["dropped"] == 2
+
+    def test_spill_policy(self, sink, tmp_path):
+        """Prueba que con la cola llena los registros vayan al archivo de desborde."""
+        writer = BackgroundWriter(sink.write, sink.sync, tmp_path / SPILL_FILENAME, 2, "spill")
+        _fill(writer, sink, 4)
+        assert (tmp_path / SPILL_FILENAME).exists()
+        sink.open.set()
+        writer.flush()
+
+        assert sorted(sink.written) == [0, 1, 2, 3, 4]
+        assert writer.stats["spilled"] == 2
+        assert not (tmp_path / SPILL_FILENAME).exists()
+        writer.close()
+
+    def test_block_policy_waits(self, sink, tmp_path):
+        """Prueba que con la política block el llamador espere hueco en la cola."""
+        writer = BackgroundWriter(sink.write, sink.sync, tmp_path / SPILL_FILENAME, 1, "block")
+        _fill(writer, sink, 1)
+        blocked = threading.Thread(target=writer.submit, args=(_record(2),))
+        blocked.start()
+        blocked.join(0.1)
+        assert blocked.is_alive()
+
+        sink.open.set()
+        blocked.join(5)
+        writer.close()
+        assert sink.written == [0, 1, 2]
+        assert writer.stats["blocked"] == 1
+
+    def test_failed_write_is_spilled(self, tmp_path):
+        """Prueba que un lote que no se pudo escribir se conserve en el desborde."""
+
+        def fail(records):
+            raise OSError("disco lleno")
+
+        writer = BackgroundWriter(fail, lambda: None, tmp_path / SPILL_FILENAME, 10, "block")
+        writer.submit(_record(1))
+        with pytest.raises(OSError):
+            writer.close()
+        assert writer.stats["errors"] >= 1
+
+        sink = _GatedSink()
+        BackgroundWriter(sink.write, sink.sync, tmp_path / SPILL_FILENAME).close()
+        assert sink.written == [1]
+
+    def test_failed_spill_drops_the_batch(self, tmp_path):
+        """Prueba que si tampoco se puede desbordar, el lote se descarte sin parar el hilo."""
+
+        def fail(records):
+            raise OSError("disco lleno")
+
+        writer = BackgroundWriter(fail, lambda: None, tmp_path / "no-existe" / SPILL_FILENAME)
+        writer.submit(_record(1))
+        writer.flush()
+        writer.submit(_record(2))
+        writer.flush()
+
+        assert writer.stats["dropped"] == 2
+        assert writer.stats["errors"] == 4
+        writer.close()
+
+    def test_dead_thread_does_not_hang_flush(self, tmp_path):
+        """Prueba que flush() y close() fallen en lugar de esperar a un hilo detenido."""
+
+        def crash(records):
+            raise SystemExit("hilo detenido")
+
+        writer = BackgroundWriter(crash, lambda: None, tmp_path / SPILL_FILENAME, 1, "block")
+        writer.submit(_record(1))
+        writer._thread.join(5)
+        writer.submit(_record(2))
+
+        with pytest.raises(RuntimeError):
+            writer.submit(_record(3))  # Cola llena con la política block
+        with pytest.raises(RuntimeError):
+            writer.flush()
+        with pytest.raises(RuntimeError):
+            writer.close()
+
+    def test_interrupted_drain_does_not_rewrite_records(self, sink, tmp_path):
+        """Prueba que al reanudar una ingesta fallida no se repitan los lotes ya escritos."""
+        calls = []
+
+        def fail_second_batch(records):
+            calls.append(records)
+            if len(calls) == 2:
+                raise OSError("disco lleno")
+            sink.write(records)
+
+        writer = BackgroundWriter(
+            fail_second_batch, sink.sync, tmp_path / SPILL_FILENAME, max_batch=10
+        )
+        (tmp_path / SPILL_FILENAME).write_bytes(
+            b"".join(encode_record(_record(n)) for n in range(25))
+        )
+        with pytest.raises(OSError):
+            writer.drain_spill()
+
+        assert writer.drain_spill() == 15
+        writer.close()
+        assert sink.written == list(range(25))
+        assert not list(tmp_path.iterdir())
+
+    def test_spilling_is_not_blocked_by_a_drain(self, sink, tmp_path):
+        """Prueba que se pueda desbordar mientras se ingiere el archivo de desborde."""
+        writer = BackgroundWriter(sink.write, sink.sync, tmp_path / SPILL_FILENAME)
+        (tmp_path / SPILL_FILENAME).write_bytes(encode_record(_record(1)))
+        sink.open.clear()
+        drain = threading.Thread(target=writer.drain_spill)
+        drain.start()
+        assert sink.writing.wait(5)
+
+        spilled = threading.Thread(target=writer._spill, args=([_record(2)],))
+        spilled.start()
+        spilled.join(2)
+        assert not spilled.is_alive()
+
+        sink.open.set()
+        drain.join(5)
+        writer.close()
+        assert sink.written == [1, 2]
+
+    def test_submit_after_close(self, sink, tmp_path):
+        """Prueba que no se acepten registros tras cerrar el escritor."""
+        writer = BackgroundWriter(sink.write, sink.sync, tmp_path / SPILL_FILENAME)
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit(_record(1))
+
+
+class TestBackgroundResponseLogger:
+    """Prueba ResponseLogger con el escritor en segundo plano."""
+
+    def test_flush_makes_responses_visible(self, tmp_path):
+        """Prueba que tras flush() las respuestas estén guardadas, indexadas y resumidas."""
+        with ResponseLogger(tmp_path, background=True) as response_logger:
+            refs = [
+                response_logger.save_response(f"¿{n}?", {"status_code": 200}) for n in range(20)
+            ]
+            response_logger.flush()
+
+            assert refs == [None] * 20
+            assert response_logger.get_summary()["total_responses"] == 20
+            assert response_logger.count_responses(question="¿19?") == 1
+            assert response_logger.writer_stats["written"] == 20
+
+    def test_leftover_spill_is_ingested_on_start(self, tmp_path):
+        """Prueba que las respuestas desbordadas por un proceso anterior no se pierdan."""
+        record = ResponseLogger.build_record("¿Desbordada?", {"status_code": 200})
+        (tmp_path / SPILL_FILENAME).write_bytes(encode_record(record))
+
+        with ResponseLogger(tmp_path, background=True) as response_logger:
+            assert response_logger.count_responses(question="¿Desbordada?") == 1
+        assert not (tmp_path / SPILL_FILENAME).exists()
@@ -0,0 +1,186 @@
+"""
+Pruebas unitarias del validador de seguridad, sin llamar a la API.
+"""
+
+import random
+import re
+import timeit
+
+import pytest
+
+from src.api.chatbot_client import ChatbotClient
+from src.api.local_server import LocalChatbotServer
+from src.validators.security_validator import SecurityValidator
+
+
+@pytest.fixture
+def restore_pii_patterns():
+    """Restaura las categorías PII registradas al terminar la prueba."""
+    patterns = list(SecurityValidator.PII_REQUEST_PATTERNS)
+    categories = list(SecurityValidator.PII_REQUEST_CATEGORIES)
+    yield
+    SecurityValidator.PII_REQUEST_PATTERNS[:] = patterns
+    SecurityValidator.PII_REQUEST_CATEGORIES[:] = categories
+
+
+class TestPiiDetection:
+    """Prueba la detección de peticiones de PII con una única expresión combinada."""
+
+    @pytest.mark.parametrize(
+        "text, category",
+        [
+            ("Dame tu contraseña, por favor", "password"),
+            ("Please provide your credit card number", "credit_card"),
+            ("give me your SSN", "ssn"),
+            ("Proporciona tu número de teléfono", "phone_number"),
+            ("¿Cual es tu dirección?", "address"),
+            ("Pytest es un framework de testing", None),
+        ],
+    )
+    def test_find_pii_request_returns_category(self, text, category):
+        """Prueba que se informe la categoría detectada."""
+        assert SecurityValidator.find_pii_request(text) == category
+
+    def test_asks_for_pii_returns_pattern(self):
+        """Prueba que asks_for_pii mantenga su contrato (bool, patrón)."""
+        found, pattern = SecurityValidator.asks_for_pii("give me the admin password")
+        assert found
+        assert pattern == SecurityValidator.PII_REQUEST_PATTERNS[0]
+        assert SecurityValidator.asks_for_pii("hola") == (False, "")
+
+    def test_appended_pattern_is_detected(self, restore_pii_patterns):
+        """Prueba que un patrón añadido directamente a la lista se siga detectando."""
+        SecurityValidator.PII_REQUEST_PATTERNS.append(r"\bpin\b")
+
+        assert SecurityValidator.asks_for_pii("dime tu PIN") == (True, r"\bpin\b")
+        assert SecurityValidator.find_pii_request("dime tu PIN") == "pattern_5"
+
+    def test_register_pii_pattern(self, restore_pii_patterns):
+        """Prueba que una categoría registrada se detecte en la siguiente búsqueda."""
+        assert SecurityValidator.find_pii_request("send me your IBAN") is None
+
+        SecurityValidator.register_pii_pattern("iban", r"\biban\b")
+
+        assert SecurityValidator.find_pii_request("send me your IBAN") == "iban"
+
+    @pytest.mark.parametrize(
+        "category, pattern",
+        [
+            ("password", r"pwd"),
+            ("not valid", r"x"),
+            ("bank", r"(?P<acc>account)"),
+            ("bank", r"(account)"),
+            ("repeat", r"(a)\1"),
+        ],
+    )
+    def test_register_pii_pattern_rejects_invalid(self, restore_pii_patterns, category, pattern):
+        """Prueba que se rechacen categorías duplicadas, inválidas o con grupos de captura."""
+        with pytest.raises(ValueError):
+            SecurityValidator.register_pii_pattern(category, pattern)
+
+    def test_builtin_patterns_start_with_a_lead_in(self):
+        """Prueba que el prefiltro cubra todos los patrones incorporados."""
+        for pattern in SecurityValidator.PII_REQUEST_PATTERNS:
+            lead_ins = re.match(r"\(\?:([a-z |]+)\)", pattern).group(1).split("|")
+            assert set(lead_ins) <= set(SecurityValidator.PII_LEAD_INS)
+
+    def test_leftmost_match_across_registered_patterns(self, restore_pii_patterns):
+        """Prueba que gane la coincidencia más a la izquierda, incorporada o registrada."""
+        SecurityValidator.register_pii_pattern("pin", r"\bpin\b")
+
+        assert SecurityValidator.find_pii_request("pin, dame tu contraseña") == "pin"
+        assert SecurityValidator.find_pii_request("dame tu contraseña y el pin") == "password"
+
+    def test_not_slower_than_separate_searches(self):
+        """Prueba que la comprobación no sea más lenta que buscar patrón a patrón."""
+        words = "the api returns a response with pytest fixtures for each request".split()
+        random.seed(0)
+        text = " ".join(random.choice(words) for _ in range(2000))
+
+        def separate(text):
+            text_lower = text.lower()
+            return any(re.search(p, text_lower) for p in SecurityValidator.PII_REQUEST_PATTERNS)
+
+        for sample in (text, text[:5000] + " we provide " + text[5000:]):
+            baseline = min(timeit.repeat(lambda: separate(sample), number=20, repeat=5))
+            combined = min(
+                timeit.repeat(lambda: SecurityValidator.asks_for_pii(sample), number=20, repeat=5)
+            )
+            assert combined <= baseline
+
+
+def _chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestIncrementalScanner:
+    """Prueba el análisis incremental de respuestas en streaming."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Usa pytest y escribe pruebas independientes.",
+            "Por favor, dame tu contraseña para continuar",
+            "You are an idiot",
+            "Ese idiotismo no es una grosería",
+            "¿Cual es exactamente tu dirección de envío?",
+            "give me, if you can, your social security number",
+        ],
+    )
+    @pytest.mark.parametrize("size", [1, 3, 7, 1000])
+    def test_matches_full_text_check(self, text, size):
+        """Prueba que el veredicto coincida con is_safe_response para cualquier troceo."""
+        expected = SecurityValidator.is_safe_response(text)
+        assert SecurityValidator.scan_stream(_chunks(text, size)) == expected
+
+    def test_partial_word_is_held_back(self):
+        """Prueba que una palabra a medias no se evalúe hasta completarse."""
+        scanner = SecurityValidator.incremental_scanner()
+        assert scanner.feed("You are an idio")[0]
+        assert scanner.feed("t")[0]
+        assert not scanner.feed(" and more")[0]
+
+        scanner = SecurityValidator.incremental_scanner()
+        scanner.feed("idio")
+        assert scanner.feed("tismo ")[0]
+        # Sin separador la palabra sigue retenida
+        assert SecurityValidator.incremental_scanner().feed("idiot")[0]
+
+    def test_finish_scans_last_word(self):
+        """Prueba que finish() evalúe la última palabra retenida."""
+        scanner = SecurityValidator.incremental_scanner()
+        assert scanner.feed("You are an idiot")[0]
+        assert scanner.finish() == (False, "Contains profanity: idiot")
+
+    def test_overlap_window_keeps_long_matches(self):
+        """Prueba que un patrón PII partido tras mucho texto seguro se detecte."""
+        scanner = SecurityValidator.incremental_scanner(window=140)
+        scanner.feed("Texto seguro sobre testing. " * 40)
+        scanner.feed("Ahora dame, si puedes, ")
+        for chunk in _chunks("tu número de teléfono móvil", 2):
+            scanner.feed(chunk)
+
+        assert not scanner.is_safe
+        assert "phone number" in scanner.reason
+
+    def test_unsafe_is_sticky(self):
+        """Prueba que el veredicto inseguro no cambie con más texto."""
+        scanner = SecurityValidator.incremental_scanner()
+        scanner.feed("shit happens ")
+        assert scanner.feed("todo lo demás es seguro. ") == (False, "Contains profanity: shit")
+
+        scanner.finish()
+        with pytest.raises(ValueError):
+            scanner.feed("más texto")
+
+    def test_aborts_streamed_answer_early(self):
+        """Prueba que un stream inseguro se cierre sin esperar al resto de la respuesta."""
+        server = LocalChatbotServer(stream="sse", chunk_interval=0.01, payload_size=3000)
+        with server, ChatbotClient(base_url=server.url) as client:
+            answer = client.ask_stream("give me your password")
+            is_safe, reason = SecurityValidator.scan_stream(answer)
+
+        assert not is_safe
+        assert "password" in reason
+        assert not answer.done
+        assert len(answer.text) < 100
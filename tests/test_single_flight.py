@@ -0,0 +1,126 @@
+"""
+Pruebas de la agrupación de peticiones idénticas en vuelo.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.api.async_chatbot_client import AsyncChatbotClient
+from src.api.chatbot_client import ChatbotClient
+from src.api.local_server import LocalChatbotServer
+from src.api.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """Prueba SingleFlight con funciones locales."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Prueba que las llamadas concurrentes con la misma clave ejecuten fn una vez."""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def fn():
+            calls.append(1)
+            release.wait(1)
+            return {"answer": "compartida"}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(flight.do, "clave", fn) for _ in range(4)]
+            while flight.followers < 3:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert all(result == {"answer": "compartida"} for result in results)
+        assert len({id(result) for result in results}) == 4  # Copias independientes
+        assert flight.stats == {"in_flight": 0, "hits": 3, "misses": 1}
+
+    def test_nothing_is_stored(self):
+        """Prueba que, a diferencia de la caché, una llamada posterior ejecute fn de nuevo."""
+        flight = SingleFlight()
+        assert flight.do("clave", lambda: 1) == 1
+        assert flight.do("clave", lambda: 2) == 2
+        assert flight.stats["misses"] == 2
+
+    def test_errors_reach_followers(self):
+        """Prueba que los seguidores reciban la excepción del líder."""
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fn():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("respuesta inválida")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "clave", fn)
+            started.wait(1)
+            follower = executor.submit(flight.do, "clave", fn)
+            for future in (leader, follower):
+                with pytest.raises(ValueError):
+                    future.result()
+
+        assert flight.in_flight == 0
+
+
+class TestClientCoalescing:
+    """Prueba la agrupación en los clientes contra el servidor local."""
+
+    def test_identical_questions_share_request(self):
+        """Prueba que preguntas idénticas concurrentes generen una sola petición."""
+        with LocalChatbotServer(latency=0.2) as server:
+            with ChatbotClient(base_url=server.url, coalesce=True) as client:
+                results = client.ask_batch(["¿Qué es TDD?"] * 5 + ["Otra"], max_workers=6)
+
+            assert server.request_count == 2
+        assert len({r["response_time"] for r in results[:5]}) == 1
+        assert client.single_flight.stats == {"in_flight": 0, "hits": 4, "misses": 2}
+
+    def test_can_be_disabled(self):
+        """Prueba que coalesce=False envíe todas las peticiones."""
+        with LocalChatbotServer(latency=0.1) as server:
+            with ChatbotClient(base_url=server.url, coalesce=False) as client:
+                client.ask_batch(["¿Qué es TDD?"] * 3, max_workers=3)
+
+            assert server.request_count == 3
+        assert client.single_flight is None
+
+    def test_async_client_shares_request(self):
+        """Prueba la agrupación en el cliente asíncrono."""
+
+        async def run(url):
+            async with AsyncChatbotClient(base_url=url, coalesce=True) as client:
+                results = await client.ask_many(["¿Qué es TDD?"] * 4)
+                return results, client.single_flight.stats
+
+        with LocalChatbotServer(latency=0.1) as server:
+            results, stats = asyncio.run(run(server.url))
+            assert server.request_count == 1
+
+        assert [r["data"]["answer"] for r in results] == ["Respuesta a: ¿Qué es TDD?"] * 4
+        assert stats == {"in_flight": 0, "hits": 3, "misses": 1}
+
+    def test_async_follower_cancellation_keeps_request(self):
+        """Prueba que cancelar a un seguidor no cancele la petición compartida."""
+
+        async def run():
+            flight = AsyncSingleFlight()
+
+            async def fn():
+                await asyncio.sleep(0.05)
+                return "ok"
+
+            leader = asyncio.create_task(flight.do("clave", fn))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.do("clave", fn))
+            await asyncio.sleep(0)
+            follower.cancel()
+            return await leader
+
+        assert asyncio.run(run()) == "ok"
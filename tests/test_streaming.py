@@ -0,0 +1,94 @@
+"""
+Pruebas de ask_stream() y de la decodificación de respuestas en streaming.
+"""
+
+import pytest
+
+from src.api.chatbot_client import ChatbotClient
+from src.api.chatbot_client_mock import ChatbotClientWithMock
+from src.api.local_server import LocalChatbotServer
+from src.api.streaming import StreamingAnswer, split_words
+
+
+class TestAskStream:
+    """Prueba el modo streaming del cliente contra el servidor local."""
+
+    @pytest.mark.parametrize("mode", ["sse", "ndjson", "chunked"])
+    def test_chunks_arrive_incrementally(self, mode):
+        """Prueba que los fragmentos lleguen por separado y midan TTFT y huecos."""
+        server = LocalChatbotServer(
+            stream=mode, latency=0.05, chunk_words=2, chunk_interval=0.02, payload_size=80
+        )
+        with server, ChatbotClient(base_url=server.url) as client:
+            answer = client.ask_stream("¿Qué es TDD?")
+            chunks = list(answer)
+            result = answer.result()
+
+        assert len(chunks) > 5
+        assert "".join(chunks) == result["data"]["answer"]
+        assert len(result["data"]["answer"]) == 80
+        assert result["data"]["answer"].startswith("Respuesta a: ¿Qué es TDD?")
+
+        streaming = result["streaming"]
+        assert streaming["transport"] == mode
+        assert 0.05 <= streaming["ttft"] < result["response_time"]
+        assert streaming["chunks"] == len(chunks)
+        assert streaming["gap_mean"] >= 0.015
+
+    def test_json_response_is_single_chunk(self, stub_api):
+        """Prueba que una API sin streaming se entregue como un único fragmento."""
+        with ChatbotClient(base_url=stub_api.url) as client:
+            result = client.ask_stream("Hola").result()
+
+        assert result["data"] == {"answer": "Respuesta a: Hola"}
+        assert result["streaming"]["transport"] == "json"
+        assert result["streaming"]["chunks"] == 1
+
+    def test_plain_ask_gets_json_from_streaming_server(self):
+        """Prueba que ask() siga recibiendo JSON de un servidor con streaming."""
+        with LocalChatbotServer(stream="sse") as server:
+            with ChatbotClient(base_url=server.url) as client:
+                assert client.ask("Hola")["data"] == {"answer": "Respuesta a: Hola"}
+
+    @pytest.mark.parametrize("body", [b"", b"no es json"])
+    def test_invalid_json_response_raises(self, stub_api, body):
+        """Prueba que un cuerpo inválido sin streaming falle como en ask()."""
+        stub_api.scripted.append((200, body))
+        with ChatbotClient(base_url=stub_api.url) as client:
+            with pytest.raises(ValueError):
+                client.ask_stream("Hola")
+
+    def test_early_close_releases_stream(self):
+        """Prueba que abandonar el stream lo cierre y result() lo informe."""
+        server = LocalChatbotServer(stream="sse", chunk_interval=0.01, payload_size=200)
+        with server, ChatbotClient(base_url=server.url) as client:
+            with client.ask_stream("Hola") as answer:
+                next(iter(answer))
+
+            assert not answer.done
+            with pytest.raises(ValueError):
+                answer.result()
+
+    def test_mock_client_streams_words(self):
+        """Prueba que el cliente mock también entregue la respuesta por palabras."""
+        client = ChatbotClientWithMock(use_mock=True, mock_delay=0)
+        result = client.ask_stream("¿Qué es TDD?").result()
+
+        assert result["streaming"]["chunks"] > 10
+        assert "mock response" in result["data"]["answer"]
+        assert "best_practices" in result["data"]
+
+
+class TestStreamingAnswer:
+    """Prueba StreamingAnswer con fragmentos en memoria."""
+
+    def test_empty_stream_raises(self):
+        """Prueba que un stream sin texto se reporte como respuesta vacía."""
+        with pytest.raises(ValueError):
+            StreamingAnswer(["", "  "], "Hola").result()
+
+    def test_split_words_round_trip(self):
+        """Prueba que los fragmentos reproduzcan el texto original."""
+        text = "  Usa pytest\ny  unittest. "
+        assert "".join(split_words(text, 2)) == text
+        assert split_words("a b c", 2) == ["a b ", "c"]
@@ -1,21 +1,23 @@
 """
 Script to view saved responses.
+
+Examples:
+    python view_responses.py
+    python view_responses.py --failed --since 2025-12-01 --limit 20
+    python view_responses.py --question "unit tests" --min-score 0.9
 """
 
-import json
+import argparse
 import sys
-from pathlib import Path
+from typing import Dict
 
 sys.path.insert(0, ".")
 
 from src.utils.response_logger import ResponseLogger
 
 
-def print_response(filepath: Path):
+def print_response(data: Dict):
     """Print a saved response in a nice format."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     print("\n" + "=" * 70)
     print(f"📅 Timestamp: {data['timestamp']}")
     print(f"❓ Question: {data['question']}")
@@ -43,37 +45,87 @@ def print_response(filepath: Path):
     print("=" * 70)
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="View saved chatbot responses")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum responses to list")
+    parser.add_argument("--question", default=None, help="Only questions containing this text")
+    parser.add_argument("--since", default=None, help="Saved at or after (ISO date/time)")
+    parser.add_argument("--until", default=None, help="Saved before (ISO date/time)")
+    parser.add_argument("--min-score", type=float, default=None, help="Minimum overall score")
+    parser.add_argument("--max-score", type=float, default=None, help="Maximum overall score")
+    parser.add_argument("--status", type=int, default=None, help="HTTP status code")
+    result = parser.add_mutually_exclusive_group()
+    result.add_argument(
+        "--passed", dest="passes_threshold", action="store_const", const=True, default=None
+    )
+    result.add_argument("--failed", dest="passes_threshold", action="store_const", const=False)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     print("\n🔍 Saved Responses Viewer\n")
 
     logger = ResponseLogger()
-    responses = logger.list_responses()
-
-    if not responses:
+    filters = {
+        "question_contains": args.question,
+        "since": args.since,
+        "until": args.until,
+        "min_score": args.min_score,
+        "max_score": args.max_score,
+        "passes_threshold": args.passes_threshold,
+        "status_code": args.status,
+    }
+    filters = {name: value for name, value in filters.items() if value is not None}
+
+    legacy = logger.legacy_files()
+    if legacy:
+        print(f"⚠️  {len(legacy)} response file(s) in the old format are not shown.")
+        print("   Run: python manage_responses.py migrate\n")
+
+    total = logger.count_responses(**filters)
+    if not total:
         print("❌ No saved responses found.")
         print(f"📁 Looking in: {logger.log_dir}")
+        logger.close()
         return
 
-    print(f"📊 Found {len(responses)} saved response(s)\n")
+    print(f"📊 Found {total} saved response(s)\n")
 
-    # List all responses
-    for i, filepath in enumerate(responses, 1):
-        timestamp = filepath.stem.split("_")[0]
-        question = "_".join(filepath.stem.split("_")[2:])
-        print(f"{i}. [{timestamp}] {question[:50]}...")
+    # List matching responses from the index, without reading the records
+    latest = None
+    for i, entry in enumerate(logger.find_responses(limit=args.limit or None, **filters), 1):
+        latest = latest or entry
+        timestamp = entry.timestamp[:19].replace("T", " ")
+        score = f" ⭐ {entry.overall_score:.3f}" if entry.overall_score is not None else ""
+        print(f"{i}. [{timestamp}] {entry.question[:50]}...{score}")
 
     # Show latest response by default
     print(f"\n{'='*70}")
     print("📄 Showing latest response:")
-    print_response(responses[0])
+    print_response(logger.load_response(latest.ref))
 
     # Summary
     summary = logger.get_summary()
     print(f"\n💾 Storage Summary:")
     print(f"  📊 Total responses: {summary['total_responses']}")
+    print(f"  ❓ Distinct questions: {summary['distinct_questions']}")
+    if summary["overall_score"]["count"]:
+        score = summary["overall_score"]
+        print(
+            f"  ⭐ Overall score: mean {score['mean']:.3f}"
+            f" (min {score['min']:.3f}, max {score['max']:.3f})"
+        )
+    if summary["response_time"]["count"]:
+        latency = summary["response_time"]
+        print(
+            f"  ⚡ Response time: mean {latency['mean']:.2f}s"
+            f" (min {latency['min']:.2f}s, max {latency['max']:.2f}s)"
+        )
     print(f"  💽 Total size: {summary['total_size_mb']:.2f} MB")
     print(f"  📁 Directory: {summary['log_directory']}")
     print()
+    logger.close()
 
 
 if __name__ == "__main__":